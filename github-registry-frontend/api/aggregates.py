@@ -0,0 +1,80 @@
+"""Registry-wide aggregates (stats, namespaces, tags).
+
+Kept free of FastAPI so build_static_api.py can share it.
+"""
+
+from collections import Counter
+from typing import Optional
+
+
+class RegistryAggregates:
+    """
+    Running counts over the index.
+
+    Counts are updated per package with ``add``/``remove``, and the response
+    documents built from them are cached until the next change, so serving
+    them costs nothing per request.
+    """
+
+    def __init__(self, index: Optional[list[dict]] = None):
+        self.total_packages = 0
+        self.total_downloads = 0
+        self.namespace_counts: Counter = Counter()
+        self.type_counts: Counter = Counter()
+        self.tag_counts: Counter = Counter()
+        self._cache: dict[str, object] = {}
+        for pkg in index or []:
+            self.add(pkg)
+
+    def add(self, pkg: dict) -> None:
+        self._apply(pkg, 1)
+
+    def remove(self, pkg: dict) -> None:
+        self._apply(pkg, -1)
+
+    def _apply(self, pkg: dict, sign: int) -> None:
+        self.total_packages += sign
+        self.total_downloads += sign * (pkg.get("total_downloads") or 0)
+        self._bump(self.namespace_counts, pkg.get("namespace"), sign)
+        self._bump(self.type_counts, pkg.get("type", "kiro-agent"), sign)
+        for tag in pkg.get("tags", []):
+            self._bump(self.tag_counts, tag, sign)
+        self.invalidate()
+
+    @staticmethod
+    def _bump(counter: Counter, key, sign: int) -> None:
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]
+
+    def stats(self) -> dict:
+        if "stats" not in self._cache:
+            self._cache["stats"] = {
+                "total_packages": self.total_packages,
+                "total_downloads": self.total_downloads,
+                "total_namespaces": len(self.namespace_counts),
+                "package_types": dict(self.type_counts),
+            }
+        return self._cache["stats"]
+
+    def invalidate(self) -> None:
+        """Drop cached documents, e.g. after ownership.json changes."""
+        self._cache.clear()
+
+    def namespaces(self, ownership: dict) -> dict:
+        if "namespaces" not in self._cache:
+            owners = ownership.get("namespaces", {})
+            self._cache["namespaces"] = {
+                "namespaces": [
+                    {"namespace": ns, "package_count": count, "owner": owners.get(ns)}
+                    for ns, count in self.namespace_counts.items()
+                ]
+            }
+        return self._cache["namespaces"]
+
+    def tags(self) -> dict:
+        if "tags" not in self._cache:
+            self._cache["tags"] = {
+                "tags": [{"tag": tag, "count": count} for tag, count in self.tag_counts.most_common()]
+            }
+        return self._cache["tags"]
@@ -0,0 +1,120 @@
+"""HTTP response caching and validators for the registry API."""
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Revalidate API documents every 30s; a revalidation is a cheap 304
+API_CACHE_CONTROL = "public, max-age=30, must-revalidate"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {c.strip().removeprefix("W/") for c in if_none_match.split(",")}
+    return etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache serialized GET responses per (path, normalized query, index version).
+
+    Every response carries an ETag derived from the index version, so a
+    client revalidating an unchanged registry gets a 304 before any endpoint
+    code runs, and a new client gets the cached bytes without re-serializing.
+    A registry update changes the version, which retires all entries at once.
+
+    ``hits`` and ``misses`` count requests answered from the cache (including
+    304s) and requests passed through; ``on_init`` receives the instance once
+    Starlette builds it, so ``/metrics`` can read them.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        version: Callable[[], str],
+        prefixes: tuple[str, ...] = ("/api/",),
+        paths: tuple[str, ...] = (),
+        exclude: tuple[str, ...] = (),
+        maxsize: int = 1024,
+        on_init: Optional[Callable[["ResponseCacheMiddleware"], None]] = None,
+    ):
+        self.app = app
+        self.version = version
+        self.prefixes = prefixes
+        self.paths = paths
+        self.exclude = exclude
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, str, str], tuple[int, list, bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if on_init is not None:
+            on_init(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cacheable(self, path: str) -> bool:
+        if path in self.exclude:
+            return False
+        return path in self.paths or path.startswith(self.prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not self._cacheable(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        version = self.version()
+        key = (scope["path"], query, version)
+        url_hash = hashlib.blake2s(f"{scope['path']}?{query}".encode("utf-8"), digest_size=6).hexdigest()
+        etag = f'"{version}-{url_hash}"'
+        validators = [(b"etag", etag.encode("latin-1")), (b"cache-control", API_CACHE_CONTROL.encode("latin-1"))]
+
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            self.hits += 1
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            status, headers, body = cached
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self.misses += 1
+        start: dict = {}
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [
+                    (k, v) for k, v in message.get("headers", [])
+                    if k.lower() not in (b"etag", b"cache-control")
+                ] + validators
+                message = {**message, "headers": headers}
+                start.update(message)
+            elif message["type"] == "http.response.body" and start:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self._store(key, (200, start["headers"], b"".join(chunks)))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    def _store(self, key: tuple[str, str, str], entry: tuple[int, list, bytes]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -1,15 +1,48 @@
 """FastAPI backend for ARA Registry website."""
 
+import base64
+import bisect
+import hashlib
 import json
+import os
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI(title="ARA Registry API", version="1.0.0")
+from .aggregates import RegistryAggregates
+from .caching import ResponseCacheMiddleware, etag_matches
+from .fastjson import FastJSONResponse, dumps, loads
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, RELOAD_BUCKETS, MetricsMiddleware, Registry
+
+app = FastAPI(title="ARA Registry API", version="1.0.0", default_response_class=FastJSONResponse)
+
+metrics = Registry()
+REQUESTS = metrics.counter("ara_http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+REQUEST_SECONDS = metrics.histogram("ara_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+SEARCH_SECONDS = metrics.histogram("ara_search_duration_seconds", "Time spent filtering the index for a filtered package listing.")
+RELOAD_SECONDS = metrics.histogram(
+    "ara_registry_reload_duration_seconds", "Time to re-read and parse a changed registry file.", ("file",), RELOAD_BUCKETS
+)
+
+# Filled in when Starlette builds the middleware stack
+response_caches: list[ResponseCacheMiddleware] = []
+
+# Response cache sits inside CORS so CORS headers are computed per request
+app.add_middleware(
+    ResponseCacheMiddleware,
+    version=lambda: store.version(),
+    paths=("/packages",),
+    exclude=("/api/health", "/metrics"),
+    on_init=response_caches.append,
+)
 
 # CORS for development
 app.add_middleware(
@@ -20,26 +53,273 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Path to registry data
-REGISTRY_PATH = Path(__file__).parent.parent.parent / "registry"
+# Outermost, so cached responses and CORS preflights are measured as well
+app.add_middleware(MetricsMiddleware, requests=REQUESTS, latency=REQUEST_SECONDS, routes=lambda: app.router.routes)
+
+# Path to registry data. ARA_REGISTRY_ROOT may point at a directory produced
+# by `ara mirror sync`, which also holds release assets under releases/.
+REGISTRY_ROOT = Path(os.getenv("ARA_REGISTRY_ROOT", Path(__file__).parent.parent.parent))
+REGISTRY_PATH = REGISTRY_ROOT / "registry"
+RELEASES_PATH = REGISTRY_ROOT / "releases"
 INDEX_FILE = REGISTRY_PATH / "index.json"
 OWNERSHIP_FILE = REGISTRY_PATH / "ownership.json"
+BINARY_INDEX_FILE = REGISTRY_PATH / "index.bin"
+
+# Cache policies: versioned artifacts never change once published
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+MUTABLE_CACHE = "public, max-age=60"
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """Parse an ISO-8601 timestamp from the index, treating missing/bad values as the epoch."""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _pkg_id(pkg: dict) -> tuple[str, str]:
+    return pkg.get("namespace", ""), pkg.get("name", "")
+
+
+# Keyset sort keys: ascending in page order and unique per package, so a
+# cursor can resume with a binary search even after the index changes.
+SORT_KEYS = {
+    "updated": lambda p: (-_timestamp(p.get("updated_at")), *_pkg_id(p)),
+    "created": lambda p: (-_timestamp(p.get("created_at")), *_pkg_id(p)),
+    "downloads": lambda p: (-(p.get("total_downloads") or 0), *_pkg_id(p)),
+    "name": lambda p: ("/".join(_pkg_id(p)),),
+}
+
+
+def _intern_package(pkg: dict) -> None:
+    """Share the strings repeated across index entries (namespace, type, tags, versions)."""
+    for field in ("namespace", "type"):
+        if isinstance(pkg.get(field), str):
+            pkg[field] = sys.intern(pkg[field])
+    for field in ("tags", "versions"):
+        if isinstance(pkg.get(field), list):
+            pkg[field] = [sys.intern(v) if isinstance(v, str) else v for v in pkg[field]]
+
+
+def _git_blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\x00" % len(content) + content).hexdigest()
+
+
+def _binary_index_source(path: Path) -> Optional[str]:
+    """Source id recorded in an index.bin header (see ara_github.binindex)."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(36)
+    except OSError:
+        return None
+    if len(header) < 36 or not header.startswith(b"ARAIDX"):
+        return None
+    return header[16:36].hex()
+
+
+class RegistryStore:
+    """
+    In-process cache of the registry files.
+
+    Each file is re-read only when its mtime or size changes, so requests
+    share one parsed snapshot instead of re-parsing index.json every time.
+    """
+
+    def __init__(self):
+        self._stamps: dict[Path, tuple[int, int]] = {}
+        self._data: dict[Path, object] = {}
+        self._packages: dict[tuple[str, str], dict] = {}
+        self._orderings: dict[str, tuple[list[dict], list[tuple]]] = {}
+        self._package_json: dict[tuple[str, str], bytes] = {}
+        self._index_source: Optional[str] = None
+        self.loaded_at: dict[Path, float] = {}
+        self.aggregates = RegistryAggregates()
+
+    def _load(self, path: Path, default):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            if self._stamps.pop(path, None) is not None and path == INDEX_FILE:
+                self._index_source = None
+                self._index_changed(default)
+            self._data[path] = default
+            return default
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamps.get(path) != stamp:
+            started = time.perf_counter()
+            content = path.read_bytes()
+            data = loads(content)
+            self._stamps[path] = stamp
+            if path == INDEX_FILE:
+                self._index_source = _git_blob_sha(content)
+                self._index_changed(data)
+            elif path == OWNERSHIP_FILE:
+                self.aggregates.invalidate()
+            self._data[path] = data
+            self.loaded_at[path] = time.time()
+            RELOAD_SECONDS.observe(time.perf_counter() - started, file=path.name)
+        return self._data[path]
+
+    def _index_changed(self, index: list[dict]) -> None:
+        """Refresh derived state for a new index snapshot."""
+        for pkg in index:
+            _intern_package(pkg)
+        old_packages = self._packages
+        self._packages = {(p.get("namespace"), p.get("name")): p for p in index}
+        self._orderings = {}
+        self._package_json = {}
+
+        # Typical updates touch one package: adjust the aggregates by the
+        # difference instead of recounting the whole registry.
+        removed = [p for k, p in old_packages.items() if self._packages.get(k) != p]
+        added = [p for k, p in self._packages.items() if old_packages.get(k) != p]
+        if len(removed) + len(added) > len(index) // 2:
+            self.aggregates = RegistryAggregates(index)
+            return
+        for pkg in removed:
+            self.aggregates.remove(pkg)
+        for pkg in added:
+            self.aggregates.add(pkg)
+
+    def index(self) -> list[dict]:
+        return self._load(INDEX_FILE, [])
+
+    def ownership(self) -> dict:
+        return self._load(OWNERSHIP_FILE, {"namespaces": {}, "packages": {}})
+
+    def version(self) -> str:
+        """
+        Identify the current snapshot of index.json and ownership.json.
+
+        Derived from file stamps, so every worker serving the same files
+        reports the same version.
+        """
+        self.index()
+        self.ownership()
+        stamps = repr((self._stamps.get(INDEX_FILE), self._stamps.get(OWNERSHIP_FILE)))
+        return hashlib.blake2s(stamps.encode("utf-8"), digest_size=8).hexdigest()
+
+    def stats(self) -> dict:
+        self.index()
+        return self.aggregates.stats()
+
+    def namespaces(self) -> dict:
+        self.index()
+        return self.aggregates.namespaces(self.ownership())
+
+    def tags(self) -> dict:
+        self.index()
+        return self.aggregates.tags()
+
+    def snapshot_info(self) -> dict:
+        """Size, version and timing of the loaded index snapshot, for /metrics."""
+        index = self.index()
+        stamp = self._stamps.get(INDEX_FILE)
+        return {
+            "packages": len(index),
+            "bytes": stamp[1] if stamp else 0,
+            "version": self.version(),
+            "source": self._index_source or "",
+            "modified": stamp[0] / 1e9 if stamp else None,
+            "loaded": self.loaded_at.get(INDEX_FILE),
+        }
+
+    def index_source(self) -> Optional[str]:
+        """Git blob SHA-1 of the loaded index.json, which a matching index.bin records."""
+        self.index()
+        return self._index_source
+
+    def package(self, namespace: str, name: str) -> Optional[dict]:
+        self.index()
+        return self._packages.get((namespace, name))
+
+    def package_json(self, pkg: dict) -> bytes:
+        """Serialized form of a snapshot package, encoded once per snapshot."""
+        key = (pkg.get("namespace"), pkg.get("name"))
+        encoded = self._package_json.get(key)
+        if encoded is None:
+            encoded = self._package_json[key] = dumps(pkg)
+        return encoded
+
+    def ordering(self, sort: str) -> tuple[list[dict], list[tuple]]:
+        """
+        Get the index presorted for a sort key, with its ascending keyset keys.
+
+        Built once per index snapshot and shared by every request.
+        """
+        index = self.index()
+        if sort not in self._orderings:
+            key = SORT_KEYS[sort]
+            ordered = sorted(index, key=key)
+            self._orderings[sort] = (ordered, [key(p) for p in ordered])
+        return self._orderings[sort]
+
+
+store = RegistryStore()
 
 
 def load_index() -> list[dict]:
     """Load the registry index."""
-    if not INDEX_FILE.exists():
-        return []
-    with open(INDEX_FILE) as f:
-        return json.load(f)
+    return store.index()
 
 
 def load_ownership() -> dict:
     """Load ownership data."""
-    if not OWNERSHIP_FILE.exists():
-        return {"namespaces": {}, "packages": {}}
-    with open(OWNERSHIP_FILE) as f:
-        return json.load(f)
+    return store.ownership()
+
+
+def _etag(content: bytes) -> str:
+    """Build a strong ETag from response content."""
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match against an ETag."""
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+
+def _cached_response(request: Request, content: bytes, etag: str, cache_control: str,
+                     media_type: str = "application/json") -> Response:
+    """Serve content with validators, or an empty 304 if the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+@lru_cache(maxsize=1024)
+def _read_asset(path: Path, mtime_ns: int, size: int) -> tuple[bytes, str]:
+    """Read a small release asset; keyed on its stat so edits invalidate the entry."""
+    content = path.read_bytes()
+    return content, _etag(content)
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: Path, mtime_ns: int, size: int) -> str:
+    """SHA-256 of a release asset, computed once per file revision."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _release_asset(namespace: str, name: str, version: str, asset: str) -> Path:
+    """Locate a release asset in the local store, or raise 404."""
+    pkg = store.package(namespace, name)
+    if not pkg:
+        raise HTTPException(status_code=404, detail=f"Package {namespace}/{name} not found")
+    if version not in pkg.get("versions", []):
+        raise HTTPException(status_code=404, detail=f"Package {namespace}/{name}@{version} not found")
+
+    path = RELEASES_PATH / "ara" / namespace / name / f"v{version}" / asset
+    if "/" in asset or asset.startswith(".") or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"{asset} not available for {namespace}/{name}@{version}")
+    return path
 
 
 @app.get("/api/health")
@@ -48,150 +328,301 @@ async def health():
     return {"status": "ok"}
 
 
+def _cache_samples(field: str) -> list[tuple[dict, float]]:
+    """Hits, misses or entries of each in-process cache, labelled by cache."""
+    samples = []
+    for middleware in response_caches:
+        counts = {"hits": middleware.hits, "misses": middleware.misses, "entries": len(middleware)}
+        samples.append(({"cache": "response"}, counts[field]))
+    for cache, cached in (("asset", _read_asset), ("digest", _file_digest)):
+        info = cached.cache_info()
+        counts = {"hits": info.hits, "misses": info.misses, "entries": info.currsize}
+        samples.append(({"cache": cache}, counts[field]))
+    return samples
+
+
+def _index_sample(field: str) -> list[tuple[dict, float]]:
+    info = store.snapshot_info()
+    if field == "info":
+        return [({"version": info["version"], "source": info["source"]}, 1)]
+    if field == "age":
+        return [] if info["modified"] is None else [({}, max(0.0, time.time() - info["modified"]))]
+    return [] if info[field] is None else [({}, info[field])]
+
+
+metrics.gauge_callback("ara_index_packages", "Packages in the loaded index snapshot.", lambda: _index_sample("packages"))
+metrics.gauge_callback("ara_index_size_bytes", "Size of the loaded index.json in bytes.", lambda: _index_sample("bytes"))
+metrics.gauge_callback("ara_index_info", "Version of the loaded snapshot and git blob SHA of its index.json.", lambda: _index_sample("info"))
+metrics.gauge_callback("ara_index_age_seconds", "Seconds since the loaded index.json was modified.", lambda: _index_sample("age"))
+metrics.gauge_callback(
+    "ara_index_loaded_timestamp_seconds", "Unix time the index snapshot was loaded.", lambda: _index_sample("loaded")
+)
+metrics.counter_callback("ara_cache_hits_total", "Requests answered from an in-process cache.", lambda: _cache_samples("hits"))
+metrics.counter_callback("ara_cache_misses_total", "Requests an in-process cache could not answer.", lambda: _cache_samples("misses"))
+metrics.gauge_callback("ara_cache_entries", "Entries held by an in-process cache.", lambda: _cache_samples("entries"))
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics for this process."""
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/stats")
 async def get_stats():
     """Get registry statistics."""
-    index = load_index()
-    
-    total_packages = len(index)
-    total_downloads = sum(pkg.get("total_downloads", 0) for pkg in index)
-    namespaces = set(pkg.get("namespace") for pkg in index)
-    total_namespaces = len(namespaces)
-    
-    # Package types breakdown
-    types = {}
-    for pkg in index:
-        pkg_type = pkg.get("type", "kiro-agent")
-        types[pkg_type] = types.get(pkg_type, 0) + 1
-    
-    return {
-        "total_packages": total_packages,
-        "total_downloads": total_downloads,
-        "total_namespaces": total_namespaces,
-        "package_types": types,
-    }
+    return FastJSONResponse(store.stats())
+
+
+def _matches(
+    pkg: dict,
+    q: Optional[str],
+    type: Optional[str],
+    namespace: Optional[str],
+    tag_list: Optional[list[str]],
+    owner: Optional[str],
+    package_owners: dict,
+) -> bool:
+    """Check a package against the list filters (q is already lowercased)."""
+    if namespace and pkg.get("namespace") != namespace:
+        return False
+    if type and pkg.get("type") != type:
+        return False
+    if tag_list and not any(tag in pkg.get("tags", []) for tag in tag_list):
+        return False
+    if owner and package_owners.get(f"{pkg.get('namespace')}/{pkg.get('name')}") != owner:
+        return False
+    if q and not (
+        q in pkg.get("name", "").lower()
+        or q in pkg.get("description", "").lower()
+        or q in pkg.get("namespace", "").lower()
+    ):
+        return False
+    return True
+
+
+def _encode_cursor(sort: str, key: tuple) -> str:
+    raw = json.dumps([sort, list(key)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key = json.loads(raw)
+        key = tuple(key)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+    return key
 
 
 @app.get("/api/packages")
+@app.get("/packages")
 async def list_packages(
     q: Optional[str] = Query(None, description="Search query"),
     type: Optional[str] = Query(None, description="Filter by package type"),
     namespace: Optional[str] = Query(None, description="Filter by namespace"),
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
+    author: Optional[str] = Query(None, description="Filter by package owner"),
     sort: str = Query("updated", description="Sort by: updated, created, downloads, name"),
-    limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor"),
 ):
-    """List and search packages."""
-    index = load_index()
-    results = index
-    
-    # Apply filters
-    if namespace:
-        results = [p for p in results if p.get("namespace") == namespace]
-    
-    if type:
-        results = [p for p in results if p.get("type") == type]
-    
-    if tags:
-        tag_list = [t.strip() for t in tags.split(",")]
-        results = [
-            p for p in results
-            if any(tag in p.get("tags", []) for tag in tag_list)
-        ]
-    
-    if q:
-        q_lower = q.lower()
-        results = [
-            p for p in results
-            if q_lower in p.get("name", "").lower()
-            or q_lower in p.get("description", "").lower()
-            or q_lower in p.get("namespace", "").lower()
-        ]
-    
-    # Sort
-    if sort == "updated":
-        results.sort(key=lambda p: p.get("updated_at", ""), reverse=True)
-    elif sort == "created":
-        results.sort(key=lambda p: p.get("created_at", ""), reverse=True)
-    elif sort == "downloads":
-        results.sort(key=lambda p: p.get("total_downloads", 0), reverse=True)
-    elif sort == "name":
-        results.sort(key=lambda p: f"{p.get('namespace', '')}/{p.get('name', '')}")
-    
-    # Pagination
-    total = len(results)
-    results = results[offset:offset + limit]
-    
-    return {
-        "packages": results,
+    """
+    List and search packages.
+
+    Pages are cut from an ordering presorted per sort key, so no request
+    sorts. `page` addresses by offset; `cursor` (from `next_cursor`) resumes
+    right after the last package seen, which stays cheap at any depth.
+    """
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
+
+    ordered, keys = store.ordering(sort)
+    filtered = bool(q or type or namespace or tags or author)
+
+    if cursor:
+        try:
+            start = bisect.bisect_right(keys, _decode_cursor(cursor, sort))
+        except TypeError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        start = (page - 1) * per_page
+
+    if not filtered:
+        total = len(ordered)
+        results = ordered[start:start + per_page]
+        end = start + len(results)
+        has_next = end < total
+    else:
+        search_started = time.perf_counter()
+        q_lower = q.lower() if q else None
+        tag_list = [t.strip() for t in tags.split(",")] if tags else None
+        package_owners = load_ownership().get("packages", {}) if author else {}
+
+        # One pass over the presorted ordering: count every match, keep the page
+        total = 0
+        results = []
+        end = start
+        has_next = False
+        for i, pkg in enumerate(ordered):
+            if not _matches(pkg, q_lower, type, namespace, tag_list, author, package_owners):
+                continue
+            total += 1
+            if cursor and i < start:
+                continue
+            if not cursor and total <= start:
+                continue
+            if len(results) < per_page:
+                results.append(pkg)
+                end = i + 1
+            else:
+                has_next = True
+        SEARCH_SECONDS.observe(time.perf_counter() - search_started)
+
+    # Splice pre-encoded packages into the envelope instead of re-encoding them
+    meta = dumps({
         "total": total,
-        "limit": limit,
-        "offset": offset,
-    }
+        "page": None if cursor else page,
+        "per_page": per_page,
+        "has_next": has_next,
+        "has_prev": bool(cursor) or page > 1,
+        "next_cursor": _encode_cursor(sort, keys[end - 1]) if has_next and results else None,
+    })
+    packages = b",".join(store.package_json(pkg) for pkg in results)
+    return FastJSONResponse(b'{"packages":[' + packages + b"]," + meta[1:])
 
 
 @app.get("/api/packages/{namespace}/{name}")
 async def get_package(namespace: str, name: str):
     """Get package details."""
-    index = load_index()
     ownership = load_ownership()
     
     # Find package
-    pkg = None
-    for p in index:
-        if p.get("namespace") == namespace and p.get("name") == name:
-            pkg = p
-            break
+    pkg = store.package(namespace, name)
     
     if not pkg:
         raise HTTPException(status_code=404, detail="Package not found")
     
-    # Add owner info
+    # Add owner info (on a copy, the cached snapshot is shared)
+    pkg = dict(pkg)
     pkg_key = f"{namespace}/{name}"
     owner = ownership.get("packages", {}).get(pkg_key)
     if owner:
         pkg["owner"] = owner
     
-    return pkg
+    return FastJSONResponse(pkg)
 
 
 @app.get("/api/namespaces")
 async def list_namespaces():
     """List all namespaces with package counts."""
-    index = load_index()
-    ownership = load_ownership()
-    
-    namespaces = {}
-    for pkg in index:
-        ns = pkg.get("namespace")
-        if ns not in namespaces:
-            namespaces[ns] = {
-                "namespace": ns,
-                "package_count": 0,
-                "owner": ownership.get("namespaces", {}).get(ns),
-            }
-        namespaces[ns]["package_count"] += 1
-    
-    return {"namespaces": list(namespaces.values())}
+    return FastJSONResponse(store.namespaces())
 
 
 @app.get("/api/tags")
 async def list_tags():
     """List all tags with usage counts."""
-    index = load_index()
-    
-    tags = {}
-    for pkg in index:
-        for tag in pkg.get("tags", []):
-            tags[tag] = tags.get(tag, 0) + 1
-    
-    # Sort by usage
-    sorted_tags = sorted(tags.items(), key=lambda x: x[1], reverse=True)
-    
-    return {
-        "tags": [{"tag": tag, "count": count} for tag, count in sorted_tags]
-    }
+    return FastJSONResponse(store.tags())
+
+
+@app.get("/packages/{namespace}/{name}/versions")
+async def list_versions(namespace: str, name: str, request: Request):
+    """List all versions of a package (registry-api.md)."""
+    pkg = store.package(namespace, name)
+    if not pkg:
+        raise HTTPException(status_code=404, detail=f"Package {namespace}/{name} not found")
+
+    content = dumps({
+        "namespace": namespace,
+        "name": name,
+        "versions": pkg.get("versions", []),
+        "latest": pkg.get("latest_version"),
+    })
+    return _cached_response(request, content, _etag(content), MUTABLE_CACHE)
+
+
+@app.get("/packages/{namespace}/{name}/{version}/ara.json")
+async def get_manifest(namespace: str, name: str, version: str, request: Request):
+    """Get the ara.json manifest of a package version (registry-api.md)."""
+    path = _release_asset(namespace, name, version, "ara.json")
+    st = path.stat()
+    content, etag = _read_asset(path, st.st_mtime_ns, st.st_size)
+    return _cached_response(request, content, etag, IMMUTABLE_CACHE)
+
+
+@app.get("/packages/{namespace}/{name}/{version}/download")
+async def get_download(namespace: str, name: str, version: str, request: Request):
+    """Get the download URL, size and checksum of a package archive (registry-api.md)."""
+    path = _release_asset(namespace, name, version, "package.tar.zst")
+    st = path.stat()
+    digest = _file_digest(path, st.st_mtime_ns, st.st_size)
+
+    content = dumps({
+        "download_url": str(request.url_for("get_archive", namespace=namespace, name=name, version=version)),
+        "expires_at": None,
+        "size_bytes": st.st_size,
+        "checksum": f"sha256:{digest}",
+    })
+    # The URL embeds the request host, so the ETag must cover the body, not just the digest
+    return _cached_response(request, content, _etag(content), IMMUTABLE_CACHE)
+
+
+def _file_response(request: Request, path: Path, cache_control: str, media_type: str) -> Response:
+    """Serve a file from the local store with a content-digest ETag."""
+    st = path.stat()
+    etag = f'"{_file_digest(path, st.st_mtime_ns, st.st_size)}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@app.get("/packages/{namespace}/{name}/{version}/package.tar.zst", name="get_archive")
+async def get_archive(namespace: str, name: str, version: str, request: Request):
+    """Serve a package archive from the local store."""
+    path = _release_asset(namespace, name, version, "package.tar.zst")
+    return _file_response(request, path, IMMUTABLE_CACHE, "application/zstd")
+
+
+# Mirror layout (see `ara mirror sync`), so `ara --registry http://<host>` can
+# read through this server instead of the GitHub API.
+MIRRORED_FILES = {"index.json", "ownership.json", "externals.json", "index.bin", "dictionaries.json"}
+
+
+@app.api_route("/registry/{filename}", methods=["GET", "HEAD"])
+async def get_registry_file(filename: str, request: Request):
+    """Serve a registry repository file."""
+    path = REGISTRY_PATH / filename
+    if filename not in MIRRORED_FILES or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"{filename} not found")
+    if path == BINARY_INDEX_FILE:
+        # A stale index.bin would answer lookups from an older index; clients
+        # fall back to index.json on 404
+        if _binary_index_source(path) != store.index_source():
+            raise HTTPException(status_code=404, detail=f"{filename} is out of date")
+        return _file_response(request, path, MUTABLE_CACHE, "application/octet-stream")
+    return _file_response(request, path, MUTABLE_CACHE, "application/json")
+
+
+@app.api_route("/releases/ara/{namespace}/{name}/v{version}/{asset}", methods=["GET", "HEAD"])
+async def get_release_asset(namespace: str, name: str, version: str, asset: str, request: Request):
+    """Serve a release asset."""
+    path = _release_asset(namespace, name, version, asset)
+    media_type = "application/json" if asset.endswith(".json") else "application/octet-stream"
+    return _file_response(request, path, IMMUTABLE_CACHE, media_type)
+
+
+@app.api_route("/releases/ara-dict/{dict_id}/dictionary.zdict", methods=["GET", "HEAD"])
+async def get_dictionary(dict_id: int, request: Request):
+    """Serve a compression dictionary that package archives may reference."""
+    path = RELEASES_PATH / "ara-dict" / str(dict_id) / "dictionary.zdict"
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Dictionary {dict_id} not found")
+    return _file_response(request, path, IMMUTABLE_CACHE, "application/octet-stream")
 
 
 # Mount static files (frontend)
@@ -1,45 +1,39 @@
 #!/usr/bin/env python3
 """Generate static API JSON files for GitHub Pages deployment."""
 
-import json
 from pathlib import Path
 
+from api.aggregates import RegistryAggregates
+from api.fastjson import dumps, loads
+
+
+def write_json(path: Path, data) -> None:
+    """Write an indented JSON file (via orjson when installed)."""
+    path.write_bytes(dumps(data, indent=True))
+
+
 def main():
     # Load registry data
     registry_path = Path(__file__).parent.parent / 'registry'
     index_file = registry_path / 'index.json'
     ownership_file = registry_path / 'ownership.json'
 
-    with open(index_file) as f:
-        index = json.load(f)
-
-    with open(ownership_file) as f:
-        ownership = json.load(f)
+    index = loads(index_file.read_bytes())
+    ownership = loads(ownership_file.read_bytes())
 
     # Create static API directory
     api_dir = Path(__file__).parent / 'static' / 'api'
     api_dir.mkdir(exist_ok=True)
 
-    # Generate stats
-    total_packages = len(index)
-    total_downloads = sum(pkg.get('total_downloads', 0) for pkg in index)
-    namespaces = set(pkg.get('namespace') for pkg in index)
-    total_namespaces = len(namespaces)
-
-    types = {}
-    for pkg in index:
-        pkg_type = pkg.get('type', 'kiro-agent')
-        types[pkg_type] = types.get(pkg_type, 0) + 1
-
-    stats = {
-        'total_packages': total_packages,
-        'total_downloads': total_downloads,
-        'total_namespaces': total_namespaces,
-        'package_types': types,
-    }
+    # Generate stats, namespaces and tags from one pass over the index
+    aggregates = RegistryAggregates(index)
+    stats = aggregates.stats()
+    total_packages = stats['total_packages']
+    total_namespaces = stats['total_namespaces']
 
-    with open(api_dir / 'stats.json', 'w') as f:
-        json.dump(stats, f, indent=2)
+    write_json(api_dir / 'stats.json', stats)
+    write_json(api_dir / 'namespaces.json', aggregates.namespaces(ownership))
+    write_json(api_dir / 'tags.json', aggregates.tags())
 
     # Generate packages list
     packages_with_owner = []
@@ -56,12 +50,13 @@ def main():
     packages_data = {
         'packages': packages_with_owner,
         'total': len(packages_with_owner),
-        'limit': len(packages_with_owner),
-        'offset': 0,
+        'page': 1,
+        'per_page': len(packages_with_owner),
+        'has_next': False,
+        'has_prev': False,
     }
 
-    with open(api_dir / 'packages.json', 'w') as f:
-        json.dump(packages_data, f, indent=2)
+    write_json(api_dir / 'packages.json', packages_data)
 
     # Generate individual package files
     packages_dir = api_dir / 'packages'
@@ -82,13 +77,12 @@ def main():
         ns_dir.mkdir(exist_ok=True)
         
         # Write package file
-        with open(ns_dir / f'{name}.json', 'w') as f:
-            json.dump(pkg, f, indent=2)
+        write_json(ns_dir / f'{name}.json', pkg)
 
     print(f'✅ Generated static API data:')
     print(f'   - {total_packages} packages')
     print(f'   - {total_namespaces} namespaces')
-    print(f'   - Stats, package list, and individual package files')
+    print(f'   - Stats, namespaces, tags, package list, and individual package files')
 
 if __name__ == '__main__':
     main()
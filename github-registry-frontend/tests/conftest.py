@@ -0,0 +1,73 @@
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+
+
+class Registry:
+    """A registry root (as `ara mirror sync` writes it) served by the API under test."""
+
+    def __init__(self, root):
+        self.root = root
+        self.path = root / "registry"
+        self.releases = root / "releases"
+        self.path.mkdir(parents=True)
+        self._clock = time.time_ns()
+
+    def write(self, filename: str, content) -> None:
+        path = self.path / filename
+        path.write_bytes(content if isinstance(content, bytes) else json.dumps(content).encode("utf-8"))
+        # The store reloads on (mtime, size); make every write a new stamp
+        self._clock += 1_000_000
+        os.utime(path, ns=(self._clock, self._clock))
+
+    def asset(self, namespace: str, name: str, version: str, asset: str, content: bytes):
+        path = self.releases / "ara" / namespace / name / f"v{version}" / asset
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+
+def package(namespace: str, name: str, versions=("1.0.0",), **fields) -> dict:
+    return {
+        "namespace": namespace,
+        "name": name,
+        "description": f"The {name} agent",
+        "type": "kiro-agent",
+        "latest_version": versions[0],
+        "versions": list(versions),
+        "tags": [],
+        "total_downloads": 0,
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+        **fields,
+    }
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch) -> Registry:
+    registry = Registry(tmp_path)
+    monkeypatch.setattr(main, "REGISTRY_ROOT", registry.root)
+    monkeypatch.setattr(main, "REGISTRY_PATH", registry.path)
+    monkeypatch.setattr(main, "RELEASES_PATH", registry.releases)
+    monkeypatch.setattr(main, "INDEX_FILE", registry.path / "index.json")
+    monkeypatch.setattr(main, "OWNERSHIP_FILE", registry.path / "ownership.json")
+    monkeypatch.setattr(main, "BINARY_INDEX_FILE", registry.path / "index.bin")
+    monkeypatch.setattr(main, "store", main.RegistryStore())
+    main._read_asset.cache_clear()
+    main._file_digest.cache_clear()
+    return registry
+
+
+@pytest.fixture
+def client(registry) -> TestClient:
+    with TestClient(main.app) as client:
+        # The middleware outlives a test; start each one from an empty cache
+        for cache in main.response_caches:
+            cache._entries.clear()
+            cache.hits = cache.misses = 0
+        yield client
@@ -0,0 +1,65 @@
+"""Precomputed stats, namespace and tag aggregates (api/aggregates.py)."""
+
+from api.aggregates import RegistryAggregates
+from conftest import package
+
+OWNERSHIP = {"namespaces": {"acme": "alice"}, "packages": {}}
+
+
+def _index() -> list[dict]:
+    return [
+        package("acme", "agent", tags=["demo", "python"], total_downloads=5),
+        package("acme", "docs", tags=["demo"], total_downloads=None, type="kiro-power"),
+        package("beta", "tool", tags=["rust"], total_downloads=2),
+    ]
+
+
+def _documents(aggregates: RegistryAggregates) -> tuple:
+    namespaces = sorted(aggregates.namespaces(OWNERSHIP)["namespaces"], key=lambda n: n["namespace"])
+    tags = sorted(aggregates.tags()["tags"], key=lambda t: (-t["count"], t["tag"]))
+    return aggregates.stats(), namespaces, tags
+
+
+def test_counts():
+    stats, namespaces, tags = _documents(RegistryAggregates(_index()))
+    assert stats == {
+        "total_packages": 3,
+        "total_downloads": 7,
+        "total_namespaces": 2,
+        "package_types": {"kiro-agent": 2, "kiro-power": 1},
+    }
+    assert namespaces == [
+        {"namespace": "acme", "package_count": 2, "owner": "alice"},
+        {"namespace": "beta", "package_count": 1, "owner": None},
+    ]
+    assert tags == [{"tag": "demo", "count": 2}, {"tag": "python", "count": 1}, {"tag": "rust", "count": 1}]
+
+
+def test_incremental_updates_match_a_recount():
+    index = _index()
+    aggregates = RegistryAggregates(index)
+    aggregates.stats()  # cached documents must be dropped on change
+
+    updated = {**index[2], "tags": ["go"], "total_downloads": 10}
+    aggregates.remove(index[2])
+    aggregates.add(updated)
+    aggregates.remove(index[1])
+    assert _documents(aggregates) == _documents(RegistryAggregates([index[0], updated]))
+    # Namespaces and tags whose count drops to zero disappear
+    assert {t["tag"] for t in aggregates.tags()["tags"]} == {"demo", "python", "go"}
+
+
+def test_api_follows_index_updates(client, registry):
+    index = _index()
+    registry.write("index.json", index)
+    registry.write("ownership.json", OWNERSHIP)
+    assert client.get("/api/stats").json()["total_packages"] == 3
+
+    index[0] = {**index[0], "total_downloads": 50}
+    registry.write("index.json", index + [package("gamma", "new", tags=["demo"])])
+    assert client.get("/api/stats").json()["total_downloads"] == 52
+    assert {"tag": "demo", "count": 3} in client.get("/api/tags").json()["tags"]
+
+    registry.write("ownership.json", {"namespaces": {"gamma": "carol"}, "packages": {}})
+    owners = {n["namespace"]: n["owner"] for n in client.get("/api/namespaces").json()["namespaces"]}
+    assert owners == {"acme": None, "beta": None, "gamma": "carol"}
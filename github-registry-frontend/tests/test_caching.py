@@ -0,0 +1,79 @@
+"""The ETag/304 response cache (api/caching.py)."""
+
+import pytest
+
+from api import main
+from api.caching import API_CACHE_CONTROL, etag_matches
+from conftest import package
+
+
+@pytest.fixture
+def registry(registry):
+    registry.write("index.json", [package("acme", "agent"), package("beta", "tool")])
+    return registry
+
+
+@pytest.fixture
+def cache(client):
+    [cache] = main.response_caches
+    return cache
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"ab"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_revalidation(client, cache):
+    first = client.get("/api/packages", params={"per_page": 10, "sort": "name"})
+    assert first.headers["cache-control"] == API_CACHE_CONTROL
+    etag = first.headers["etag"]
+
+    # Query parameter order does not matter
+    second = client.get("/api/packages?sort=name&per_page=10")
+    assert second.headers["etag"] == etag and second.content == first.content
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    not_modified = client.get("/api/packages?sort=name&per_page=10", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert client.get("/api/packages?sort=name&per_page=5").headers["etag"] != etag
+
+
+def test_index_update_retires_entries(client, cache, registry):
+    etag = client.get("/packages").headers["etag"]
+    registry.write("index.json", [package("acme", "agent")])
+
+    response = client.get("/packages", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert response.headers["etag"] != etag
+    assert cache.hits == 0
+
+
+def test_only_successful_gets_are_cached(client, cache):
+    assert client.get("/api/packages/acme/missing").status_code == 404
+    assert client.get("/api/packages/acme/missing").status_code == 404
+    assert client.get("/api/packages", params={"sort": "popular"}).status_code == 400
+    assert len(cache) == 0 and cache.hits == 0
+
+    client.get("/api/health")
+    client.get("/metrics")
+    client.head("/api/stats")
+    assert len(cache) == 0
+
+
+def test_entries_are_bounded(client, cache, monkeypatch):
+    monkeypatch.setattr(cache, "maxsize", 2)
+    for per_page in (1, 2, 3):
+        client.get("/api/packages", params={"per_page": per_page})
+    assert len(cache) == 2
+    client.get("/api/packages", params={"per_page": 1})
+    assert cache.hits == 0
@@ -0,0 +1,96 @@
+"""The registry-api.md endpoints served from a local store."""
+
+import hashlib
+
+import pytest
+
+from conftest import package
+
+MANIFEST = b'{"name": "acme/agent", "version": "1.1.0"}'
+ARCHIVE = b"\x28\xb5\x2f\xfd" + bytes(64)
+
+
+@pytest.fixture
+def registry(registry):
+    registry.write("index.json", [package("acme", "agent", ("1.1.0", "1.0.0"))])
+    registry.write("ownership.json", {"namespaces": {"acme": "alice"}, "packages": {"acme/agent": "alice"}})
+    registry.asset("acme", "agent", "1.1.0", "ara.json", MANIFEST)
+    registry.asset("acme", "agent", "1.1.0", "package.tar.zst", ARCHIVE)
+    return registry
+
+
+def test_versions(client):
+    response = client.get("/packages/acme/agent/versions")
+    assert response.status_code == 200
+    assert response.json() == {"namespace": "acme", "name": "agent", "versions": ["1.1.0", "1.0.0"], "latest": "1.1.0"}
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert client.get("/packages/acme/missing/versions").status_code == 404
+
+
+def test_manifest(client):
+    response = client.get("/packages/acme/agent/1.1.0/ara.json")
+    assert response.status_code == 200
+    assert response.content == MANIFEST
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["etag"] == f'"{hashlib.sha256(MANIFEST).hexdigest()}"'
+
+    revalidated = client.get("/packages/acme/agent/1.1.0/ara.json", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+@pytest.mark.parametrize("path", [
+    "/packages/acme/agent/9.9.9/ara.json",  # unknown version
+    "/packages/acme/agent/1.0.0/ara.json",  # listed, but not in the local store
+    "/packages/other/agent/1.1.0/ara.json",
+])
+def test_manifest_not_found(client, path):
+    assert client.get(path).status_code == 404
+
+
+def test_download(client):
+    response = client.get("/packages/acme/agent/1.1.0/download")
+    assert response.status_code == 200
+    assert response.json() == {
+        "download_url": "http://testserver/packages/acme/agent/1.1.0/package.tar.zst",
+        "expires_at": None,
+        "size_bytes": len(ARCHIVE),
+        "checksum": f"sha256:{hashlib.sha256(ARCHIVE).hexdigest()}",
+    }
+
+    archive = client.get(response.json()["download_url"])
+    assert archive.content == ARCHIVE
+    assert archive.headers["etag"] == f'"{hashlib.sha256(ARCHIVE).hexdigest()}"'
+    assert client.get("/packages/acme/agent/1.1.0/package.tar.zst", headers={"If-None-Match": archive.headers["etag"]}).status_code == 304
+
+
+def test_package_details(client):
+    assert client.get("/api/packages/acme/agent").json()["owner"] == "alice"
+    assert client.get("/api/packages/acme/missing").status_code == 404
+
+
+def test_mirrored_registry_files(client, registry):
+    assert client.get("/registry/ownership.json").json()["packages"] == {"acme/agent": "alice"}
+    assert client.head("/registry/index.json").status_code == 200
+    assert client.get("/registry/secrets.json").status_code == 404
+    assert client.get("/releases/ara/acme/agent/v1.1.0/ara.json").content == MANIFEST
+    assert client.get("/releases/ara/acme/agent/v1.1.0/.hidden").status_code == 404
+
+
+def test_stale_binary_index_is_hidden(client, registry):
+    # The header records the git blob SHA-1 of the index.json it was built from
+    index = (registry.path / "index.json").read_bytes()
+    source = hashlib.sha1(b"blob %d\x00" % len(index) + index).digest()
+    registry.write("index.bin", b"ARAIDX" + bytes(10) + source + bytes(16))
+    assert client.get("/registry/index.bin").status_code == 200
+
+    registry.write("index.json", [package("acme", "agent", ("1.2.0", "1.1.0", "1.0.0"))])
+    assert client.get("/registry/index.bin").status_code == 404
+
+
+def test_dictionary(client, registry):
+    path = registry.releases / "ara-dict" / "123" / "dictionary.zdict"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"dictionary")
+    assert client.get("/releases/ara-dict/123/dictionary.zdict").content == b"dictionary"
+    assert client.get("/releases/ara-dict/456/dictionary.zdict").status_code == 404
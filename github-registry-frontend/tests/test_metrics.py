@@ -0,0 +1,73 @@
+"""The Prometheus metrics renderer (api/metrics.py) and /metrics."""
+
+import pytest
+
+from api.metrics import CONTENT_TYPE, Registry
+from conftest import package
+
+
+def test_render():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge_callback("entries", "Entries.", lambda: [({"cache": 'a"b\\c\nd'}, 2.5)])
+    requests.inc(route="/b")
+    requests.inc(2, route="/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert registry.render().decode("utf-8").splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 2',
+        'requests_total{route="/b"} 1',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+        "# HELP entries Entries.",
+        "# TYPE entries gauge",
+        'entries{cache="a\\"b\\\\c\\nd"} 2.5',
+    ]
+
+
+def test_labels_must_match():
+    counter = Registry().counter("requests_total", "Requests.", ("route",))
+    with pytest.raises(ValueError):
+        counter.inc(path="/")
+
+
+def _samples(client) -> dict[str, float]:
+    response = client.get("/metrics")
+    assert response.headers["content-type"] == CONTENT_TYPE
+    samples = {}
+    for line in response.text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_endpoint(client, registry):
+    registry.write("index.json", [package("acme", "agent"), package("beta", "tool")])
+    before = _samples(client)
+    route = 'ara_http_requests_total{method="GET",route="/api/packages/{namespace}/{name}",status="%s"}'
+
+    client.get("/api/packages/acme/agent")
+    client.get("/api/packages/acme/agent")
+    client.get("/api/packages/acme/missing")
+    client.get("/no/such/path")
+    after = _samples(client)
+
+    def delta(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    # Routes are templates, and the cached repeat is counted too
+    assert delta(route % "200") == 2
+    assert delta(route % "404") == 1
+    assert delta('ara_cache_hits_total{cache="response"}') == 1
+    assert after["ara_index_packages"] == 2
+    assert not any(name.startswith("ara_http_requests_total") and "/no/such" in name for name in after)
@@ -0,0 +1,99 @@
+"""page/per_page pagination and keyset cursors in /api/packages."""
+
+import pytest
+
+from conftest import package
+
+
+def _index(count: int) -> list[dict]:
+    return [
+        package(
+            f"ns{i % 3}", f"pkg-{i:02d}",
+            tags=["even" if i % 2 == 0 else "odd"],
+            total_downloads=i % 7,
+            updated_at=f"2026-01-{1 + i % 20:02d}T00:00:00+00:00",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def registry(registry):
+    registry.write("index.json", _index(45))
+    return registry
+
+
+def _names(body: dict) -> list[str]:
+    return [f"{p['namespace']}/{p['name']}" for p in body["packages"]]
+
+
+def _walk(client, **params) -> list[str]:
+    seen = []
+    body = client.get("/api/packages", params=params).json()
+    while True:
+        seen += _names(body)
+        if not body["has_next"]:
+            assert body["next_cursor"] is None
+            return seen
+        body = client.get("/api/packages", params={**params, "cursor": body["next_cursor"]}).json()
+        assert body["page"] is None and body["has_prev"]
+
+
+@pytest.mark.parametrize("sort", ["updated", "created", "downloads", "name"])
+def test_cursor_walk_matches_page_walk(client, sort):
+    by_page = []
+    for page in range(1, 4):
+        body = client.get("/api/packages", params={"sort": sort, "page": page, "per_page": 20}).json()
+        assert body["total"] == 45 and body["page"] == page
+        assert body["has_prev"] == (page > 1) and body["has_next"] == (page < 3)
+        by_page += _names(body)
+
+    assert len(set(by_page)) == 45
+    assert _walk(client, sort=sort, per_page=20) == by_page
+
+
+def test_sort_orders(client):
+    downloads = client.get("/api/packages", params={"sort": "downloads", "per_page": 100}).json()["packages"]
+    assert [p["total_downloads"] for p in downloads] == sorted((p["total_downloads"] for p in downloads), reverse=True)
+    names = _names(client.get("/api/packages", params={"sort": "name", "per_page": 100}).json())
+    assert names == sorted(names)
+
+
+def test_filtered_cursor_walk(client):
+    params = {"tags": "even", "namespace": "ns0", "per_page": 3}
+    expected = [f"ns0/pkg-{i:02d}" for i in range(0, 45, 6)]
+    assert sorted(_walk(client, **params)) == expected
+    assert client.get("/api/packages", params=params).json()["total"] == len(expected)
+
+
+def test_cursor_survives_index_changes(client, registry):
+    first = client.get("/api/packages", params={"sort": "name", "per_page": 10}).json()
+    assert _names(first)[-1] == "ns0/pkg-27"
+
+    # A package sorting before the cursor must not shift the next page
+    registry.write("index.json", _index(45) + [package("aaa", "new")])
+    second = client.get("/api/packages", params={"sort": "name", "per_page": 10, "cursor": first["next_cursor"]}).json()
+    assert _names(second)[0] == "ns0/pkg-30"
+    assert second["total"] == 46
+
+
+@pytest.mark.parametrize("params, detail", [
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"sort": "name", "cursor": "WyJuYW1lIixbMV1d"}, "Invalid cursor"),  # ["name",[1]]: a key of the wrong type
+    ({"sort": "popular"}, "Invalid sort: popular"),
+])
+def test_rejects_bad_requests(client, params, detail):
+    response = client.get("/api/packages", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_cursor_is_tied_to_its_sort(client):
+    cursor = client.get("/api/packages", params={"sort": "name", "per_page": 10}).json()["next_cursor"]
+    response = client.get("/api/packages", params={"sort": "updated", "cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("params", [{"page": 0}, {"per_page": 0}, {"per_page": 101}])
+def test_rejects_out_of_range_pages(client, params):
+    assert client.get("/api/packages", params=params).status_code == 422
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""End-to-end benchmarks of ``ara`` commands against a local fake GitHub.
+
+Starts ``fakegithub.py`` in its own process, seeded with a registry of the
+requested size, then runs each CLI flow in a fresh process pointed at it.
+For every flow and registry size it reports median wall time, API requests
+and bytes transferred (as counted by the fake server), and the CLI
+process's peak resident memory.
+
+Flows::
+
+    search      ara search pkg-1           loads the full index
+    info        ara info ns1/pkg-1         one package lookup
+    install     ara install ns1/pkg-1      lookup, release and archive download
+    install-many ara install ns1/pkg-1 ... ten packages, releases looked up in one batch
+    publish     ara publish                build, publish issue, poll until closed
+    unpublish   ara unpublish ns1/pkg-1@1.0.0
+    delete      ara delete ns1/pkg-1 --yes
+
+The fake server is reset before every run, so runs are independent. Each
+run also starts with empty local caches (binary index, dictionaries and the
+archive store) unless ``--warm`` is given, in which case one untimed run
+fills them first.
+
+``ara publish`` waits two seconds before its first poll of the publish
+issue, so its wall time has that floor however fast the server answers.
+
+Usage::
+
+    python benchmarks/e2e.py
+    python benchmarks/e2e.py --packages 100,1000,100000 --latency-ms 50 --runs 3
+    python benchmarks/e2e.py --flow info --flow install --warm --format json -o e2e.json
+
+Run from an environment where ``ara_github`` is installed (Linux or macOS;
+peak memory comes from ``os.wait4``).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakegithub import OWNER, REPO, package_name  # noqa: E402
+
+FLOWS = ("search", "info", "install", "install-many", "publish", "unpublish", "delete")
+
+# Packages installed together by the install-many flow
+MANY = 10
+
+
+class FakeServer:
+    """
+    Handle on a fakegithub.py process.
+
+    The server runs apart from this process so that a large seeded registry
+    does not inflate the memory of the CLI processes forked from here.
+    """
+
+    def __init__(self, api_url: str):
+        self.api_url = api_url
+
+    def reset(self) -> None:
+        urllib.request.urlopen(urllib.request.Request(f"{self.api_url}/_bench/reset", method="POST")).read()
+
+    def stats(self) -> dict:
+        return json.load(urllib.request.urlopen(f"{self.api_url}/_bench/stats"))
+
+
+@contextmanager
+def fake_server(packages: int, latency_ms: float) -> Iterator[FakeServer]:
+    script = Path(__file__).resolve().parent / "fakegithub.py"
+    proc = subprocess.Popen(
+        [sys.executable, str(script), "--packages", str(packages), "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        api_url = proc.stdout.readline().strip()
+        if not api_url:
+            raise RuntimeError("fakegithub.py exited before serving")
+        yield FakeServer(api_url)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+@dataclass
+class Run:
+    wall: float
+    peak_rss_kb: int
+    stats: dict
+
+
+@dataclass
+class FlowResult:
+    flow: str
+    packages: int
+    runs: list[Run]
+
+    def summary(self) -> dict:
+        middle = sorted(self.runs, key=lambda r: r.wall)[len(self.runs) // 2]
+        return {
+            "flow": self.flow,
+            "packages": self.packages,
+            "runs": len(self.runs),
+            "wall_ms": round(statistics.median(r.wall for r in self.runs) * 1000, 1),
+            "peak_rss_mb": round(max(r.peak_rss_kb for r in self.runs) / 1024, 1),
+            "requests": middle.stats["requests"],
+            "bytes_in": middle.stats["bytes_in"],
+            "bytes_out": middle.stats["bytes_out"],
+            "by_endpoint": middle.stats["by_endpoint"],
+        }
+
+
+def _flow_args(flow: str, workdir: Path) -> list[str]:
+    namespace, name = package_name(1)
+    package = f"{namespace}/{name}"
+    if flow == "search":
+        return ["search", name]
+    if flow == "info":
+        return ["info", package]
+    if flow == "install":
+        return ["install", package, "-o", str(workdir / "installed")]
+    if flow == "install-many":
+        packages = ["/".join(package_name(i)) for i in range(1, MANY + 1)]
+        return ["install", *packages, "-o", str(workdir / "installed")]
+    if flow == "publish":
+        return ["publish", "-p", str(workdir / "package")]
+    if flow == "unpublish":
+        return ["unpublish", f"{package}@1.0.0"]
+    if flow == "delete":
+        return ["delete", package, "--yes"]
+    raise ValueError(f"Unknown flow: {flow}")
+
+
+def _prepare(workdir: Path) -> None:
+    package = workdir / "package"
+    package.mkdir()
+    (package / "ara.json").write_text(json.dumps({
+        "name": "bench/new-package",
+        "version": "1.0.0",
+        "description": "Package published by the end-to-end benchmark",
+        "author": "bench@example.com",
+        "tags": ["bench"],
+    }))
+    for i in range(8):
+        (package / f"file-{i}.md").write_text(f"# File {i}\n" + "lorem ipsum dolor sit amet " * 150)
+
+
+def _rss_kb(ru_maxrss: int) -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return ru_maxrss // 1024 if sys.platform == "darwin" else ru_maxrss
+
+
+def run_cli(args: list[str], env: dict) -> tuple[float, int]:
+    """Run ``ara`` in a new process. Returns (wall seconds, peak RSS in KB)."""
+    code = "import sys; sys.argv[0] = 'ara'; from ara_github.cli import main; main()"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code, *args],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ara {' '.join(args)} exited with {proc.returncode}:\n{output.decode(errors='replace')}")
+    return wall, _rss_kb(usage.ru_maxrss)
+
+
+def bench_flow(
+    fake: FakeServer, flow: str, runs: int, warm: bool, progress: Callable[[str], None]
+) -> list[Run]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ara-bench-") as tmp:
+        root = Path(tmp)
+        cache = root / "cache"
+        env = {
+            **os.environ,
+            "GITHUB_API_URL": fake.api_url,
+            "GITHUB_REPO": f"{OWNER}/{REPO}",
+            "GITHUB_TOKEN": "bench-token",
+            "ARA_INDEX_CACHE": str(cache / "index"),
+            "ARA_DICT_CACHE": str(cache / "dictionaries"),
+            "ARA_ARCHIVE_CACHE": str(cache / "archives"),
+        }
+        for name in ("ARA_REGISTRY", "ARA_REGISTRY_BACKEND", "ARA_REGISTRY_PATH", "ARA_REGISTRY_URL"):
+            env.pop(name, None)
+
+        for i in range(runs + (1 if warm else 0)):
+            workdir = root / f"run-{i}"
+            workdir.mkdir()
+            _prepare(workdir)
+            if not warm:
+                shutil.rmtree(cache, ignore_errors=True)
+            fake.reset()
+            wall, peak = run_cli(_flow_args(flow, workdir), env)
+            if warm and i == 0:
+                continue  # fills the cache
+            results.append(Run(wall, peak, fake.stats()))
+            progress(f"  {flow} run {len(results)}/{runs}: {wall * 1000:.0f} ms")
+    return results
+
+
+def to_text(summaries: list[dict], latency_ms: float, warm: bool) -> str:
+    lines = [f"Latency {latency_ms:g} ms per request, {'warm' if warm else 'cold'} caches", ""]
+    lines.append(f"{'packages':>9} {'flow':<12} {'wall ms':>9} {'requests':>9} {'KB out':>9} {'KB in':>8} {'peak MB':>8}")
+    for s in summaries:
+        lines.append(
+            f"{s['packages']:>9} {s['flow']:<12} {s['wall_ms']:>9.1f} {s['requests']:>9} "
+            f"{s['bytes_out'] / 1024:>9.1f} {s['bytes_in'] / 1024:>8.1f} {s['peak_rss_mb']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", default="100,1000,10000", help="comma-separated registry sizes (default: 100,1000,10000)")
+    parser.add_argument("--flow", action="append", choices=FLOWS, help="flow to run (repeatable; default: all)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every API request (default: 0)")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per flow; the median is reported (default: 3)")
+    parser.add_argument("--warm", action="store_true", help="keep the local caches (index, dictionaries, archives) between runs")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("-o", "--output", type=Path, help="write the report to a file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.packages.split(",")]
+    flows = args.flow or list(FLOWS)
+    if any(size < 2 for size in sizes):
+        parser.error("--packages sizes must be at least 2")
+    if "install-many" in flows and any(size <= MANY for size in sizes):
+        parser.error(f"--packages sizes must be greater than {MANY} for install-many")
+    progress = (lambda message: None) if args.quiet else (lambda message: print(message, file=sys.stderr))
+
+    summaries = []
+    for size in sizes:
+        progress(f"Seeding a registry of {size} packages...")
+        with fake_server(size, args.latency_ms) as fake:
+            for flow in flows:
+                runs = bench_flow(fake, flow, max(1, args.runs), args.warm, progress)
+                summaries.append(FlowResult(flow, size, runs).summary())
+
+    if args.format == "json":
+        output = json.dumps(
+            {"latency_ms": args.latency_ms, "warm_cache": args.warm, "results": summaries},
+            indent=2,
+        )
+    else:
+        output = to_text(summaries, args.latency_ms, args.warm)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,584 @@
+"""A local stand-in for the parts of the GitHub API ``ara`` uses.
+
+Serves the contents, releases, issues, actions and user REST endpoints for
+one repository from memory, the GraphQL release lookups ``ara`` batches, and
+release downloads, with a configurable delay per request, and counts
+requests and bytes per endpoint so benchmarks can report them.
+
+Publish, unpublish and delete issues are processed the moment they are
+opened, the way the registry's Actions workflows would process them: the
+release is created or removed, ``registry/index.json`` and
+``registry/index.bin`` are rewritten and the issue is closed. Workflow
+dispatches complete immediately with success.
+
+Seeded registries can be large (100k packages), so seeded releases are not
+stored individually: each package version in the seed index has a release
+whose assets are served from one shared sample archive.
+
+Run it as a script to serve a seeded registry on its own; it prints the API
+URL and then answers until interrupted::
+
+    python benchmarks/fakegithub.py --packages 1000 --latency-ms 50
+
+Benchmarks drive a running server through two endpoints that are not
+counted in the statistics: ``POST /_bench/reset`` and ``GET /_bench/stats``.
+"""
+
+import argparse
+import base64
+import io
+import json
+import re
+import sys
+import tarfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import zstandard as zstd
+
+from ara_github import binindex, fastjson, index as index_mod
+from ara_github.records import Index
+
+OWNER = "bench"
+REPO = "registry"
+USER = "bench-user"
+
+INDEX_PATH = "registry/index.json"
+OWNERSHIP_PATH = "registry/ownership.json"
+BINARY_INDEX_PATH = "registry/index.bin"
+
+_TAGS = ("agent", "mcp", "docs", "search", "code", "data", "ops", "test", "web", "ai")
+_TYPES = ("kiro-agent", "mcp-server", "context", "skill")
+
+
+def package_name(i: int) -> tuple[str, str]:
+    """Namespace and name of the i-th seeded package."""
+    return f"ns{i % 100}", f"pkg-{i}"
+
+
+def seed_index(packages: int, versions: int = 3) -> list[dict]:
+    """Generate a registry index with the given number of packages."""
+    created = "2025-01-01T00:00:00+00:00"
+    entries = []
+    for i in range(packages):
+        namespace, name = package_name(i)
+        published = [f"1.{v}.0" for v in reversed(range(versions))]
+        entries.append({
+            "namespace": namespace,
+            "name": name,
+            "description": f"Benchmark package number {i} for registry load tests",
+            "type": _TYPES[i % len(_TYPES)],
+            "latest_version": published[0],
+            "versions": published,
+            "tags": [_TAGS[i % len(_TAGS)], _TAGS[(i // 10) % len(_TAGS)]],
+            "total_downloads": i * 7 % 1000,
+            "created_at": created,
+            "updated_at": created,
+            "downloads_by_version": {},
+        })
+    return entries
+
+
+def sample_archive(files: int = 8, size: int = 4096) -> bytes:
+    """A .tar.zst package archive with an ara.json and some text files."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        members = {"ara.json": json.dumps({"name": "bench/sample", "version": "1.0.0"}).encode()}
+        for i in range(files):
+            members[f"docs/file-{i}.md"] = (f"# File {i}\n" + "lorem ipsum dolor sit amet " * (size // 27)).encode()
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return zstd.ZstdCompressor(level=19).compress(buf.getvalue())
+
+
+def _blob_sha(content: bytes) -> str:
+    return binindex.source_id(content)
+
+
+def _tag(namespace: str, name: str, version: str) -> str:
+    return f"ara/{namespace}/{name}/v{version}"
+
+
+@dataclass
+class Stats:
+    requests: Counter = field(default_factory=Counter)
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.total,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "by_endpoint": dict(self.requests.most_common()),
+        }
+
+
+class FakeGitHub:
+    """
+    In-memory repository state plus the HTTP server that exposes it.
+
+    Use as a context manager; ``api_url`` is the value for GITHUB_API_URL.
+    ``reset`` restores the seeded state so every benchmark run starts equal.
+    Set ``private`` to report the repository as private to GraphQL queries.
+    """
+
+    def __init__(self, packages: int = 10, latency: float = 0.0, versions: int = 3):
+        self.latency = latency
+        self.private = False
+        self.started = time.time()
+        self.lock = threading.RLock()
+        self.stats = Stats()
+        self.archive = sample_archive()
+        self.manifest = json.dumps({"name": "bench/sample", "version": "1.0.0"}).encode()
+
+        seed = seed_index(packages, versions)
+        ownership = {"namespaces": {}, "packages": {f"{p['namespace']}/{p['name']}": USER for p in seed}}
+        index_json = fastjson.dumps(seed, indent=True)
+        self._seed_files = {
+            INDEX_PATH: index_json,
+            BINARY_INDEX_PATH: binindex.build(seed, binindex.source_id(index_json)),
+            OWNERSHIP_PATH: fastjson.dumps(ownership, indent=True),
+        }
+        self._seed_tags = {}
+        for pkg in seed:
+            for version in pkg["versions"]:
+                self._seed_tags[_tag(pkg["namespace"], pkg["name"], version)] = len(self._seed_tags) + 1
+        self._seed_ids = {release_id: tag for tag, release_id in self._seed_tags.items()}
+        self.reset()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        with self.lock:
+            self.files = dict(self._seed_files)
+            self.tags = dict(self._seed_tags)  # tag -> release id
+            self.ids = dict(self._seed_ids)  # release id -> tag
+            self.releases: dict[int, dict] = {}  # created releases, by id
+            self.assets: dict[int, tuple[int, str, bytes]] = {}  # asset id -> (release id, name, content)
+            self.issues: dict[int, dict] = {}
+            self.runs: dict[int, dict] = {}
+            self.next_id = len(self.tags) + 1
+            self.stats = Stats()
+
+    def __enter__(self) -> "FakeGitHub":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    # -- releases -----------------------------------------------------------
+
+    def release(self, tag: str) -> Optional[dict]:
+        release_id = self.tags.get(tag)
+        if release_id is None:
+            return None
+        base = f"{self.api_url}/repos/{OWNER}/{REPO}"
+        if release_id in self.releases:
+            release = dict(self.releases[release_id])
+            assets = [(aid, name, len(content)) for aid, (rid, name, content) in self.assets.items() if rid == release_id]
+        else:
+            release = {"id": release_id, "tag_name": tag, "name": tag, "body": ""}
+            assets = [
+                (-2 * release_id, "package.tar.zst", len(self.archive)),
+                (-2 * release_id - 1, "ara.json", len(self.manifest)),
+            ]
+        release["upload_url"] = f"{self.api_url}/uploads/repos/{OWNER}/{REPO}/releases/{release_id}/assets{{?name,label}}"
+        release["assets"] = [
+            {
+                "id": aid,
+                "name": name,
+                "size": size,
+                "download_count": 0,
+                "url": f"{base}/releases/assets/{aid}",
+                "browser_download_url": f"{self.api_url}/{OWNER}/{REPO}/releases/download/{tag}/{name}",
+            }
+            for aid, name, size in assets
+        ]
+        return release
+
+    def graphql_release(self, tag: str) -> Optional[dict]:
+        release = self.release(tag)
+        if release is None:
+            return None
+        return {
+            "databaseId": release["id"],
+            "tagName": release["tag_name"],
+            "name": release["name"],
+            "releaseAssets": {
+                "nodes": [
+                    {
+                        "name": asset["name"],
+                        "size": asset["size"],
+                        "downloadCount": asset["download_count"],
+                        "downloadUrl": asset["browser_download_url"],
+                    }
+                    for asset in release["assets"]
+                ],
+            },
+        }
+
+    def download(self, tag: str, name: str) -> Optional[bytes]:
+        release = self.release(tag)
+        for asset in release["assets"] if release else []:
+            if asset["name"] == name:
+                return self.asset_content(asset["id"])
+        return None
+
+    def asset_content(self, asset_id: int) -> Optional[bytes]:
+        if asset_id in self.assets:
+            return self.assets[asset_id][2]
+        # Seeded releases have asset ids -2 * id (archive) and -2 * id - 1 (ara.json)
+        release_id = -asset_id // 2
+        if asset_id >= 0 or release_id in self.releases or release_id not in self.ids:
+            return None
+        return self.archive if asset_id % 2 == 0 else self.manifest
+
+    def create_release(self, tag: str, title: str, body: str) -> dict:
+        release_id = self._new_id()
+        self.tags[tag] = release_id
+        self.ids[release_id] = tag
+        self.releases[release_id] = {"id": release_id, "tag_name": tag, "name": title, "body": body}
+        return self.release(tag)
+
+    def delete_release(self, release_id: int) -> bool:
+        tag = self.ids.pop(release_id, None)
+        if tag is None:
+            return False
+        del self.tags[tag]
+        if self.releases.pop(release_id, None) is not None:
+            for aid in [aid for aid, (rid, _, _) in self.assets.items() if rid == release_id]:
+                del self.assets[aid]
+        return True
+
+    # -- the registry workflows ----------------------------------------------
+
+    def _write_index(self, idx: Index) -> None:
+        entries = idx.to_list()
+        content = fastjson.dumps(entries, indent=True)
+        self.files[INDEX_PATH] = content
+        self.files[BINARY_INDEX_PATH] = binindex.build(entries, binindex.source_id(content))
+
+    def _process_issue(self, issue: dict) -> None:
+        labels = {label["name"] for label in issue["labels"]}
+        title, body = issue["title"], issue["body"]
+        idx = Index.from_list(fastjson.loads(self.files[INDEX_PATH]))
+        if "ara-publish" in labels:
+            manifest = json.loads(re.search(r"### Manifest\n```json\n(.*?)\n```", body, re.S).group(1))
+            archive = base64.b85decode(re.search(r"### Package Data\n```\n(.*?)\n```", body, re.S).group(1))
+            namespace, name = manifest["name"].split("/", 1)
+            version = manifest["version"]
+            release = self.create_release(_tag(namespace, name, version), f"{namespace}/{name} v{version}", "")
+            for asset_name, content in (("package.tar.zst", archive), ("ara.json", json.dumps(manifest).encode())):
+                self.assets[self._new_id()] = (release["id"], asset_name, content)
+            index_mod.record_version(idx, namespace, name, version, manifest)
+            ownership = fastjson.loads(self.files[OWNERSHIP_PATH])
+            index_mod.claim_ownership(ownership, namespace, name, issue["user"]["login"])
+            self.files[OWNERSHIP_PATH] = fastjson.dumps(ownership, indent=True)
+        elif "ara-unpublish" in labels:
+            package, version = title.split("] ", 1)[1].rsplit("@", 1)
+            namespace, name = package.split("/", 1)
+            release_id = self.tags.get(_tag(namespace, name, version))
+            if release_id is not None:
+                self.delete_release(release_id)
+            index_mod.remove_version(idx, namespace, name, version)
+        elif "ara-delete" in labels:
+            namespace, name = title.split("] ", 1)[1].split("/", 1)
+            prefix = f"ara/{namespace}/{name}/"
+            for tag in [t for t in self.tags if t.startswith(prefix)]:
+                self.delete_release(self.tags[tag])
+            idx.remove(namespace, name)
+        else:
+            return
+        self._write_index(idx)
+        self._record_run("process-publish-issue")
+        issue["state"] = "closed"
+        issue["comments"].append({"id": self._new_id(), "body": "✅ Processed"})
+
+    def _record_run(self, workflow: str) -> dict:
+        run_id = self._new_id()
+        run = {
+            "id": run_id,
+            "name": workflow,
+            "event": "workflow_dispatch",
+            "status": "completed",
+            "conclusion": "success",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.runs[run_id] = run
+        return run
+
+    # -- request routing ----------------------------------------------------
+
+    def handle(self, method: str, path: str, query: dict, headers: dict, body: bytes) -> tuple[str, int, dict, bytes]:
+        """Route one request. Returns (endpoint template, status, headers, body)."""
+        repo = f"/repos/{OWNER}/{REPO}"
+        upload = f"/uploads/repos/{OWNER}/{REPO}"
+        with self.lock:
+            if path == "/user" and method == "GET":
+                return "/user", *_json({"login": USER})
+
+            if path == "/graphql" and method == "POST":
+                return "/graphql", *_json(self._graphql(json.loads(body)))
+
+            download = f"/{OWNER}/{REPO}/releases/download/"
+            if path.startswith(download) and method == "GET":
+                tag, _, name = unquote(path[len(download):]).rpartition("/")
+                content = self.download(tag, name)
+                template = "/{owner}/{repo}/releases/download/{tag}/{name}"
+                if content is None:
+                    return template, *_json({"message": "Not Found"}, 404)
+                return template, 200, {"Content-Type": "application/octet-stream"}, content
+
+            if path.startswith(upload + "/releases/"):
+                release_id = int(path[len(upload) + len("/releases/"):].split("/", 1)[0])
+                template = "/uploads/repos/{owner}/{repo}/releases/{id}/assets"
+                if release_id not in self.releases:
+                    return template, *_json({"message": "Not Found"}, 404)
+                asset_id = self._new_id()
+                self.assets[asset_id] = (release_id, query["name"][0], body)
+                return template, *_json({"id": asset_id, "name": query["name"][0], "size": len(body)}, 201)
+
+            if not path.startswith(repo + "/"):
+                return path, *_json({"message": "Not Found"}, 404)
+            rest = path[len(repo) + 1:]
+
+            if rest.startswith("contents/"):
+                return self._contents(method, unquote(rest[len("contents/"):]), headers, body)
+            if rest == "releases" and method == "GET":
+                per_page = int(query.get("per_page", ["30"])[0])
+                page = int(query.get("page", ["1"])[0])
+                tags = list(self.tags)[(page - 1) * per_page:page * per_page]
+                return "/repos/{owner}/{repo}/releases", *_json([self.release(t) for t in tags])
+            if rest == "releases" and method == "POST":
+                data = json.loads(body)
+                if data["tag_name"] in self.tags:
+                    return "/repos/{owner}/{repo}/releases", *_json({"message": "Validation Failed"}, 422)
+                release = self.create_release(data["tag_name"], data.get("name", ""), data.get("body", ""))
+                return "/repos/{owner}/{repo}/releases", *_json(release, 201)
+            if rest.startswith("releases/tags/") and method == "GET":
+                release = self.release(unquote(rest[len("releases/tags/"):]))
+                if release is None:
+                    return "/repos/{owner}/{repo}/releases/tags/{tag}", *_json({"message": "Not Found"}, 404)
+                return "/repos/{owner}/{repo}/releases/tags/{tag}", *_json(release)
+            if rest.startswith("releases/assets/") and method == "GET":
+                content = self.asset_content(int(rest[len("releases/assets/"):]))
+                template = "/repos/{owner}/{repo}/releases/assets/{id}"
+                if content is None:
+                    return template, *_json({"message": "Not Found"}, 404)
+                return template, 200, {"Content-Type": "application/octet-stream"}, content
+            if rest.startswith("releases/") and method == "DELETE":
+                found = self.delete_release(int(rest[len("releases/"):]))
+                return "/repos/{owner}/{repo}/releases/{id}", 204 if found else 404, {}, b""
+            if rest.startswith("git/refs/tags/") and method == "DELETE":
+                return "/repos/{owner}/{repo}/git/refs/tags/{tag}", 404, {}, b""
+
+            if rest == "issues" and method == "POST":
+                data = json.loads(body)
+                number = len(self.issues) + 1
+                issue = {
+                    "number": number,
+                    "title": data["title"],
+                    "body": data.get("body", ""),
+                    "labels": [{"name": label} for label in data.get("labels", [])],
+                    "state": "open",
+                    "user": {"login": USER},
+                    "html_url": f"{self.api_url}/{OWNER}/{REPO}/issues/{number}",
+                    "comments": [],
+                }
+                self.issues[number] = issue
+                self._process_issue(issue)
+                return "/repos/{owner}/{repo}/issues", *_json(_public_issue(issue), 201)
+            match = re.fullmatch(r"issues/(\d+)(/comments)?", rest)
+            if match and method == "GET":
+                issue = self.issues.get(int(match.group(1)))
+                template = "/repos/{owner}/{repo}/issues/{number}" + (match.group(2) or "")
+                if issue is None:
+                    return template, *_json({"message": "Not Found"}, 404)
+                return template, *_json(issue["comments"] if match.group(2) else _public_issue(issue))
+
+            match = re.fullmatch(r"actions/workflows/([^/]+)/dispatches", rest)
+            if match and method == "POST":
+                self._record_run(match.group(1).rsplit(".", 1)[0])
+                return "/repos/{owner}/{repo}/actions/workflows/{workflow}/dispatches", 204, {}, b""
+            if rest == "actions/runs" and method == "GET":
+                per_page = int(query.get("per_page", ["30"])[0])
+                runs = sorted(self.runs.values(), key=lambda r: r["id"], reverse=True)[:per_page]
+                return "/repos/{owner}/{repo}/actions/runs", *_json({"total_count": len(self.runs), "workflow_runs": runs})
+            match = re.fullmatch(r"actions/runs/(\d+)(/jobs)?", rest)
+            if match and method == "GET":
+                run = self.runs.get(int(match.group(1)))
+                template = "/repos/{owner}/{repo}/actions/runs/{id}" + (match.group(2) or "")
+                if run is None:
+                    return template, *_json({"message": "Not Found"}, 404)
+                if match.group(2):
+                    return template, *_json({"jobs": [{"name": run["name"], "steps": []}]})
+                return template, *_json(run)
+
+            return "/repos/{owner}/{repo}/" + rest, *_json({"message": "Not Found"}, 404)
+
+    def _graphql(self, request: dict) -> dict:
+        """Answer the aliased ``release(tagName: ...)`` lookups of ``get_releases``."""
+        variables = request.get("variables", {})
+        if (variables.get("owner"), variables.get("repo")) != (OWNER, REPO):
+            return {"data": {"repository": None}}
+        repository: dict = {"isPrivate": self.private}
+        for alias, variable in re.findall(r"(\w+): release\(tagName: \$(\w+)\)", request["query"]):
+            repository[alias] = self.graphql_release(variables[variable])
+        return {"data": {"repository": repository}}
+
+    def _contents(self, method: str, path: str, headers: dict, body: bytes) -> tuple[str, int, dict, bytes]:
+        template = "/repos/{owner}/{repo}/contents/{path}"
+        if method == "PUT":
+            data = json.loads(body)
+            current = self.files.get(path)
+            if current is not None and data.get("sha") != _blob_sha(current):
+                return template, *_json({"message": "sha does not match"}, 409)
+            self.files[path] = base64.b64decode(data["content"])
+            return template, *_json({"content": {"path": path, "sha": _blob_sha(self.files[path])}}, 200 if current else 201)
+        if method != "GET":
+            return template, *_json({"message": "Method Not Allowed"}, 405)
+
+        content = self.files.get(path)
+        if content is None:
+            prefix = path.rstrip("/") + "/"
+            listing = [
+                {"name": p[len(prefix):], "path": p, "sha": _blob_sha(c), "size": len(c), "type": "file"}
+                for p, c in sorted(self.files.items())
+                if p.startswith(prefix) and "/" not in p[len(prefix):]
+            ]
+            if not listing:
+                return template, *_json({"message": "Not Found"}, 404)
+            return template, *_json(listing)
+
+        sha = _blob_sha(content)
+        etag = f'"{sha}"'
+        if headers.get("if-none-match") == etag:
+            return template, 304, {"ETag": etag}, b""
+        if headers.get("accept") == "application/vnd.github.raw":
+            return template, 200, {"ETag": etag, "Content-Type": "application/octet-stream"}, content
+        data = {
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": sha,
+            "size": len(content),
+            "encoding": "base64",
+            "content": base64.b64encode(content).decode("ascii"),
+        }
+        status, response_headers, response_body = _json(data)
+        return template, status, {**response_headers, "ETag": etag}, response_body
+
+
+def _public_issue(issue: dict) -> dict:
+    return {k: v for k, v in issue.items() if k != "comments"} | {"comments": len(issue["comments"])}
+
+
+def _json(data, status: int = 200) -> tuple[int, dict, bytes]:
+    return status, {"Content-Type": "application/json"}, json.dumps(data).encode("utf-8")
+
+
+def _make_handler(fake: FakeGitHub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _handle(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if url.path.startswith("/_bench/"):
+                self._control(url.path)
+                return
+            if fake.latency:
+                time.sleep(fake.latency)
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            template, status, response_headers, content = fake.handle(
+                self.command, url.path, parse_qs(url.query), headers, body
+            )
+            with fake.lock:
+                fake.stats.requests[f"{self.command} {template}"] += 1
+                fake.stats.bytes_in += len(body)
+                fake.stats.bytes_out += len(content)
+
+            self.send_response(status)
+            for name, value in response_headers.items():
+                self.send_header(name, value)
+            self.send_header("X-RateLimit-Limit", "5000")
+            self.send_header("X-RateLimit-Remaining", str(max(0, 5000 - fake.stats.total)))
+            self.send_header("X-RateLimit-Reset", str(int(fake.started) + 3600))
+            self.send_header("X-RateLimit-Resource", "core")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            if self.command != "HEAD" and status not in (204, 304):
+                self.wfile.write(content)
+
+        def _control(self, path: str):
+            if path == "/_bench/reset" and self.command == "POST":
+                fake.reset()
+                status, headers, content = _json({"reset": True})
+            elif path == "/_bench/stats" and self.command == "GET":
+                with fake.lock:
+                    status, headers, content = _json(fake.stats.to_dict())
+            else:
+                status, headers, content = _json({"message": "Not Found"}, 404)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = _handle
+
+    return Handler
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub API with a seeded ARA registry.")
+    parser.add_argument("--packages", type=int, default=10, help="packages in the seeded registry (default: 10)")
+    parser.add_argument("--versions", type=int, default=3, help="versions per seeded package (default: 3)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every request (default: 0)")
+    args = parser.parse_args(argv)
+
+    fake = FakeGitHub(packages=args.packages, latency=args.latency_ms / 1000, versions=args.versions)
+    print(fake.api_url, flush=True)
+    print(f"GITHUB_API_URL={fake.api_url} GITHUB_REPO={OWNER}/{REPO}", file=sys.stderr, flush=True)
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
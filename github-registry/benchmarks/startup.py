@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Measure ``ara`` startup cost and fail if it exceeds the budget.
+
+Each scenario runs the CLI in a fresh interpreter under ``python -X
+importtime`` and reports the median time spent importing modules beyond
+what a bare interpreter already loads, plus median wall time. A scenario
+fails if its import time exceeds the budget or if it imports a module it
+should never need (for example pydantic or zstandard for ``ara info``),
+which catches a stray top-level import even on a noisy CI machine.
+
+Usage::
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --budget-ms 100
+    python benchmarks/startup.py --only help --verbose
+
+Run from an environment where ``ara_github`` is installed. The ``info``
+and ``search`` scenarios read the repository's own ``registry/`` directory
+through the local backend, so they never touch the network. CI enforces
+the same budget through ``tests/test_startup.py``, which reuses
+``scenarios``, ``baseline`` and ``measure`` from here.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Maximum median import time per scenario
+BUDGET_MS = 150.0
+
+# Modules only publish/install need; read-only commands must not load them
+HEAVY = ("pydantic", "email_validator", "ara_ref", "zstandard", "tarfile")
+
+
+@dataclass
+class Scenario:
+    name: str
+    args: list[str]
+    forbidden: tuple[str, ...]
+
+
+def _first_package() -> str:
+    index = json.loads((REPO_ROOT / "registry" / "index.json").read_text())
+    return f"{index[0]['namespace']}/{index[0]['name']}" if index else "acme/missing"
+
+
+def scenarios() -> list[Scenario]:
+    local = ["--registry", str(REPO_ROOT)]
+    return [
+        Scenario("help", ["--help"], HEAVY + ("httpx",)),
+        Scenario("info", local + ["info", _first_package()], HEAVY + ("httpx",)),
+        Scenario("search", local + ["search", "agent"], HEAVY + ("httpx",)),
+        Scenario("publish-help", ["publish", "--help"], HEAVY + ("httpx",)),
+    ]
+
+
+def _top_level_imports(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds of each top-level import in -X importtime output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if not name.startswith(" ") or name.startswith("  "):
+            # "| name" is top level; deeper entries are already in their parent's total
+            continue
+        imports[name.strip()] = int(parts[1])
+    return imports
+
+
+def _all_imports(stderr: str) -> set[str]:
+    names = set()
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[1].strip().isdigit():
+            names.add(parts[2].strip())
+    return names
+
+
+def _run(code: str, args: list[str]) -> tuple[float, str]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"ara {' '.join(args)} exited with {result.returncode}:\n{result.stdout}{result.stderr}")
+    return elapsed, result.stderr
+
+
+def baseline() -> set[str]:
+    """Modules a bare interpreter imports at startup (site, encodings, ...)."""
+    _, stderr = _run("pass", [])
+    return set(_top_level_imports(stderr))
+
+
+@dataclass
+class Result:
+    scenario: str
+    import_ms: float
+    wall_ms: float
+    forbidden: list[str]
+    slowest: list[tuple[str, int]]
+
+
+def measure(scenario: Scenario, runs: int, baseline: set[str]) -> Result:
+    code = "import sys; sys.argv[0] = 'ara'; from ara_github.cli import main; main()"
+    import_times, wall_times = [], []
+    imports: dict[str, int] = {}
+    loaded: set[str] = set()
+    for _ in range(runs):
+        wall, stderr = _run(code, scenario.args)
+        imports = {k: v for k, v in _top_level_imports(stderr).items() if k not in baseline}
+        loaded = _all_imports(stderr)
+        import_times.append(sum(imports.values()) / 1000)
+        wall_times.append(wall * 1000)
+
+    forbidden = sorted(m for m in loaded if m.split(".")[0] in scenario.forbidden)
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+    return Result(scenario.name, statistics.median(import_times), statistics.median(wall_times), forbidden, slowest)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per scenario; the median is reported (default: 10)")
+    parser.add_argument(
+        "--budget-ms", type=float, default=BUDGET_MS, help=f"maximum median import time per scenario (default: {BUDGET_MS:.0f})"
+    )
+    parser.add_argument("--only", action="append", metavar="NAME", help="run only this scenario (repeatable)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the slowest top-level imports")
+    args = parser.parse_args(argv)
+
+    imported_at_startup = baseline()
+
+    selected = [s for s in scenarios() if not args.only or s.name in args.only]
+    failed = False
+    print(f"{'scenario':<14} {'imports ms':>10} {'wall ms':>9}  status")
+    for scenario in selected:
+        result = measure(scenario, max(1, args.runs), imported_at_startup)
+        problems = []
+        if result.import_ms > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if result.forbidden:
+            problems.append("imports " + ", ".join(result.forbidden[:5]) + ("..." if len(result.forbidden) > 5 else ""))
+        failed = failed or bool(problems)
+        status = "; ".join(problems) or "ok"
+        print(f"{result.scenario:<14} {result.import_ms:>10.1f} {result.wall_ms:>9.1f}  {status}")
+        if args.verbose:
+            for name, micros in result.slowest:
+                print(f"    {micros / 1000:>8.1f} ms  {name}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Local store of installed package archives.
+
+``ara install`` keeps the archives it installs, per registry, under
+``~/.cache/ara/archives/<registry>/<namespace>/<name>/<version>.tar.zst``
+(override the root with ``ARA_ARCHIVE_CACHE``). Reinstalling a stored
+version needs no download, and a stored version is the base that a newer
+version's delta (see deltas.py) is applied to.
+
+Only the newest ``KEEP`` versions of each package are kept. Backends without
+a cache key (a local registry directory) are already local and are not
+stored.
+
+Next to each archive, ``<version>.json`` records which release it was
+installed from. A version that is unpublished and published again gets a
+new release, so its old archive is dropped instead of installed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from . import semver, storage
+
+# Versions kept per package; one is enough to patch forward from
+KEEP = 2
+
+
+def cache_dir() -> Path:
+    """Root directory of the archive store."""
+    override = os.getenv("ARA_ARCHIVE_CACHE")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ara" / "archives"
+
+
+def _package_dir(store: storage.RegistryStorage, namespace: str, name: str) -> Optional[Path]:
+    key = store.cache_key()
+    if key is None:
+        return None
+    return cache_dir() / hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] / namespace / name
+
+
+def versions(store: storage.RegistryStorage, namespace: str, name: str) -> list[str]:
+    """Stored versions of a package, newest first."""
+    directory = _package_dir(store, namespace, name)
+    if directory is None or not directory.is_dir():
+        return []
+    stored = [p.name.removesuffix(".tar.zst") for p in directory.glob("*.tar.zst")]
+    return semver.sort_versions(v for v in stored if semver.is_valid(v))
+
+
+def fingerprint(release: dict) -> dict:
+    """Identify a release's package.tar.zst: the release, and the asset's size and digest where reported."""
+    asset = next((a for a in release.get("assets", []) if a.get("name") == "package.tar.zst"), {})
+    return {
+        "release": release.get("id"),
+        "size": asset.get("size"),
+        "digest": asset.get("digest") or asset.get("etag"),
+    }
+
+
+def _write(target: Path, content: bytes) -> None:
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, target)
+
+
+def _remove(directory: Path, version: str) -> None:
+    (directory / f"{version}.tar.zst").unlink(missing_ok=True)
+    (directory / f"{version}.json").unlink(missing_ok=True)
+
+
+def load(
+    store: storage.RegistryStorage, namespace: str, name: str, version: str, release: Optional[dict] = None
+) -> Optional[bytes]:
+    """
+    The stored archive of a version, or None.
+
+    With ``release``, the archive must have been stored from that release;
+    one stored from an earlier release of the same version is removed.
+    """
+    directory = _package_dir(store, namespace, name)
+    if directory is None:
+        return None
+    if release is not None:
+        try:
+            recorded = json.loads((directory / f"{version}.json").read_text())
+        except (OSError, ValueError):
+            recorded = None
+        if recorded != fingerprint(release):
+            _remove(directory, version)
+            return None
+    try:
+        return (directory / f"{version}.tar.zst").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def save(
+    store: storage.RegistryStorage,
+    namespace: str,
+    name: str,
+    version: str,
+    archive: bytes,
+    release: Optional[dict] = None,
+) -> None:
+    """Store an archive installed from release, evicting versions beyond the newest KEEP."""
+    directory = _package_dir(store, namespace, name)
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    if release is not None:
+        _write(directory / f"{version}.json", json.dumps(fingerprint(release)).encode("utf-8"))
+    else:
+        (directory / f"{version}.json").unlink(missing_ok=True)
+    _write(directory / f"{version}.tar.zst", archive)
+
+    for old in versions(store, namespace, name)[KEEP:]:
+        _remove(directory, old)
@@ -0,0 +1,167 @@
+"""Compact binary index for point lookups without parsing index.json.
+
+``registry/index.bin`` is generated alongside ``index.json`` and holds the
+same packages in a layout that can be memory-mapped and searched in place::
+
+    header   magic, format version, package count, source id, key table size
+    entries  one fixed-width (key offset, key length, doc offset, doc length)
+             record per package, sorted by key
+    keys     UTF-8 ``namespace/name`` strings
+    docs     each package as compact JSON
+
+A lookup is a binary search over the entries that touches O(log n) keys and
+decodes a single package, so ``ara info``/``ara install`` cost the same on a
+registry of ten packages or a hundred thousand.
+
+The source id is the git blob SHA-1 of the ``index.json`` bytes the file was
+built from. GitHub reports that SHA in directory listings, which lets readers
+detect a stale binary index without downloading ``index.json``.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from . import fastjson
+from .records import is_valid_entry
+
+MAGIC = b"ARAIDX\x00\x00"
+FORMAT_VERSION = 1
+
+# magic, format version, count, source id (raw SHA-1), key table size
+HEADER = struct.Struct("<8sII20sI")
+# key offset, key length, doc offset, doc length (offsets relative to their section)
+ENTRY = struct.Struct("<IIII")
+
+
+def source_id(index_json: bytes) -> str:
+    """Git blob SHA-1 of index.json content, as GitHub reports it."""
+    return hashlib.sha1(b"blob %d\x00" % len(index_json) + index_json).hexdigest()
+
+
+def _key(namespace: str, name: str) -> bytes:
+    return f"{namespace}/{name}".encode("utf-8")
+
+
+def build(index: list[dict], source: str) -> bytes:
+    """
+    Serialize an index into the binary format, tagged with the source id of its index.json.
+
+    Entries without a string namespace and name cannot be keyed and are left out.
+    """
+    packages = sorted(
+        ((_key(p["namespace"], p["name"]), p) for p in index if is_valid_entry(p)),
+        key=lambda item: item[0],
+    )
+
+    entries = bytearray()
+    keys = bytearray()
+    docs = bytearray()
+    for key, pkg in packages:
+        doc = fastjson.dumps(pkg)
+        entries += ENTRY.pack(len(keys), len(key), len(docs), len(doc))
+        keys += key
+        docs += doc
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(packages), bytes.fromhex(source), len(keys))
+    return b"".join((header, entries, keys, docs))
+
+
+class BinaryIndex:
+    """
+    Read-only view over a binary index held in a buffer or memory-mapped file.
+
+    Use as a context manager (or call ``close``) to release the mapping.
+    """
+
+    def __init__(self, buf: Union[bytes, mmap.mmap]):
+        if len(buf) < HEADER.size:
+            raise ValueError("Not an ARA binary index: file is truncated")
+        magic, version, count, source, keys_size = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an ARA binary index: bad magic")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary index format version {version}")
+
+        self._buf = buf
+        self._count = count
+        self.source = source.hex()
+        self._keys_base = HEADER.size + count * ENTRY.size
+        self._docs_base = self._keys_base + keys_size
+        if len(buf) < self._docs_base:
+            raise ValueError("Not an ARA binary index: file is truncated")
+
+    @classmethod
+    def open(cls, path: Path) -> "BinaryIndex":
+        """Memory-map a binary index file."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Not an ARA binary index: file is empty")
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buf)
+        except ValueError:
+            buf.close()
+            raise
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self) -> "BinaryIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._buf, HEADER.size + i * ENTRY.size)
+
+    def _key_at(self, i: int) -> bytes:
+        key_off, key_len, _, _ = self._entry(i)
+        start = self._keys_base + key_off
+        return self._buf[start:start + key_len]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key_at(lo) == key:
+            return lo
+        return None
+
+    def get(self, namespace: str, name: str) -> Optional[dict]:
+        """Look up one package entry, or None if it is not in the index."""
+        i = self._find(_key(namespace, name))
+        if i is None:
+            return None
+        _, _, doc_off, doc_len = self._entry(i)
+        start = self._docs_base + doc_off
+        return fastjson.loads(self._buf[start:start + doc_len])
+
+    def __contains__(self, package: tuple[str, str]) -> bool:
+        return self._find(_key(*package)) is not None
+
+    def names(self) -> Iterator[str]:
+        """Iterate ``namespace/name`` keys in sorted order."""
+        for i in range(self._count):
+            yield self._key_at(i).decode("utf-8")
+
+
+def cache_dir() -> Path:
+    """Directory where binary indexes fetched from remote registries are cached."""
+    override = os.getenv("ARA_INDEX_CACHE")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ara" / "index"
@@ -1,174 +1,202 @@
-"""ARA CLI for GitHub registry."""
+"""ARA CLI for GitHub registry.
+
+Agents run ``ara`` many times per session, so startup cost matters: this
+module imports only click at load time. Each command imports the modules it
+uses (httpx via the registry modules, pydantic via ara_ref, zstandard,
+tarfile) when it runs, so ``ara --help`` or ``ara info`` never pay for
+manifest validation or compression. Keep new imports inside the commands
+that need them; ``benchmarks/startup.py`` enforces the budget.
+"""
 
 import json
 import os
-import re
 import sys
-import tarfile
-import tempfile
 from pathlib import Path
 from typing import Optional
 
 import click
-import zstandard as zstd
-from pydantic import BaseModel, EmailStr, Field, ValidationError
 
-from . import client, index, external
 
+def _load_manifest(manifest_path: Path) -> tuple[dict, str, str, str]:
+    """
+    Read and fully validate an ara.json manifest against the reference model.
 
-class AraManifest(BaseModel):
-    """Pydantic model for ara.json validation."""
-    
-    name: str = Field(pattern=r"^[a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+$", min_length=3, max_length=200)
-    version: str = Field(
-        pattern=r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
-        r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
-        r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))"
-        r"?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
-    )
-    description: str = Field(min_length=1, max_length=500)
-    author: EmailStr
-    tags: list[str] = Field(min_items=1)
-    type: str = Field(
-        default="kiro-agent",
-        pattern=r"^(kiro-agent|mcp-server|context|skill|kiro-powers|kiro-steering|agents-md)$"
-    )
-    files: Optional[list[str]] = None
-    license: Optional[str] = Field(default=None, max_length=100)
-    homepage: Optional[str] = None
-    repository: Optional[str] = None
-    dependencies: Optional[dict[str, str]] = None
-    externalDependencies: Optional[list[dict]] = None
-    sources: Optional[list[dict]] = None
+    Returns (manifest_dict, namespace, name, version). Raises ValueError with
+    a printable message if the file is not valid JSON or not a valid manifest.
+    """
+    from ara_ref.core import manifest_adapter
+    from pydantic import ValidationError
+
+    try:
+        data = json.loads(manifest_path.read_bytes())
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in ara.json: {e}") from e
+
+    try:
+        manifest = manifest_adapter().validate_python(data)
+    except ValidationError as e:
+        raise ValueError(f"Invalid ara.json:\n{e}") from e
+
+    namespace, name = manifest.name.split("/", 1)
+    return data, namespace, name, manifest.version
+
+
+def _registry_errors() -> tuple[type[Exception], ...]:
+    """
+    Exceptions reading the registry index may raise: network, file and parse errors.
+
+    httpx is taken from sys.modules, not imported: if it was never loaded
+    (a local registry), nothing raised an httpx error, and commands stay
+    as quick to start as the startup benchmark requires.
+    """
+    httpx = sys.modules.get("httpx")
+    return (OSError, ValueError) + ((httpx.HTTPError,) if httpx is not None else ())
 
 
 def _validate_manifest(manifest_path: Path) -> tuple[dict, str, str, str]:
     """
-    Validate ara.json manifest.
+    Validate ara.json manifest, exiting with an error if it is invalid.
     
     Returns (manifest_dict, namespace, name, version).
     """
     try:
-        with open(manifest_path) as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON in ara.json: {e}", err=True)
-        sys.exit(1)
-    
-    try:
-        manifest = AraManifest(**data)
-    except ValidationError as e:
-        click.echo(f"Error: Invalid ara.json:\n{e}", err=True)
+        return _load_manifest(manifest_path)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
         sys.exit(1)
-    
-    # Extract namespace and name
-    namespace, name = manifest.name.split("/", 1)
-    
-    return data, namespace, name, manifest.version
 
 
-def _build_archive(package_dir: Path, manifest: dict, output_path: Path) -> None:
-    """Build a .tar.zst archive of the package."""
+def _package_files(package_dir: Path, manifest: dict, gitignore: bool = False) -> dict[str, Path]:
+    """
+    Select the files a package archive holds, as {archive name: path}.
+
+    gitignore makes directories without an .araignore use their .gitignore
+    when the manifest has no files list.
+    """
+    from . import packing
+
     files_list = manifest.get("files")
-    
-    # Create temporary tar file
-    with tempfile.NamedTemporaryFile(suffix=".tar", delete=False) as tmp_tar:
-        tmp_tar_path = Path(tmp_tar.name)
-    
-    try:
-        with tarfile.open(tmp_tar_path, "w") as tar:
-            # Always include ara.json
-            tar.add(package_dir / "ara.json", arcname="ara.json")
+
+    # Always include ara.json
+    files = {"ara.json": package_dir / "ara.json"}
+
+    def add(item: Path) -> None:
+        arcname = item.relative_to(package_dir).as_posix()
+        # The files manifest is generated; a copy in the tree would shadow it
+        if arcname != packing.FILES_MANIFEST:
+            files[arcname] = item
+
+    if files_list is None:
+        # Include all files except common ignores and those matched by .araignore
+        for item in packing.scan(package_dir, gitignore).values():
+            add(item)
+    elif files_list:
+        # Include only specified files
+        for file_path in files_list:
+            full_path = package_dir / file_path
             
-            if files_list is None:
-                # Include all files except common ignores
-                ignores = {".git", "node_modules", "__pycache__", "target", ".DS_Store"}
-                for item in package_dir.rglob("*"):
-                    if item.is_file() and item.name != "ara.json":
-                        # Check if any parent is in ignores
-                        if not any(part in ignores for part in item.parts):
-                            arcname = item.relative_to(package_dir)
-                            tar.add(item, arcname=str(arcname))
-            elif files_list:
-                # Include only specified files
-                for file_path in files_list:
-                    full_path = package_dir / file_path
-                    
-                    # Security: prevent path traversal
-                    try:
-                        full_path.resolve().relative_to(package_dir.resolve())
-                    except ValueError:
-                        click.echo(f"Error: Path escapes package root: {file_path}", err=True)
-                        sys.exit(1)
-                    
-                    if not full_path.exists():
-                        click.echo(f"Warning: File not found: {file_path}", err=True)
-                        continue
-                    
-                    if full_path.is_dir():
-                        # Add directory recursively
-                        for item in full_path.rglob("*"):
-                            if item.is_file():
-                                arcname = item.relative_to(package_dir)
-                                tar.add(item, arcname=str(arcname))
-                    else:
-                        # Add single file
-                        arcname = full_path.relative_to(package_dir)
-                        tar.add(full_path, arcname=str(arcname))
-        
-        # Compress with zstd
-        with open(tmp_tar_path, "rb") as f_in:
-            tar_data = f_in.read()
-        
-        cctx = zstd.ZstdCompressor(level=19)
-        compressed = cctx.compress(tar_data)
-        
-        output_path.write_bytes(compressed)
-    
-    finally:
-        tmp_tar_path.unlink(missing_ok=True)
+            # Security: prevent path traversal
+            try:
+                full_path.resolve().relative_to(package_dir.resolve())
+            except ValueError:
+                click.echo(f"Error: Path escapes package root: {file_path}", err=True)
+                sys.exit(1)
+            
+            if not full_path.exists():
+                click.echo(f"Warning: File not found: {file_path}", err=True)
+                continue
+            
+            if full_path.is_dir():
+                # Add directory recursively
+                for item in full_path.rglob("*"):
+                    if item.is_file():
+                        add(item)
+            else:
+                # Add single file
+                add(full_path)
+    return files
+
+
+def _package_tar(package_dir: Path, manifest: dict, gitignore: bool = False) -> bytes:
+    """Build the uncompressed, deterministic tar of a package (see packing.py)."""
+    from . import packing
+
+    return packing.build_tar(_package_files(package_dir, manifest, gitignore))
+
+
+def _build_archive(
+    package_dir: Path, manifest: dict, output_path: Path, dictionary=None, gitignore: bool = False
+) -> Optional[int]:
+    """
+    Build a .tar.zst archive of the package.
+
+    With a shared dictionary (see dictionaries.py) the archive is compressed
+    with it when that comes out smaller; the zstd frame header then records
+    the dictionary ID. Returns that ID, or None for a plain archive.
+    """
+    from . import dictionaries
+
+    compressed, dict_id = dictionaries.compress(_package_tar(package_dir, manifest, gitignore), dictionary)
+    output_path.write_bytes(compressed)
+    return dict_id
 
 
 def _safe_extract(archive_path: Path, dest_dir: Path) -> None:
-    """Safely extract a .tar.zst archive with path traversal protection."""
-    # Decompress zstd
+    """Safely extract a .tar.zst archive, refusing members that could write outside dest_dir."""
+    import io
+    import tarfile
+
+    from . import dictionaries, packing
+
     with open(archive_path, "rb") as f:
         compressed = f.read()
-    
-    dctx = zstd.ZstdDecompressor()
-    tar_data = dctx.decompress(compressed)
-    
-    # Extract tar
-    with tempfile.NamedTemporaryFile(suffix=".tar", delete=False) as tmp_tar:
-        tmp_tar.write(tar_data)
-        tmp_tar_path = Path(tmp_tar.name)
-    
+
+    # The frame names the dictionary it was compressed with, if any
     try:
-        with tarfile.open(tmp_tar_path, "r") as tar:
-            for member in tar.getmembers():
-                # Security: check for path traversal
-                member_path = Path(member.name)
-                if member_path.is_absolute() or ".." in member_path.parts:
-                    click.echo(f"Error: Unsafe path in archive: {member.name}", err=True)
-                    sys.exit(1)
-                
-                tar.extract(member, dest_dir)
-    finally:
-        tmp_tar_path.unlink(missing_ok=True)
+        dctx = dictionaries.decompressor(compressed)
+    except (FileNotFoundError, ValueError) as e:
+        click.echo(f"Error: Cannot load the compression dictionary for this archive: {e}", err=True)
+        sys.exit(1)
+    tar_data = dctx.decompress(compressed)
 
+    with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r") as tar:
+        # Per-file SHA-256s, absent from archives built before packing.py
+        files = packing.read_manifest(tar)
+        members = [m for m in tar.getmembers() if m.name != packing.FILES_MANIFEST]
+
+        # Check everything before writing anything
+        symlinks = {m.name for m in members if m.issym()}
+        for member in members:
+            problem = packing.check_path(member, dest_dir, symlinks)
+            if problem:
+                click.echo(f"Error: Unsafe archive: {problem}", err=True)
+                sys.exit(1)
+            problem = packing.check_member(tar, member, files) if files is not None else None
+            if problem:
+                click.echo(f"Error: Corrupt archive: {problem}", err=True)
+                sys.exit(1)
+        missing = sorted(set(files or ()) - {m.name for m in members})
+        if missing:
+            click.echo(f"Error: Corrupt archive: missing {', '.join(missing)}", err=True)
+            sys.exit(1)
 
-@click.group()
-def main():
-    """ARA registry CLI backed by GitHub."""
-    pass
+        # The "data" filter (3.12+, and security backports) repeats the checks
+        # against the real filesystem and drops special permission bits
+        extract_args = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        for member in members:
+            tar.extract(member, dest_dir, **extract_args)
 
 
-@main.command()
-@click.option("-p", "--path", type=click.Path(exists=True), default=".", help="Package directory")
-def publish(path: str):
-    """Publish a package to the registry."""
-    # Check for required env vars
+def _require_write_access(action: Optional[str] = None) -> None:
+    """Exit unless the configured registry backend can accept write requests."""
+    from . import storage
+
     try:
+        store = storage.get_storage()
+        if store.read_only:
+            raise ValueError("The configured registry is a read-only mirror")
+        if store.direct_writes:
+            return
         from . import http
         http.get_github_repo()
     except ValueError as e:
@@ -177,8 +205,138 @@ def publish(path: str):
     
     token = os.getenv("GITHUB_TOKEN")
     if not token:
-        click.echo("Error: GITHUB_TOKEN environment variable is required for publishing", err=True)
+        suffix = f" for {action}" if action else ""
+        click.echo(f"Error: GITHUB_TOKEN environment variable is required{suffix}", err=True)
         sys.exit(1)
+
+
+@click.group()
+@click.option(
+    "--registry",
+    envvar="ARA_REGISTRY",
+    help="Read from a registry mirror instead of GitHub (local directory or http(s) URL)",
+)
+@click.option("--trace", is_flag=True, envvar="ARA_TRACE", help="Print a summary of HTTP requests to stderr on exit")
+@click.option(
+    "--trace-json",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    envvar="ARA_TRACE_JSON",
+    help="Write every HTTP request with timing and rate-limit state as JSON to a file ('-' for stderr)",
+)
+@click.pass_context
+def main(ctx: click.Context, registry: Optional[str], trace: bool, trace_json: Optional[str]):
+    """ARA registry CLI backed by GitHub."""
+    if trace or trace_json:
+        _enable_tracing(ctx, trace, trace_json)
+    if registry:
+        if registry.startswith(("http://", "https://")):
+            os.environ["ARA_REGISTRY_URL"] = registry
+            os.environ["ARA_REGISTRY_BACKEND"] = "http"
+        else:
+            os.environ["ARA_REGISTRY_PATH"] = registry
+            os.environ["ARA_REGISTRY_BACKEND"] = "local"
+
+
+def _enable_tracing(ctx: click.Context, summary: bool, json_path: Optional[str]) -> None:
+    """Record HTTP requests for the rest of the run and report them when the command ends."""
+    from . import http
+
+    tracer = http.enable_tracing()
+
+    def report() -> None:
+        if summary:
+            click.echo(tracer.format_summary(), err=True)
+        if json_path:
+            data = json.dumps(tracer.to_dict(), indent=2)
+            if json_path == "-":
+                click.echo(data, err=True)
+            else:
+                Path(json_path).write_text(data + "\n")
+
+    # Runs on success, errors and sys.exit alike
+    ctx.call_on_close(report)
+
+
+def _build_and_publish(
+    package_dir: Path,
+    manifest: dict,
+    namespace: str,
+    name: str,
+    version: str,
+    username: str,
+    dictionary=None,
+    delta: bool = False,
+    gitignore: bool = False,
+) -> None:
+    """Build a package archive and hand it to the registry."""
+    import hashlib
+    import tempfile
+
+    from . import client
+
+    click.echo(f"Building package {namespace}/{name}@{version}...")
+    with tempfile.NamedTemporaryFile(suffix=".tar.zst", delete=False) as tmp:
+        archive_path = Path(tmp.name)
+    
+    try:
+        dict_id = _build_archive(package_dir, manifest, archive_path, dictionary, gitignore)
+        archive_size = archive_path.stat().st_size
+        click.echo(f"Archive size: {archive_size} bytes" + (f" (dictionary {dict_id})" if dict_id else ""))
+        # Archives are deterministic, so unchanged content gives the same digest
+        click.echo(f"Archive SHA-256: {hashlib.sha256(archive_path.read_bytes()).hexdigest()}")
+        
+        # Publish
+        click.echo("Publishing to registry...")
+        result = client.publish(namespace, name, version, manifest, archive_path, username, delta)
+        if result.get("delta_base"):
+            click.echo(f"Added delta from {result['delta_base']}")
+        elif result.get("delta_error"):
+            click.echo(f"Warning: No delta published: {result['delta_error']}", err=True)
+        click.echo(f"Published {namespace}/{name}@{version}")
+    
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+
+def _publish_dictionary(no_dict: bool):
+    """The registry's current compression dictionary, or None if unused or unavailable."""
+    if no_dict:
+        return None
+    from . import dictionaries
+
+    try:
+        return dictionaries.current()
+    except Exception as e:
+        # A plain archive is always valid, so a missing dictionary only costs size
+        click.echo(f"Warning: Compression dictionary unavailable, publishing without it: {e}", err=True)
+        return None
+
+
+def _current_user_or_exit() -> str:
+    from . import index
+
+    try:
+        return index.get_current_user()
+    except Exception as e:
+        click.echo(f"Error: Failed to get GitHub user: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.option("-p", "--path", type=click.Path(exists=True), default=".", help="Package directory")
+@click.option("--batch", is_flag=True, help="Publish every package found under PATH whose version is not yet published")
+@click.option("--no-dict", is_flag=True, help="Do not compress with the registry's shared dictionary")
+@click.option("--delta", is_flag=True, help="Also publish a delta against the previous version for faster upgrades")
+@click.option("--gitignore", is_flag=True, help="Also honour .gitignore files in directories without an .araignore")
+def publish(path: str, batch: bool, no_dict: bool, delta: bool, gitignore: bool):
+    """Publish a package to the registry."""
+    from . import index
+
+    _require_write_access("publishing")
+
+    if batch:
+        _publish_batch(Path(path).resolve(), no_dict, delta, gitignore)
+        return
     
     package_dir = Path(path).resolve()
     manifest_path = package_dir / "ara.json"
@@ -191,11 +349,7 @@ def publish(path: str):
     manifest, namespace, name, version = _validate_manifest(manifest_path)
     
     # Get current user
-    try:
-        username = index.get_current_user()
-    except Exception as e:
-        click.echo(f"Error: Failed to get GitHub user: {e}", err=True)
-        sys.exit(1)
+    username = _current_user_or_exit()
     
     # Check ownership
     ownership_error = index.check_ownership(namespace, name, username)
@@ -204,30 +358,75 @@ def publish(path: str):
         sys.exit(1)
     
     # Check for duplicate version
-    idx = index.fetch_index()
-    for pkg in idx:
-        if pkg.get("namespace") == namespace and pkg.get("name") == name:
-            if version in pkg.get("versions", []):
-                click.echo(f"Error: Version {version} already exists for {namespace}/{name}.", err=True)
-                sys.exit(1)
-    
-    # Build archive
-    click.echo(f"Building package {namespace}/{name}@{version}...")
-    with tempfile.NamedTemporaryFile(suffix=".tar.zst", delete=False) as tmp:
-        archive_path = Path(tmp.name)
-    
-    try:
-        _build_archive(package_dir, manifest, archive_path)
-        archive_size = archive_path.stat().st_size
-        click.echo(f"Archive size: {archive_size} bytes")
-        
-        # Publish
-        click.echo("Publishing to registry...")
-        client.publish(namespace, name, version, manifest, archive_path, username)
-        click.echo(f"Published {namespace}/{name}@{version}")
+    pkg = index.lookup(namespace, name)
+    if pkg and pkg.has_version(version):
+        click.echo(f"Error: Version {version} already exists for {namespace}/{name}.", err=True)
+        sys.exit(1)
     
-    finally:
-        archive_path.unlink(missing_ok=True)
+    _build_and_publish(
+        package_dir, manifest, namespace, name, version, username, _publish_dictionary(no_dict), delta, gitignore
+    )
+
+
+def _publish_batch(root: Path, no_dict: bool = False, delta: bool = False, gitignore: bool = False) -> None:
+    """
+    Publish each package under root that is not already in the registry.
+
+    Duplicates are screened first with only the name/version checks, against
+    one copy of the index, so unchanged packages cost no full validation.
+    """
+    from ara_ref.batch import collect
+    from ara_ref.core import read_identity
+
+    from . import index
+
+    manifest_paths = collect([str(root)])
+    if not manifest_paths:
+        click.echo(f"No ara.json files found under {root}")
+        return
+
+    idx = index.load_index()
+    pending = []
+    failed = 0
+    skipped = 0
+    for manifest_path in manifest_paths:
+        try:
+            full_name, version = read_identity(json.loads(manifest_path.read_bytes()))
+        except ValueError as e:
+            click.echo(f"Error: {manifest_path}: {e}", err=True)
+            failed += 1
+            continue
+        namespace, name = full_name.split("/", 1)
+        pkg = idx.get(namespace, name)
+        if pkg and pkg.has_version(version):
+            skipped += 1
+        else:
+            pending.append(manifest_path)
+
+    click.echo(f"{len(manifest_paths)} package(s) found: {len(pending)} to publish, {skipped} already published")
+
+    published = 0
+    if pending:
+        username = _current_user_or_exit()
+        ownership = index.fetch_ownership()
+        dictionary = _publish_dictionary(no_dict)
+        for manifest_path in pending:
+            try:
+                manifest, namespace, name, version = _load_manifest(manifest_path)
+                ownership_error = index.check_ownership(namespace, name, username, ownership)
+                if ownership_error:
+                    raise ValueError(ownership_error)
+                _build_and_publish(
+                    manifest_path.parent, manifest, namespace, name, version, username, dictionary, delta, gitignore
+                )
+                published += 1
+            except Exception as e:
+                click.echo(f"Error: {manifest_path}: {e}", err=True)
+                failed += 1
+
+    click.echo(f"Published {published}, skipped {skipped} already published, {failed} failed")
+    if failed:
+        sys.exit(1)
 
 
 @main.command()
@@ -237,7 +436,12 @@ def publish(path: str):
 @click.option("--type", "pkg_type", help="Filter by package type")
 def search(query: Optional[str], tags: Optional[str], namespace: Optional[str], pkg_type: Optional[str]):
     """Search for packages in the registry."""
-    idx = index.fetch_index()
+    from . import index
+
+    try:
+        idx = index.load_index()
+    except _registry_errors() as e:
+        raise click.ClickException(f"Cannot read the registry index: {e}")
     
     tag_list = tags.split(",") if tags else None
     results = index.search(idx, q=query, tags=tag_list, namespace=namespace, pkg_type=pkg_type)
@@ -248,121 +452,176 @@ def search(query: Optional[str], tags: Optional[str], namespace: Optional[str],
     
     click.echo(f"Found {len(results)} package(s):\n")
     for pkg in results:
-        ns = pkg.get("namespace", "")
-        name = pkg.get("name", "")
-        version = pkg.get("latest_version", "")
-        desc = pkg.get("description", "")
-        pkg_tags = ", ".join(pkg.get("tags", []))
+        version = pkg.latest_version or ""
+        desc = pkg.description or ""
+        pkg_tags = ", ".join(pkg.tags or [])
         
-        click.echo(f"{ns}/{name}@{version}")
+        click.echo(f"{pkg.full_name}@{version}")
         click.echo(f"  {desc}")
         click.echo(f"  Tags: {pkg_tags}")
         click.echo()
 
 
-@main.command()
-@click.argument("package")
-@click.option("-v", "--version", help="Specific version to install")
-@click.option("-o", "--output", type=click.Path(), default=".", help="Output directory")
-def install(package: str, version: Optional[str], output: str):
-    """Install a package from the registry."""
-    if "/" not in package:
-        click.echo("Error: Package must be in format: namespace/name", err=True)
+def _resolve_version(package: str, pkg, version: Optional[str]) -> str:
+    """Resolve a version or range (latest stable if None) against a package's index entry."""
+    if not pkg:
+        click.echo(f"Error: Package {package} not found", err=True)
         sys.exit(1)
 
-    namespace, name = package.split("/", 1)
-
-    # Resolve version
     if not version:
-        idx = index.fetch_index()
-        for pkg in idx:
-            if pkg.get("namespace") == namespace and pkg.get("name") == name:
-                version = pkg.get("latest_version")
-                break
-
-        if not version:
-            click.echo(f"Error: Package {package} not found", err=True)
-            sys.exit(1)
+        return pkg.latest() or pkg.latest_version
+    try:
+        resolved = pkg.resolve(version)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    if not resolved:
+        click.echo(f"Error: No version of {package} matches {version}", err=True)
+        sys.exit(1)
+    return resolved
 
-    click.echo(f"Installing {namespace}/{name}@{version}...")
 
-    # Download archive
-    with tempfile.NamedTemporaryFile(suffix=".tar.zst", delete=False) as tmp:
-        archive_path = Path(tmp.name)
+def _install_archive(archive_path: Path, output_dir: Path) -> None:
+    """Extract a downloaded package and fetch its external dependencies."""
+    from . import external
 
-    try:
-        client.download_archive(namespace, name, version, archive_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _safe_extract(archive_path, output_dir)
 
-        # Extract
-        output_dir = Path(output).resolve()
-        output_dir.mkdir(parents=True, exist_ok=True)
-        _safe_extract(archive_path, output_dir)
+    # After extracting, look for externalDependencies in the ara.json manifest
+    manifest_path = output_dir / "ara.json"
+    if manifest_path.exists():
+        try:
+            with open(manifest_path) as f:
+                manifest_data = json.load(f)
+        except json.JSONDecodeError:
+            manifest_data = {}
 
-        # After extracting, look for externalDependencies in the ara.json manifest
-        manifest_path = output_dir / "ara.json"
-        if manifest_path.exists():
-            try:
-                with open(manifest_path) as f:
-                    manifest_data = json.load(f)
-            except json.JSONDecodeError:
-                manifest_data = {}
-
-            external_deps = manifest_data.get("externalDependencies") or []
-            if external_deps:
-                click.echo("Resolving external dependencies...")
-                for dep in external_deps:
-                    try:
-                        external.resolve_and_install_external_dependency(dep, output_dir)
-                    except Exception as e:
-                        click.echo(f"Warning: Failed to install external dependency {dep!r}: {e}", err=True)
-
-        click.echo(f"Installed to {output_dir}")
+        external_deps = manifest_data.get("externalDependencies") or []
+        if external_deps:
+            click.echo("Resolving external dependencies...")
+            for dep in external_deps:
+                try:
+                    external.resolve_and_install_external_dependency(dep, output_dir)
+                except Exception as e:
+                    click.echo(f"Warning: Failed to install external dependency {dep!r}: {e}", err=True)
+
+
+@main.command()
+@click.argument("packages", nargs=-1, required=True)
+@click.option("-v", "--version", help="Version or range to install (e.g. 1.2.0, ^1.2, ~1.4.0)")
+@click.option("-o", "--output", type=click.Path(), default=".", help="Output directory")
+def install(packages: tuple[str, ...], version: Optional[str], output: str):
+    """
+    Install one or more packages from the registry.
+
+    Each PACKAGE is namespace/name, optionally followed by @version or
+    @range. With several packages, each is installed into
+    OUTPUT/namespace/name.
+
+    Installed archives are kept in a local store. A version already there is
+    not downloaded again, and a newer version whose release carries a delta
+    against a stored one is patched from it instead of downloaded in full.
+    """
+    import tempfile
+
+    from . import client, index, semver
+
+    if version and len(packages) > 1:
+        click.echo("Error: --version applies to a single package; use namespace/name@version instead", err=True)
+        sys.exit(1)
+
+    requested = []
+    for package in packages:
+        package, _, pinned = package.partition("@")
+        if "/" not in package:
+            click.echo("Error: Package must be in format: namespace/name", err=True)
+            sys.exit(1)
+        namespace, name = package.split("/", 1)
+        requested.append((namespace, name, pinned or version))
 
+    # Exact versions are fetched directly; anything else (no version, or a
+    # range) is resolved against the published versions in the index
+    unresolved = [(namespace, name) for namespace, name, v in requested if not v or not semver.is_valid(v)]
+    try:
+        entries = index.lookup_many(unresolved) if unresolved else {}
+    except _registry_errors() as e:
+        raise click.ClickException(f"Cannot read the registry index: {e}")
+    wanted = []
+    for namespace, name, v in requested:
+        if (namespace, name) in entries:
+            v = _resolve_version(f"{namespace}/{name}", entries[(namespace, name)], v)
+        wanted.append((namespace, name, v))
+
+    output_dir = Path(output).resolve()
+    try:
+        # One lookup for every release, so nothing is downloaded unless all exist
+        releases = client.find_releases(wanted)
     except FileNotFoundError as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
-    finally:
-        archive_path.unlink(missing_ok=True)
+
+    for namespace, name, version in wanted:
+        click.echo(f"Installing {namespace}/{name}@{version}...")
+        target = output_dir if len(wanted) == 1 else output_dir / namespace / name
+
+        with tempfile.NamedTemporaryFile(suffix=".tar.zst", delete=False) as tmp:
+            archive_path = Path(tmp.name)
+        try:
+            source = client.fetch_archive(namespace, name, version, releases[(namespace, name, version)], archive_path)
+            if source == "delta":
+                click.echo("Patched from a stored earlier version")
+            elif source == "stored":
+                click.echo("Using stored archive")
+            _install_archive(archive_path, target)
+            click.echo(f"Installed to {target}")
+        except FileNotFoundError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        finally:
+            archive_path.unlink(missing_ok=True)
 
 
 @main.command()
 @click.argument("package")
 def info(package: str):
     """Show package information."""
+    from . import index
+
     if "/" not in package:
         click.echo("Error: Package must be in format: namespace/name", err=True)
         sys.exit(1)
     
     namespace, name = package.split("/", 1)
     
-    idx = index.fetch_index()
-    pkg = None
-    for p in idx:
-        if p.get("namespace") == namespace and p.get("name") == name:
-            pkg = p
-            break
-    
+    try:
+        pkg = index.lookup(namespace, name)
+    except _registry_errors() as e:
+        raise click.ClickException(f"Cannot read the registry index: {e}")
     if not pkg:
         click.echo(f"Error: Package {package} not found", err=True)
         sys.exit(1)
     
     click.echo(f"Package: {namespace}/{name}")
-    click.echo(f"Description: {pkg.get('description', '')}")
-    click.echo(f"Type: {pkg.get('type', 'kiro-agent')}")
-    click.echo(f"Latest version: {pkg.get('latest_version', '')}")
-    click.echo(f"All versions: {', '.join(pkg.get('versions', []))}")
-    click.echo(f"Tags: {', '.join(pkg.get('tags', []))}")
-    click.echo(f"Downloads: {pkg.get('total_downloads', 0)}")
+    click.echo(f"Description: {pkg.description or ''}")
+    click.echo(f"Type: {pkg.type or 'kiro-agent'}")
+    latest = pkg.latest() or pkg.latest_version or ""
+    click.echo(f"Latest version: {latest}")
+    latest_prerelease = pkg.latest(prerelease=True)
+    if latest_prerelease and latest_prerelease != latest:
+        click.echo(f"Latest prerelease: {latest_prerelease}")
+    click.echo(f"All versions: {', '.join(pkg.versions or [])}")
+    click.echo(f"Tags: {', '.join(pkg.tags or [])}")
+    click.echo(f"Downloads: {pkg.total_downloads or 0}")
 
 
 @main.command()
 @click.argument("package")
 def unpublish(package: str):
     """Unpublish a package version."""
-    token = os.getenv("GITHUB_TOKEN")
-    if not token:
-        click.echo("Error: GITHUB_TOKEN environment variable is required", err=True)
-        sys.exit(1)
+    from . import client, index
+
+    _require_write_access()
     
     if "@" not in package:
         click.echo("Error: Package must be in format: namespace/name@version", err=True)
@@ -398,10 +657,9 @@ def unpublish(package: str):
 @click.confirmation_option(prompt="Are you sure you want to delete this package and all its versions?")
 def delete(package: str):
     """Delete a package and all its versions."""
-    token = os.getenv("GITHUB_TOKEN")
-    if not token:
-        click.echo("Error: GITHUB_TOKEN environment variable is required", err=True)
-        sys.exit(1)
+    from . import client, index
+
+    _require_write_access()
     
     if "/" not in package:
         click.echo("Error: Package must be in format: namespace/name", err=True)
@@ -427,5 +685,193 @@ def delete(package: str):
     click.echo(f"Deleted {namespace}/{name}")
 
 
+@main.command("sync-downloads")
+@click.option("--dry-run", is_flag=True, help="Report changes without writing the index")
+def sync_downloads(dry_run: bool):
+    """Update index download counts from release asset statistics (registry maintainers)."""
+    from . import downloads, http
+
+    # Bulk maintenance job: yield to interactive use of the same token
+    http.set_default_priority(http.BACKGROUND)
+
+    if not dry_run:
+        _require_write_access()
+
+    try:
+        changed = downloads.sync(dry_run=dry_run)
+    except Exception as e:
+        click.echo(f"Error: Failed to sync download counts: {e}", err=True)
+        sys.exit(1)
+
+    if dry_run:
+        click.echo(f"{changed} package(s) would be updated")
+    else:
+        click.echo(f"Updated download counts for {changed} package(s)")
+
+
+@main.group("index")
+def index_group():
+    """Maintain the registry index files."""
+    pass
+
+
+@index_group.command("rebuild")
+def index_rebuild():
+    """Regenerate registry/index.bin if it no longer matches registry/index.json."""
+    from . import http, storage
+
+    http.set_default_priority(http.BACKGROUND)
+
+    _require_write_access()
+
+    try:
+        rebuilt = storage.get_storage().rebuild_binary_index()
+    except Exception as e:
+        click.echo(f"Error: Failed to rebuild binary index: {e}", err=True)
+        sys.exit(1)
+
+    click.echo("Rebuilt registry/index.bin" if rebuilt else "registry/index.bin is up to date")
+
+
+@main.group("dict")
+def dict_group():
+    """Train and list the shared zstd dictionaries archives are compressed with."""
+    pass
+
+
+def _training_samples(paths: tuple[str, ...], gitignore: bool = False) -> list[bytes]:
+    """Uncompressed tars of the packages under paths (package directories or .tar.zst archives)."""
+    from ara_ref.batch import collect
+
+    from . import dictionaries
+
+    samples = []
+    for path in map(Path, paths):
+        archives = [path] if path.is_file() else sorted(path.rglob("*.tar.zst"))
+        for archive in archives:
+            data = archive.read_bytes()
+            samples.append(dictionaries.decompressor(data).decompress(data))
+        if path.is_dir():
+            for manifest_path in collect([str(path)]):
+                manifest = json.loads(manifest_path.read_bytes())
+                samples.append(_package_tar(manifest_path.parent, manifest, gitignore))
+    return samples
+
+
+@dict_group.command("train")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--size", type=int, default=64 * 1024, show_default=True, help="Dictionary size in bytes")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Also write the dictionary to this file")
+@click.option("--dry-run", is_flag=True, help="Train and report the savings without publishing")
+@click.option("--activate/--no-activate", default=True, show_default=True, help="Make it the dictionary new archives use")
+@click.option("--gitignore", is_flag=True, help="Also honour .gitignore files in directories without an .araignore")
+def dict_train(
+    paths: tuple[str, ...], size: int, output: Optional[str], dry_run: bool, activate: bool, gitignore: bool
+):
+    """Train a dictionary on the packages under PATHS and publish it to the registry.
+
+    PATHS are directories searched for ara.json files and .tar.zst archives,
+    or archive files.
+    """
+    from . import dictionaries, storage
+
+    if not dry_run:
+        _require_write_access("publishing a dictionary")
+
+    try:
+        samples = _training_samples(paths, gitignore)
+    except Exception as e:
+        click.echo(f"Error: Failed to read packages: {e}", err=True)
+        sys.exit(1)
+    if not samples:
+        click.echo("Error: No packages found to train on", err=True)
+        sys.exit(1)
+
+    click.echo(f"Training a {size}-byte dictionary on {len(samples)} package(s)...")
+    try:
+        dictionary = dictionaries.train(samples, size)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    plain = primed = 0
+    for sample in samples:
+        without, _ = dictionaries.compress(sample)
+        best, _ = dictionaries.compress(sample, dictionary)
+        plain += len(without)
+        primed += len(best)
+    click.echo(
+        f"Dictionary {dictionary.dict_id()}: {sum(map(len, samples))} bytes of packages compress to "
+        f"{primed} bytes with it, {plain} without ({100 * (plain - primed) / plain:.1f}% smaller)"
+    )
+
+    if output:
+        Path(output).write_bytes(dictionary.as_bytes())
+        click.echo(f"Wrote {output}")
+    if dry_run:
+        return
+
+    try:
+        dictionaries.publish(storage.get_storage(), dictionary, len(samples), make_current=activate)
+    except Exception as e:
+        click.echo(f"Error: Failed to publish dictionary: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Published dictionary {dictionary.dict_id()}" + (" as the current dictionary" if activate else ""))
+
+
+@dict_group.command("list")
+def dict_list():
+    """List the registry's published dictionaries."""
+    from . import dictionaries, storage
+
+    config = dictionaries.load_config(storage.get_storage())
+    if not config["dictionaries"]:
+        click.echo("No dictionaries published")
+        return
+    for dict_id, entry in sorted(config["dictionaries"].items(), key=lambda item: item[1].get("created_at", "")):
+        marker = "*" if str(config["current"]) == dict_id else " "
+        click.echo(
+            f"{marker} {dict_id}  {entry.get('size', 0)} bytes, {entry.get('samples', 0)} packages, "
+            f"created {entry.get('created_at', 'unknown')}"
+        )
+
+
+@main.group()
+def mirror():
+    """Replicate the registry for serving inside your network."""
+    pass
+
+
+@mirror.command("sync")
+@click.argument("directory", type=click.Path(file_okay=False))
+@click.option("-j", "--workers", type=int, default=8, show_default=True, help="Concurrent asset downloads")
+@click.option("--prune", is_flag=True, help="Remove mirrored releases that no longer exist upstream")
+def mirror_sync(directory: str, workers: int, prune: bool):
+    """Incrementally copy the registry index, ownership and release assets to DIRECTORY."""
+    from . import http
+    from . import mirror as mirror_mod
+
+    http.set_default_priority(http.BACKGROUND)
+
+    dest = Path(directory).resolve()
+    click.echo(f"Syncing registry mirror into {dest}...")
+    try:
+        result = mirror_mod.sync(dest, workers=workers, prune=prune, progress=click.echo)
+    except Exception as e:
+        click.echo(f"Error: Mirror sync failed: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"Files: {result.files_updated} updated, {result.files_unchanged} unchanged. "
+        f"Assets: {result.assets_downloaded} downloaded, {result.assets_skipped} up to date"
+        + (f", {result.releases_pruned} releases pruned" if prune else "")
+        + f". {result.bytes_downloaded} bytes transferred."
+    )
+    if result.errors:
+        for error in result.errors:
+            click.echo(f"Error: {error}", err=True)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
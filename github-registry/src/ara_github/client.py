@@ -9,7 +9,8 @@ from typing import Optional
 
 import httpx
 
-from . import http
+from . import http, index, storage
+from .records import Index
 
 # Constants
 PUBLISH_WORKFLOW = "publish.yml"
@@ -24,13 +25,7 @@ def _release_tag(namespace: str, name: str, version: str) -> str:
 
 def _get_release_by_tag(tag: str) -> dict:
     """Get release by tag name."""
-    url = f"{http.api_base()}/releases/tags/{tag}"
-    with http.get_client() as client:
-        response = client.get(url)
-        if response.status_code == 404:
-            raise FileNotFoundError(f"Release not found: {tag}")
-        response.raise_for_status()
-        return response.json()
+    return storage.get_storage().get_release(tag)
 
 
 def _trigger_workflow(workflow_file: str, inputs: dict) -> dict:
@@ -59,7 +54,7 @@ def _trigger_workflow(workflow_file: str, inputs: dict) -> dict:
     
     # Find the run by dispatch_id (poll for up to 30 seconds)
     for _ in range(15):
-        with http.get_client() as client:
+        with http.get_client(priority=http.BACKGROUND) as client:
             response = client.get(runs_url, params={"event": "workflow_dispatch"})
             response.raise_for_status()
             runs = response.json().get("workflow_runs", [])
@@ -86,7 +81,7 @@ def _trigger_workflow(workflow_file: str, inputs: dict) -> dict:
     
     if not run_id:
         # Fallback: use the most recent workflow_dispatch run
-        with http.get_client() as client:
+        with http.get_client(priority=http.BACKGROUND) as client:
             response = client.get(runs_url, params={"event": "workflow_dispatch", "per_page": 1})
             response.raise_for_status()
             runs = response.json().get("workflow_runs", [])
@@ -100,7 +95,7 @@ def _trigger_workflow(workflow_file: str, inputs: dict) -> dict:
     run_url = f"{http.api_base()}/actions/runs/{run_id}"
     
     for _ in range(60):  # Poll for up to 2 minutes
-        with http.get_client() as client:
+        with http.get_client(priority=http.BACKGROUND) as client:
             response = client.get(run_url)
             response.raise_for_status()
             run = response.json()
@@ -140,12 +135,20 @@ def publish(
     manifest: dict,
     archive_path: Path,
     username: str,
+    delta: bool = False,
 ) -> dict:
     """
     Publish a package by creating a GitHub issue.
     
-    The issue will be processed by a GitHub Actions workflow.
+    The issue will be processed by a GitHub Actions workflow. Backends that
+    allow direct writes (a local registry directory) are updated in place.
+    With delta, the release also gets a delta against the previous version
+    (see deltas.py), built where the release is created.
     """
+    store = storage.get_storage()
+    if store.direct_writes:
+        return _publish_direct(store, namespace, name, version, manifest, archive_path, username, delta)
+
     # Read and encode the archive
     archive_data = archive_path.read_bytes()
     encoded = base64.b85encode(archive_data).decode("ascii")
@@ -157,6 +160,7 @@ def publish(
 **Package**: `{namespace}/{name}`
 **Version**: `{version}`
 **Publisher**: @{username}
+**Delta**: {"yes" if delta else "no"}
 
 ### Manifest
 ```json
@@ -206,7 +210,7 @@ def publish(
     for attempt in range(60):  # Poll for up to 2 minutes
         time.sleep(2)
         
-        with http.get_client() as client:
+        with http.get_client(priority=http.BACKGROUND) as client:
             # Check issue state
             issue_url_api = f"{http.api_base()}/issues/{issue_number}"
             response = client.get(issue_url_api)
@@ -230,7 +234,7 @@ def publish(
                     raise RuntimeError(f"Publication failed. See issue #{issue_number} for details: {issue_url}")
     
     # Timeout - check one final time
-    with http.get_client() as client:
+    with http.get_client(priority=http.BACKGROUND) as client:
         issue_url_api = f"{http.api_base()}/issues/{issue_number}"
         response = client.get(issue_url_api)
         response.raise_for_status()
@@ -260,12 +264,7 @@ def download_manifest(namespace: str, name: str, version: str) -> dict:
     if not ara_json_asset:
         raise FileNotFoundError(f"ara.json not found in release {tag}")
     
-    # Download the asset
-    asset_url = ara_json_asset["url"]
-    with http.get_client() as client:
-        response = client.get(asset_url, headers={"Accept": "application/octet-stream"})
-        response.raise_for_status()
-        return json.loads(response.content)
+    return json.loads(storage.get_storage().read_asset(ara_json_asset))
 
 
 def download_url(namespace: str, name: str, version: str) -> str:
@@ -281,35 +280,84 @@ def download_url(namespace: str, name: str, version: str) -> str:
     raise FileNotFoundError(f"package.tar.zst not found in release {tag}")
 
 
-def download_archive(namespace: str, name: str, version: str, dest: Path) -> str:
-    """Download package archive to destination path."""
-    tag = _release_tag(namespace, name, version)
-    release = _get_release_by_tag(tag)
-    
-    # Find package.tar.zst asset
-    asset = None
-    for a in release.get("assets", []):
-        if a["name"] == "package.tar.zst":
-            asset = a
-            break
-    
-    if not asset:
-        raise FileNotFoundError(f"package.tar.zst not found in release {tag}")
-    
-    # Download the asset
-    asset_url = asset["url"]
-    with http.get_client(timeout=120.0) as client:
-        with client.stream("GET", asset_url, headers={"Accept": "application/octet-stream"}) as response:
-            response.raise_for_status()
-            with open(dest, "wb") as f:
-                for chunk in response.iter_bytes(chunk_size=8192):
-                    f.write(chunk)
-    
-    return str(dest)
+def find_releases(packages: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], dict]:
+    """
+    Find the releases of several (namespace, name, version)s at once.
+
+    The GitHub backend looks the releases up in batched GraphQL queries
+    instead of one request per version. Raises FileNotFoundError naming every
+    version whose release or archive is missing.
+    """
+    tags = {_release_tag(*package): package for package in packages}
+    releases = storage.get_storage().get_releases(list(tags))
+
+    found = {}
+    missing = []
+    for tag, package in tags.items():
+        release = releases.get(tag)
+        if release is None:
+            missing.append(f"Release not found: {tag}")
+            continue
+        asset = next((a for a in release.get("assets", []) if a["name"] == "package.tar.zst"), None)
+        if asset is None:
+            missing.append(f"package.tar.zst not found in release {tag}")
+            continue
+        found[package] = release
+
+    if missing:
+        raise FileNotFoundError("; ".join(missing))
+    return found
+
+
+def _asset(release: dict, name: str) -> Optional[dict]:
+    return next((a for a in release.get("assets", []) if a["name"] == name), None)
+
+
+def fetch_archive(namespace: str, name: str, version: str, release: dict, dest: Path) -> str:
+    """
+    Write a package version's archive to dest, downloading as little as possible.
+
+    Uses, in order: the local archive store (if it was stored from this same
+    release), the release's delta applied to a stored earlier version, the
+    full archive. Returns which one ("stored", "delta" or "full"); the result
+    is kept in the store either way.
+    """
+    from . import archives
+
+    store = storage.get_storage()
+    stored = archives.load(store, namespace, name, version, release)
+    if stored is not None:
+        dest.write_bytes(stored)
+        return "stored"
+
+    delta_asset = _asset(release, storage.DELTA_ASSET)
+    if delta_asset is not None and archives.versions(store, namespace, name):
+        from . import deltas
+
+        try:
+            delta = store.read_asset(delta_asset)
+            header, _ = deltas.read_header(delta)
+            base = archives.load(store, namespace, name, header["base"])
+            if base is not None:
+                archive = deltas.apply_to_archive(delta, base, store)
+                dest.write_bytes(archive)
+                archives.save(store, namespace, name, version, archive, release)
+                return "delta"
+        except (ValueError, FileNotFoundError, httpx.HTTPError):
+            pass  # the full archive is always there to fall back to
+
+    store.download_asset(_asset(release, "package.tar.zst"), dest)
+    archives.save(store, namespace, name, version, dest.read_bytes(), release)
+    return "full"
 
 
 def unpublish(namespace: str, name: str, version: str, username: str) -> None:
     """Unpublish a package version by creating a GitHub issue."""
+    store = storage.get_storage()
+    if store.direct_writes:
+        _unpublish_direct(store, namespace, name, version)
+        return
+
     issue_title = f"[UNPUBLISH] {namespace}/{name}@{version}"
     issue_body = f"""## Package Unpublish Request
 
@@ -339,6 +387,11 @@ def unpublish(namespace: str, name: str, version: str, username: str) -> None:
 
 def delete_all(namespace: str, name: str, username: str) -> None:
     """Delete all versions of a package by creating a GitHub issue."""
+    store = storage.get_storage()
+    if store.direct_writes:
+        _delete_direct(store, namespace, name)
+        return
+
     issue_title = f"[DELETE] {namespace}/{name}"
     issue_body = f"""## Package Delete Request
 
@@ -363,3 +416,74 @@ def delete_all(namespace: str, name: str, username: str) -> None:
         issue = response.json()
     
     print(f"Created delete request: {issue['html_url']}")
+
+
+def _publish_direct(
+    store: storage.RegistryStorage,
+    namespace: str,
+    name: str,
+    version: str,
+    manifest: dict,
+    archive_path: Path,
+    username: str,
+    delta: bool = False,
+) -> dict:
+    """Publish straight into a writable backend, mirroring the publish workflow."""
+    tag = _release_tag(namespace, name, version)
+    idx = Index.from_list(store.read_index())
+    archive = archive_path.read_bytes()
+    assets = {
+        "package.tar.zst": archive,
+        "ara.json": json.dumps(manifest, indent=2).encode("utf-8"),
+    }
+    result = {"status": "success"}
+    if delta:
+        from . import deltas
+
+        pkg = idx.get(namespace, name)
+        try:
+            built = deltas.build(store, namespace, name, version, pkg.versions if pkg else [], archive)
+        except (FileNotFoundError, ValueError) as e:
+            # The delta only saves bandwidth; publish the full archive regardless
+            result["delta_error"] = str(e)
+            built = None
+        if built is not None:
+            result["delta_base"], assets[storage.DELTA_ASSET] = built
+    store.create_release(
+        tag,
+        title=f"{namespace}/{name} v{version}",
+        body=manifest.get("description", ""),
+        assets=assets,
+    )
+
+    index.record_version(idx, namespace, name, version, manifest)
+    store.write_index(idx.to_list(), f"Add {namespace}/{name}@{version}")
+
+    ownership = store.read_ownership()
+    index.claim_ownership(ownership, namespace, name, username)
+    store.write_ownership(ownership, f"Set ownership for {namespace}/{name}")
+
+    return result
+
+
+def _unpublish_direct(store: storage.RegistryStorage, namespace: str, name: str, version: str) -> None:
+    """Unpublish straight from a writable backend."""
+    store.delete_release(_release_tag(namespace, name, version))
+
+    idx = Index.from_list(store.read_index())
+    index.remove_version(idx, namespace, name, version)
+    store.write_index(idx.to_list(), f"Remove {namespace}/{name}@{version}")
+
+
+def _delete_direct(store: storage.RegistryStorage, namespace: str, name: str) -> None:
+    """Delete a package and all its releases straight from a writable backend."""
+    for tag in store.list_release_tags(f"ara/{namespace}/{name}/"):
+        store.delete_release(tag)
+
+    idx = Index.from_list(store.read_index())
+    idx.remove(namespace, name)
+    store.write_index(idx.to_list(), f"Delete {namespace}/{name}")
+
+    ownership = store.read_ownership()
+    ownership.get("packages", {}).pop(f"{namespace}/{name}", None)
+    store.write_ownership(ownership, f"Remove ownership for {namespace}/{name}")
@@ -0,0 +1,149 @@
+"""Binary deltas between consecutive versions of a package.
+
+A release may carry ``package.patch.zst`` next to ``package.tar.zst``: the
+new version's tar compressed in zstd's patch-from mode, with the previous
+version's tar as a raw-content dictionary. When one prompt file changed, the
+delta is a few hundred bytes however large the package is, so ``ara
+install`` can fetch it instead of the full archive whenever the previous
+version is in the local archive store (see archives.py).
+
+The asset is a zstd skippable frame holding a JSON header, followed by the
+delta frame::
+
+    {"base": "1.2.0", "base_sha256": "<tar sha256>", "sha256": "<tar sha256>"}
+
+Both digests are of uncompressed tars, so a delta applies to the previous
+version however its archive was compressed, and the result is checked
+against the tar the publisher built.
+"""
+
+import hashlib
+import json
+import math
+import struct
+from typing import Optional
+
+import zstandard as zstd
+
+from . import dictionaries, semver, storage
+
+# First magic number of the skippable frame range (0x184D2A50-0x184D2A5F)
+_SKIPPABLE_MAGIC = 0x184D2A50
+
+# zstd decoders refuse windows above 128 MiB unless told otherwise; the
+# window must span base and target, so larger packages get no delta
+_MAX_WINDOW_LOG = 27
+
+
+def _window_log(base: bytes, target: bytes) -> int:
+    return max(10, math.ceil(math.log2(len(base) + len(target) + 1)))
+
+
+def _raw_dictionary(base: bytes) -> zstd.ZstdCompressionDict:
+    return zstd.ZstdCompressionDict(base, dict_type=zstd.DICT_TYPE_RAWCONTENT)
+
+
+def create(base_tar: bytes, target_tar: bytes, base_version: str) -> Optional[bytes]:
+    """Encode target_tar against base_tar, or None if the pair is too large for a delta."""
+    window_log = _window_log(base_tar, target_tar)
+    if window_log > _MAX_WINDOW_LOG:
+        return None
+    params = zstd.ZstdCompressionParameters.from_level(
+        dictionaries.LEVEL, window_log=window_log, enable_ldm=True, write_checksum=True
+    )
+    frame = zstd.ZstdCompressor(compression_params=params, dict_data=_raw_dictionary(base_tar)).compress(target_tar)
+    header = json.dumps({
+        "base": base_version,
+        "base_sha256": hashlib.sha256(base_tar).hexdigest(),
+        "sha256": hashlib.sha256(target_tar).hexdigest(),
+    }).encode("utf-8")
+    return struct.pack("<II", _SKIPPABLE_MAGIC, len(header)) + header + frame
+
+
+def read_header(delta: bytes) -> tuple[dict, bytes]:
+    """Split a delta into its header and zstd frame. Raises ValueError if malformed."""
+    if len(delta) < 8:
+        raise ValueError("Delta is truncated")
+    magic, size = struct.unpack_from("<II", delta)
+    if magic != _SKIPPABLE_MAGIC or len(delta) < 8 + size:
+        raise ValueError("Delta has no header")
+    try:
+        header = json.loads(delta[8:8 + size])
+    except ValueError as e:
+        raise ValueError(f"Delta header is not valid JSON: {e}") from e
+    if not isinstance(header, dict) or not {"base", "base_sha256", "sha256"} <= header.keys():
+        raise ValueError("Delta header is incomplete")
+    return header, delta[8 + size:]
+
+
+def apply(delta: bytes, base_tar: bytes) -> bytes:
+    """
+    Rebuild the target tar from a delta and the base version's tar.
+
+    Raises ValueError if base_tar is not the tar the delta was made against,
+    or if the result does not match the publisher's digest.
+    """
+    header, frame = read_header(delta)
+    if hashlib.sha256(base_tar).hexdigest() != header["base_sha256"]:
+        raise ValueError(f"Local copy of {header['base']} does not match the delta's base")
+    dctx = zstd.ZstdDecompressor(dict_data=_raw_dictionary(base_tar), max_window_size=1 << _MAX_WINDOW_LOG)
+    try:
+        target = dctx.decompress(frame)
+    except zstd.ZstdError as e:
+        raise ValueError(f"Cannot apply delta: {e}") from e
+    if hashlib.sha256(target).hexdigest() != header["sha256"]:
+        raise ValueError("Patched package does not match the published digest")
+    return target
+
+
+def apply_to_archive(delta: bytes, base_archive: bytes, store: Optional[storage.RegistryStorage] = None) -> bytes:
+    """Apply a delta to the base version's archive, returning the new version as an archive."""
+    try:
+        base_tar = dictionaries.decompressor(base_archive, store).decompress(base_archive)
+    except zstd.ZstdError as e:
+        raise ValueError(f"Cannot read local copy of {read_header(delta)[0]['base']}: {e}") from e
+    # Only the local store keeps this copy, so favour speed over size
+    return zstd.ZstdCompressor(level=3, write_checksum=True).compress(apply(delta, base_tar))
+
+
+def previous_version(version: str, versions: list[str]) -> Optional[str]:
+    """The highest published version below version, which its delta is made against."""
+    lower = [v for v in versions if semver.is_valid(v) and semver.compare(v, version) < 0]
+    return max(lower, key=semver.key) if lower else None
+
+
+def build(
+    store: storage.RegistryStorage,
+    namespace: str,
+    name: str,
+    version: str,
+    versions: list[str],
+    archive: bytes,
+) -> Optional[tuple[str, bytes]]:
+    """
+    Build the delta asset for a new version's archive.
+
+    Fetches the previous version's archive from the registry. Returns (base
+    version, delta), or None if there is no previous version or the delta
+    would not be smaller than the archive itself. Raises FileNotFoundError
+    or ValueError if the previous archive cannot be read.
+    """
+    base = previous_version(version, versions)
+    if base is None:
+        return None
+    tag = f"ara/{namespace}/{name}/v{base}"
+    release = store.get_release(tag)
+    asset = next((a for a in release.get("assets", []) if a["name"] == "package.tar.zst"), None)
+    if asset is None:
+        raise FileNotFoundError(f"package.tar.zst not found in release {tag}")
+    base_archive = store.read_asset(asset)
+
+    try:
+        base_tar = dictionaries.decompressor(base_archive, store).decompress(base_archive)
+        target_tar = dictionaries.decompressor(archive, store).decompress(archive)
+    except zstd.ZstdError as e:
+        raise ValueError(f"Cannot decompress archives for a delta: {e}") from e
+    delta = create(base_tar, target_tar, base)
+    if delta is None or len(delta) >= len(archive):
+        return None
+    return base, delta
@@ -0,0 +1,189 @@
+"""Shared zstd dictionaries for package archives.
+
+Most packages are a handful of small markdown and JSON files, too little
+data for zstd to learn from within one archive. A dictionary trained on a
+corpus of packages primes the compressor with the content they share, which
+shrinks small archives considerably.
+
+Dictionaries are published as releases tagged ``ara-dict/<id>`` carrying one
+``dictionary.zdict`` asset, and listed in ``registry/dictionaries.json``::
+
+    {
+      "current": 1234567,
+      "dictionaries": {
+        "1234567": {"sha256": "...", "size": 65536, "samples": 812, "created_at": "..."}
+      }
+    }
+
+``current`` is the dictionary ``ara publish`` compresses new archives with.
+Every zstd frame records the ID of the dictionary it was compressed with,
+so an archive names the dictionary it needs and extracting never depends on
+``current``. Fetched dictionaries are cached locally per registry.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import zstandard as zstd
+
+from . import storage
+
+DICTIONARIES_PATH = "registry/dictionaries.json"
+
+# Compression level of every package archive
+LEVEL = 19
+
+# Dictionary size in bytes; small packages gain little from larger ones
+DEFAULT_SIZE = 64 * 1024
+
+# IDs below 32768 and from 2**31 are reserved by the zstd format
+_MIN_ID = 32768
+_MAX_ID = 2**31 - 1
+
+
+def release_tag(dict_id: int) -> str:
+    return f"{storage.DICTIONARY_TAG_PREFIX}{dict_id}"
+
+
+def cache_dir() -> Path:
+    """Directory where dictionaries fetched from remote registries are cached."""
+    override = os.getenv("ARA_DICT_CACHE")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ara" / "dictionaries"
+
+
+def load_config(store: storage.RegistryStorage) -> dict:
+    """Read registry/dictionaries.json, or an empty listing if the registry has none."""
+    config = store.read_json(DICTIONARIES_PATH, {})
+    return {"current": config.get("current"), "dictionaries": config.get("dictionaries") or {}}
+
+
+def frame_dictionary_id(data: bytes) -> int:
+    """The dictionary ID recorded in a zstd frame header, 0 for none."""
+    return zstd.get_frame_parameters(data).dict_id
+
+
+def get(dict_id: int, store: Optional[storage.RegistryStorage] = None) -> zstd.ZstdCompressionDict:
+    """
+    Load a published dictionary by ID.
+
+    Raises FileNotFoundError if the registry has no such dictionary and
+    ValueError if the asset is not the dictionary it claims to be.
+    """
+    store = store or storage.get_storage()
+    key = store.cache_key()
+    cached = None
+    if key is not None:
+        cached = cache_dir() / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}-{dict_id}.zdict"
+        try:
+            return zstd.ZstdCompressionDict(cached.read_bytes())
+        except FileNotFoundError:
+            pass
+
+    release = store.get_release(release_tag(dict_id))
+    asset = next((a for a in release.get("assets", []) if a["name"] == storage.DICTIONARY_ASSET), None)
+    if asset is None:
+        raise FileNotFoundError(f"{storage.DICTIONARY_ASSET} not found in release {release_tag(dict_id)}")
+    data = store.read_asset(asset)
+    dictionary = zstd.ZstdCompressionDict(data)
+    if dictionary.dict_id() != dict_id:
+        raise ValueError(f"Release {release_tag(dict_id)} holds dictionary {dictionary.dict_id()}, not {dict_id}")
+
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f".{cached.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, cached)
+    return dictionary
+
+
+def current(store: Optional[storage.RegistryStorage] = None) -> Optional[zstd.ZstdCompressionDict]:
+    """The dictionary new archives should be compressed with, or None."""
+    store = store or storage.get_storage()
+    dict_id = load_config(store)["current"]
+    return get(int(dict_id), store) if dict_id else None
+
+
+def compress(data: bytes, dictionary: Optional[zstd.ZstdCompressionDict] = None) -> tuple[bytes, Optional[int]]:
+    """
+    Compress an archive's tar bytes, with the dictionary when that is smaller.
+
+    Returns (compressed, dictionary ID or None). Frames carry a checksum, so
+    extracting with the wrong dictionary fails instead of producing garbage.
+    Parameters are fixed (single-threaded, content size and checksum
+    written), so the same tar and dictionary always give the same bytes.
+    """
+    options = {"level": LEVEL, "write_checksum": True, "write_content_size": True, "threads": 0}
+    plain = zstd.ZstdCompressor(**options).compress(data)
+    if dictionary is None:
+        return plain, None
+    primed = zstd.ZstdCompressor(dict_data=dictionary, **options).compress(data)
+    if len(primed) < len(plain):
+        return primed, dictionary.dict_id()
+    return plain, None
+
+
+def decompressor(data: bytes, store: Optional[storage.RegistryStorage] = None) -> zstd.ZstdDecompressor:
+    """A decompressor for a compressed archive, loading the dictionary its frame names."""
+    dict_id = frame_dictionary_id(data)
+    if not dict_id:
+        return zstd.ZstdDecompressor()
+    return zstd.ZstdDecompressor(dict_data=get(dict_id, store))
+
+
+def derive_id(samples: list[bytes]) -> int:
+    """A dictionary ID determined by the training corpus, in the unreserved range."""
+    h = hashlib.sha256()
+    for sample in samples:
+        h.update(hashlib.sha256(sample).digest())
+    return _MIN_ID + int.from_bytes(h.digest()[:8], "big") % (_MAX_ID - _MIN_ID)
+
+
+def train(samples: list[bytes], size: int = DEFAULT_SIZE) -> zstd.ZstdCompressionDict:
+    """
+    Train a dictionary on uncompressed package tars.
+
+    Raises ValueError when the corpus is too small for the requested size.
+    """
+    try:
+        return zstd.train_dictionary(size, samples, dict_id=derive_id(samples), level=LEVEL, threads=-1)
+    except zstd.ZstdError as e:
+        raise ValueError(
+            f"Cannot train a {size}-byte dictionary from {len(samples)} sample(s) "
+            f"({sum(map(len, samples))} bytes): {e}. Add packages or lower --size."
+        ) from e
+
+
+def publish(
+    store: storage.RegistryStorage,
+    dictionary: zstd.ZstdCompressionDict,
+    samples: int,
+    make_current: bool = True,
+) -> dict:
+    """Release a dictionary and list it in registry/dictionaries.json. Returns its entry."""
+    dict_id = dictionary.dict_id()
+    data = dictionary.as_bytes()
+    store.create_release(
+        release_tag(dict_id),
+        f"Compression dictionary {dict_id}",
+        f"zstd dictionary trained on {samples} package(s).",
+        {storage.DICTIONARY_ASSET: data},
+    )
+
+    config = load_config(store)
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "samples": samples,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    config["dictionaries"][str(dict_id)] = entry
+    if make_current:
+        config["current"] = dict_id
+    store.write_json(DICTIONARIES_PATH, config, f"Add compression dictionary {dict_id}")
+    return entry
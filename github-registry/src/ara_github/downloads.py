@@ -0,0 +1,101 @@
+"""Download accounting from release asset download counts.
+
+GitHub already counts every download of a release asset, so nothing needs to
+be written per install: a scheduled job lists releases in bulk, totals the
+``package.tar.zst`` and ``package.patch.zst`` counts per package and version
+(an install fetches one or the other), and merges them into the index with a
+single write.
+"""
+
+from typing import Optional
+
+from . import storage
+from .records import is_valid_entry
+
+ARCHIVE_ASSETS = ("package.tar.zst", storage.DELTA_ASSET)
+
+
+def _parse_tag(tag: str) -> Optional[tuple[str, str, str]]:
+    """Split an ``ara/{namespace}/{name}/v{version}`` tag, or None for other tags."""
+    parts = tag.split("/")
+    if len(parts) != 4 or parts[0] != "ara" or not parts[3].startswith("v"):
+        return None
+    return parts[1], parts[2], parts[3][1:]
+
+
+def harvest(store: storage.RegistryStorage) -> dict[tuple[str, str], dict[str, int]]:
+    """
+    Collect archive download counts for every release.
+
+    Returns {(namespace, name): {version: count}}. Releases whose backend does
+    not report counts (e.g. a local directory) are left out.
+    """
+    counts: dict[tuple[str, str], dict[str, int]] = {}
+    for release in store.list_releases("ara/"):
+        parsed = _parse_tag(release.get("tag_name", ""))
+        if not parsed:
+            continue
+        namespace, name, version = parsed
+        for asset in release.get("assets", []):
+            if asset.get("name") in ARCHIVE_ASSETS and "download_count" in asset:
+                per_version = counts.setdefault((namespace, name), {})
+                per_version[version] = per_version.get(version, 0) + asset["download_count"]
+    return counts
+
+
+def merge(index: list[dict], counts: dict[tuple[str, str], dict[str, int]]) -> int:
+    """
+    Merge harvested counts into index entries in place.
+
+    Sets ``downloads_by_version`` (for published versions only) and
+    ``total_downloads``. Malformed entries are left as they are, like
+    ``Index`` does. Returns the number of packages that changed.
+    """
+    changed = 0
+    for pkg in index:
+        if not is_valid_entry(pkg):
+            continue
+        per_version = counts.get((pkg["namespace"], pkg["name"]))
+        if per_version is None:
+            continue
+
+        versions = pkg.get("versions")
+        if not isinstance(versions, list):
+            versions = []
+        by_version = {v: per_version[v] for v in versions if isinstance(v, str) and v in per_version}
+        total = sum(by_version.values())
+        if pkg.get("downloads_by_version") == by_version and pkg.get("total_downloads") == total:
+            continue
+
+        pkg["downloads_by_version"] = by_version
+        pkg["total_downloads"] = total
+        changed += 1
+    return changed
+
+
+# Rereads of the index when a publish wins the race for the write
+MAX_WRITE_ATTEMPTS = 5
+
+
+def sync(store: Optional[storage.RegistryStorage] = None, dry_run: bool = False) -> int:
+    """
+    Harvest download counts and write them to the index in one update. Returns packages changed.
+
+    The write is conditional on the index read, so a publish that lands in
+    between is never overwritten: the index is reread and the counts merged
+    again.
+    """
+    store = store or storage.get_storage()
+    counts = harvest(store)
+
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        idx, expected = store.read_index_for_update()
+        changed = merge(idx, counts)
+        if not changed or dry_run:
+            return changed
+        try:
+            store.write_index(idx, f"Update download counts for {changed} package(s)", expected)
+            return changed
+        except storage.WriteConflict:
+            if attempt == MAX_WRITE_ATTEMPTS - 1:
+                raise
@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
+import abc
+import hashlib
+import io
 import json
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import httpx
 
-from . import http
+from . import http, storage
 
 
 EXTERNALS_PATH = "registry/externals.json"
 
+# A full commit SHA is the only git ref we treat as immutable
+_COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+
 
 @dataclass
 class ExternalRegistry:
@@ -23,35 +35,47 @@ class ExternalRegistry:
     type: str
     repo: Optional[str] = None
     branch: str = "main"
+    ref: Optional[str] = None
+    url: Optional[str] = None
+    path: Optional[str] = None
+    sha256: Optional[str] = None
     description: Optional[str] = None
 
+    @property
+    def revision(self) -> str:
+        """The git revision to fetch: a pinned ref if configured, else the branch."""
+        return self.ref or self.branch
+
+
+def get_cache_dir() -> Path:
+    """Get the directory used to cache fetched external abilities."""
+    override = os.getenv("ARA_EXTERNALS_CACHE")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ara" / "externals"
+
 
 def _fetch_externals_config() -> dict[str, Any]:
     """
     Fetch externals.json from the registry repository.
 
     Admins manage this file in the registry repo. The CLI treats it as
-    the allowlist of external registries.
+    the allowlist of external registries. Setting ARA_EXTERNALS_CONFIG to a
+    local file path skips the network entirely.
     """
-    url = f"{http.api_base()}/contents/{EXTERNALS_PATH}"
+    local_config = os.getenv("ARA_EXTERNALS_CONFIG")
+    if local_config:
+        try:
+            with open(local_config) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
 
+    # Fail closed: no external registries if config cannot be read
     try:
-        with http.get_client() as client:
-            response = client.get(url)
-            if response.status_code == 404:
-                return {}
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("content")
-            if not content:
-                return {}
-            # GitHub returns base64 content for file blobs
-            import base64
-
-            decoded = base64.b64decode(content).decode("utf-8")
-            return json.loads(decoded)
+        return storage.get_storage().read_json(EXTERNALS_PATH, {})
     except Exception:
-        # Fail closed: no external registries if config cannot be read
         return {}
 
 
@@ -62,75 +86,280 @@ def get_external_registry(registry_id: str) -> Optional[ExternalRegistry]:
     if not entry:
         return None
 
-    return ExternalRegistry(
+    registry = ExternalRegistry(
         id=registry_id,
         type=entry.get("type", ""),
         repo=entry.get("repo"),
         branch=entry.get("branch", "main"),
+        ref=entry.get("ref"),
+        url=entry.get("url"),
+        path=entry.get("path"),
+        sha256=entry.get("sha256"),
         description=entry.get("description"),
     )
 
+    # Air-gapped installs: redirect every allowlisted registry to a local mirror
+    mirror_root = os.getenv("ARA_EXTERNALS_MIRROR")
+    if mirror_root:
+        registry.type = "local_mirror"
+        registry.path = str(Path(mirror_root) / registry_id)
+
+    return registry
+
+
+def _safe_subpath(root: Path, name: str) -> Path:
+    """Resolve name under root, refusing anything that escapes it."""
+    target = (root / name).resolve()
+    try:
+        target.relative_to(root.resolve())
+    except ValueError:
+        raise RuntimeError(f"External ability path escapes its registry root: {name}")
+    return target
+
+
+def _copy_tree(src: Path, dest_dir: Path) -> None:
+    """Copy a directory's contents into dest_dir, skipping VCS metadata."""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copytree(src, dest_dir, dirs_exist_ok=True, ignore=shutil.ignore_patterns(".git"))
+
+
+class ExternalBackend(abc.ABC):
+    """
+    Base class for external registry backends.
+
+    Subclasses implement ``fetch`` to materialise one ability into an empty
+    directory. ``install`` wraps it with a content cache: when the source is
+    pinned (an immutable commit or a checksummed tarball) the result is kept
+    under the cache directory and later installs copy from there without
+    touching the network.
+    """
+
+    def is_pinned(self, registry: ExternalRegistry) -> bool:
+        """Whether fetched content for this registry can never change."""
+        return False
+
+    def cache_key(self, registry: ExternalRegistry, name: str) -> str:
+        """Identify the fetched content for this registry and ability name."""
+        identity = json.dumps(
+            [type(self).__name__, registry.repo, registry.url, registry.revision, registry.sha256, name]
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    @abc.abstractmethod
+    def fetch(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        """Fetch the named ability into dest_dir."""
+
+    def install(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        """Install the named ability into dest_dir, going through the cache when pinned."""
+        if not self.is_pinned(registry):
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            self.fetch(name, registry, dest_dir)
+            return
+
+        cache_dir = get_cache_dir() / self.cache_key(registry, name)
+        if not cache_dir.is_dir():
+            cache_dir.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(dir=cache_dir.parent, prefix=".fetch-"))
+            try:
+                self.fetch(name, registry, staging)
+                # Atomic publish so concurrent installs never see a partial entry
+                try:
+                    staging.rename(cache_dir)
+                except OSError:
+                    if not cache_dir.is_dir():
+                        raise
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        _copy_tree(cache_dir, dest_dir)
+
+
+_BACKENDS: dict[str, ExternalBackend] = {}
+
+
+def register_backend(*type_names: str) -> Callable[[type], type]:
+    """Class decorator registering a backend under one or more externals.json types."""
+
+    def decorator(cls: type) -> type:
+        instance = cls()
+        for type_name in type_names:
+            _BACKENDS[type_name] = instance
+        return cls
 
-def _github_raw_base(repo: str, branch: str) -> str:
+    return decorator
+
+
+def get_backend(type_name: str) -> Optional[ExternalBackend]:
+    """Look up the backend registered for an externals.json type."""
+    return _BACKENDS.get(type_name)
+
+
+def _github_raw_base(repo: str, ref: str) -> str:
     """Build the raw content base URL for a GitHub repo."""
-    return f"https://raw.githubusercontent.com/{repo}/{branch}"
+    return f"https://raw.githubusercontent.com/{repo}/{ref}"
 
 
-def install_anthropic_skill(
-    name: str,
-    dest_dir: Path,
-    registry: ExternalRegistry,
-) -> None:
+@register_backend("github_directory", "anthropic_skills_github")
+class GitHubDirectoryBackend(ExternalBackend):
     """
-    Install a skill from the Anthropic skills GitHub repository.
+    Fetch a single directory from a public GitHub repository.
 
     This implementation is intentionally minimal: it downloads SKILL.md and,
-    if present, any additional files in the skill directory via GitHub's
-    contents API.
+    if present, any additional files in the directory via GitHub's contents API.
     """
-    if not registry.repo:
-        raise RuntimeError("Anthropic skills registry configuration is missing 'repo'")
 
-    dest_dir.mkdir(parents=True, exist_ok=True)
+    def is_pinned(self, registry: ExternalRegistry) -> bool:
+        return bool(registry.ref and _COMMIT_SHA.match(registry.ref))
+
+    def fetch(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        if not registry.repo:
+            raise RuntimeError(f"External registry '{registry.id}' configuration is missing 'repo'")
+
+        raw_base = _github_raw_base(registry.repo, registry.revision)
+
+        # Always fetch SKILL.md
+        skill_md_url = f"{raw_base}/{name}/SKILL.md"
+        with httpx.Client(follow_redirects=True, timeout=30.0, event_hooks=http.event_hooks()) as client:
+            resp = client.get(skill_md_url)
+            if resp.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to download external ability '{name}' from {skill_md_url} "
+                    f"(status {resp.status_code})"
+                )
+            (dest_dir / "SKILL.md").write_bytes(resp.content)
+
+        # Optionally fetch other files in the directory using GitHub API
+        # This keeps SKILL.md working even if listing fails.
+        api_url = f"https://api.github.com/repos/{registry.repo}/contents/{name}"
+        with httpx.Client(follow_redirects=True, timeout=30.0, event_hooks=http.event_hooks()) as client:
+            resp = client.get(api_url, params={"ref": registry.revision})
+            if resp.status_code != 200:
+                return
+            try:
+                items = resp.json()
+            except Exception:
+                return
+
+            for item in items:
+                item_name = item.get("name")
+                download_url = item.get("download_url")
+                if not item_name or not download_url:
+                    continue
+                if item_name == "SKILL.md":
+                    continue
+
+                file_resp = client.get(download_url)
+                if file_resp.status_code != 200:
+                    continue
+                (dest_dir / item_name).write_bytes(file_resp.content)
+
+
+@register_backend("git")
+class GitRepoBackend(ExternalBackend):
+    """Fetch a directory from any git repository at a given ref using the git CLI."""
+
+    def is_pinned(self, registry: ExternalRegistry) -> bool:
+        return bool(registry.ref and _COMMIT_SHA.match(registry.ref))
+
+    def fetch(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        if not registry.url:
+            raise RuntimeError(f"External registry '{registry.id}' configuration is missing 'url'")
+
+        with tempfile.TemporaryDirectory(prefix="ara-git-") as tmp:
+            checkout = Path(tmp)
+            commands = [
+                ["git", "init", "--quiet"],
+                ["git", "fetch", "--quiet", "--depth", "1", registry.url, registry.revision],
+                ["git", "checkout", "--quiet", "FETCH_HEAD"],
+            ]
+            for command in commands:
+                result = subprocess.run(command, cwd=checkout, capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        f"git failed for external registry '{registry.id}': {result.stderr.strip()}"
+                    )
+
+            source = _safe_subpath(checkout, name)
+            if not source.is_dir():
+                raise RuntimeError(f"External ability '{name}' not found in {registry.url}@{registry.revision}")
+            _copy_tree(source, dest_dir)
+
+
+@register_backend("local_mirror")
+class LocalMirrorBackend(ExternalBackend):
+    """Copy abilities from a directory on the local filesystem (no network)."""
+
+    def fetch(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        if not registry.path:
+            raise RuntimeError(f"External registry '{registry.id}' configuration is missing 'path'")
+
+        root = Path(registry.path).expanduser()
+        source = _safe_subpath(root, name)
+        if not source.is_dir():
+            raise RuntimeError(f"External ability '{name}' not found in mirror {root}")
+        _copy_tree(source, dest_dir)
+
+
+def _extract_tarball(data: bytes, dest_dir: Path) -> None:
+    """Extract a tar, tar.gz/bz2/xz or tar.zst archive with path traversal protection."""
+    if data[:4] == b"\x28\xb5\x2f\xfd":
+        import zstandard as zstd
+
+        data = zstd.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as tar:
+        for member in tar.getmembers():
+            member_path = Path(member.name)
+            if member_path.is_absolute() or ".." in member_path.parts:
+                raise RuntimeError(f"Unsafe path in external archive: {member.name}")
+            if not (member.isfile() or member.isdir()):
+                continue
+            tar.extract(member, dest_dir)
 
-    raw_base = _github_raw_base(registry.repo, registry.branch)
-
-    # Always fetch SKILL.md
-    skill_md_url = f"{raw_base}/{name}/SKILL.md"
-    with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-        resp = client.get(skill_md_url)
-        if resp.status_code != 200:
-            raise RuntimeError(
-                f"Failed to download Anthropic skill '{name}' from {skill_md_url} "
-                f"(status {resp.status_code})"
-            )
-        (dest_dir / "SKILL.md").write_bytes(resp.content)
-
-    # Optionally fetch other files in the skill directory using GitHub API
-    # This keeps SKILL.md working even if listing fails.
-    api_url = f"https://api.github.com/repos/{registry.repo}/contents/{name}"
-    with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-        resp = client.get(api_url)
-        if resp.status_code != 200:
-            return
-        try:
-            items = resp.json()
-        except Exception:
-            return
 
-        for item in items:
-            item_name = item.get("name")
-            download_url = item.get("download_url")
-            if not item_name or not download_url:
-                continue
-            if item_name == "SKILL.md":
-                continue
+@register_backend("http_tarball")
+class HttpTarballBackend(ExternalBackend):
+    """
+    Fetch abilities from a tarball served over HTTP.
 
-            target_path = dest_dir / item_name
-            file_resp = client.get(download_url)
-            if file_resp.status_code != 200:
-                continue
-            target_path.write_bytes(file_resp.content)
+    If ``url`` contains ``{name}`` it is formatted per ability and the archive
+    root is the ability itself; otherwise one archive holds every ability
+    under ``<name>/``. Setting ``sha256`` verifies the download and makes the
+    result cacheable.
+    """
+
+    def is_pinned(self, registry: ExternalRegistry) -> bool:
+        return bool(registry.sha256)
+
+    def fetch(self, name: str, registry: ExternalRegistry, dest_dir: Path) -> None:
+        if not registry.url:
+            raise RuntimeError(f"External registry '{registry.id}' configuration is missing 'url'")
+
+        per_ability = "{name}" in registry.url
+        url = registry.url.replace("{name}", name)
+
+        with httpx.Client(follow_redirects=True, timeout=120.0, event_hooks=http.event_hooks()) as client:
+            resp = client.get(url)
+            if resp.status_code != 200:
+                raise RuntimeError(f"Failed to download {url} (status {resp.status_code})")
+            data = resp.content
+
+        if registry.sha256:
+            digest = hashlib.sha256(data).hexdigest()
+            if digest != registry.sha256.removeprefix("sha256:"):
+                raise RuntimeError(f"Checksum mismatch for {url}: got sha256:{digest}")
+
+        if per_ability:
+            _extract_tarball(data, dest_dir)
+            return
+
+        with tempfile.TemporaryDirectory(prefix="ara-tarball-") as tmp:
+            root = Path(tmp)
+            _extract_tarball(data, root)
+            source = _safe_subpath(root, name)
+            if not source.is_dir():
+                raise RuntimeError(f"External ability '{name}' not found in {url}")
+            _copy_tree(source, dest_dir)
 
 
 def resolve_and_install_external_dependency(dep: dict, package_root: Path) -> None:
@@ -151,16 +380,14 @@ def resolve_and_install_external_dependency(dep: dict, package_root: Path) -> No
         # Not in allowlist; ignore rather than failing the whole install
         return
 
+    backend = get_backend(registry.type)
+    if not backend:
+        raise RuntimeError(f"Unsupported external registry type '{registry.type}' for '{registry_id}'")
+
     # Default path convention if none supplied
     if not path:
         safe_name = name.replace("/", "_")
         path = f"external/{registry_id.replace('/', '_')}/{safe_name}"
 
-    dest_dir = package_root / path
-
-    if registry.type == "anthropic_skills_github":
-        install_anthropic_skill(name=name, dest_dir=dest_dir, registry=registry)
-    else:
-        # Unknown external registry type; ignore for now
-        return
-
+    dest_dir = _safe_subpath(package_root, path)
+    backend.install(name=name, registry=registry, dest_dir=dest_dir)
@@ -0,0 +1,34 @@
+"""JSON encoding for registry files, using orjson when installed (``pip install ara-github[fast]``)."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (compact, or 2-space indented).
+
+    With or without orjson, registry files (which hold no floats) come out
+    the same, with non-ASCII text as raw UTF-8. The registry workflows write
+    with ``json.dumps`` and its default ``ensure_ascii``, which escapes that
+    text as ``\\uXXXX`` instead: the data is the same, but when one side
+    rewrites a file the other wrote, entries with non-ASCII text show up in
+    the diff.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON text or bytes (orjson's errors subclass json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,9 +1,58 @@
-"""Shared HTTP client for GitHub API interactions."""
+"""Shared HTTP client for GitHub API interactions.
 
+Clients created here (and the plain clients ``external`` uses for third-party
+downloads, via ``event_hooks``) report every request to the active
+``Tracer`` when tracing is enabled, as it is by ``ara --trace``.
+
+Every client from ``get_client`` also sends its requests through the
+process-wide ``Scheduler``, which keeps the CLI within GitHub's limits
+instead of failing when many jobs share a token:
+
+- requests to the GitHub API are paced by a token bucket;
+- the ``X-RateLimit-*`` headers of each response are tracked, and once the
+  remaining quota runs low requests are spread over the time left until the
+  reset (background requests leave a reserve for interactive ones);
+- primary (``X-RateLimit-Remaining: 0``) and secondary (``Retry-After`` or a
+  "secondary rate limit" message) limit responses are waited out and retried;
+- 5xx responses and connection errors on idempotent requests are retried with
+  backoff, within a process-wide retry budget so an outage cannot multiply load.
+
+Background work (workflow polling, mirror sync, download accounting) runs at
+``BACKGROUND`` priority and yields to ``INTERACTIVE`` requests.
+"""
+
+import logging
 import os
-from typing import Optional
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
 
-import httpx
+if TYPE_CHECKING:
+    import httpx
+
+# Unconfigured, warnings still reach stderr through logging's last-resort handler
+logger = logging.getLogger(__name__)
+
+# Path patterns collapsed into endpoint templates, first match wins
+_ENDPOINTS = (
+    (r"^/repos/[^/]+/[^/]+/contents/.+$", "/repos/{owner}/{repo}/contents/{path}"),
+    (r"^/repos/[^/]+/[^/]+/releases/tags/.+$", "/repos/{owner}/{repo}/releases/tags/{tag}"),
+    (r"^/repos/[^/]+/[^/]+/releases/assets/-?\d+$", "/repos/{owner}/{repo}/releases/assets/{id}"),
+    (r"^/repos/[^/]+/[^/]+/releases/\d+$", "/repos/{owner}/{repo}/releases/{id}"),
+    (r"^/repos/[^/]+/[^/]+/git/refs/tags/.+$", "/repos/{owner}/{repo}/git/refs/tags/{tag}"),
+    (r"^/repos/[^/]+/[^/]+/issues/\d+/comments$", "/repos/{owner}/{repo}/issues/{number}/comments"),
+    (r"^/repos/[^/]+/[^/]+/issues/\d+$", "/repos/{owner}/{repo}/issues/{number}"),
+    (r"^/repos/[^/]+/[^/]+/actions/workflows/[^/]+/dispatches$", "/repos/{owner}/{repo}/actions/workflows/{workflow}/dispatches"),
+    (r"^/repos/[^/]+/[^/]+/actions/runs/\d+/jobs$", "/repos/{owner}/{repo}/actions/runs/{id}/jobs"),
+    (r"^/repos/[^/]+/[^/]+/actions/runs/\d+$", "/repos/{owner}/{repo}/actions/runs/{id}"),
+    (r"^/repos/[^/]+/[^/]+(/.*)?$", r"/repos/{owner}/{repo}\1"),
+    (r"^/uploads/repos/[^/]+/[^/]+/releases/\d+/assets$", "/uploads/repos/{owner}/{repo}/releases/{id}/assets"),
+    # Mirror layout and release downloads: releases/ara/<ns>/<name>/v<version>/<asset>
+    (r"^(.*)/(releases|releases/download)/ara/[^/]+/[^/]+/v[^/]+/([^/]+)$", r"\1/\2/{tag}/\3"),
+)
 
 
 def get_github_token() -> Optional[str]:
@@ -31,6 +80,15 @@ def api_base() -> str:
     return f"{get_github_api_url()}/repos/{get_github_repo()}"
 
 
+def graphql_url() -> str:
+    """Get the GraphQL endpoint that goes with the configured REST API URL."""
+    api = get_github_api_url().rstrip("/")
+    # GitHub Enterprise Server serves REST under /api/v3 and GraphQL at /api/graphql
+    if api.endswith("/api/v3"):
+        return f"{api[:-len('/v3')]}/graphql"
+    return f"{api}/graphql"
+
+
 def headers() -> dict[str, str]:
     """Build headers for GitHub API requests."""
     h = {"Accept": "application/vnd.github+json"}
@@ -40,10 +98,560 @@ def headers() -> dict[str, str]:
     return h
 
 
-def get_client(timeout: float = 30.0) -> httpx.Client:
-    """Create an HTTP client configured for GitHub API."""
+@lru_cache(maxsize=None)
+def _endpoint_patterns() -> list[tuple[re.Pattern, str]]:
+    # Compiled on first use; only traced runs need them
+    return [(re.compile(pattern), template) for pattern, template in _ENDPOINTS]
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse a request path into its endpoint, e.g. ``/repos/{owner}/{repo}/issues/{number}``."""
+    for pattern, template in _endpoint_patterns():
+        match = pattern.match(path)
+        if match:
+            return match.expand(template)
+    return path
+
+
+class RequestRecord(NamedTuple):
+    method: str
+    host: str
+    endpoint: str
+    path: str
+    status: int
+    bytes_sent: int
+    bytes_received: int
+    duration: float
+    rate_limit: Optional[int] = None
+    rate_remaining: Optional[int] = None
+    rate_reset: Optional[int] = None
+    rate_resource: Optional[str] = None
+    retries: int = 0
+    waited: float = 0.0
+
+
+def _int_header(response: "httpx.Response", name: str) -> Optional[int]:
+    value = response.headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _counting_stream():
+    """The stream wrapper class, built on first use so httpx stays unimported until needed."""
+    import httpx
+
+    class CountingStream(httpx.SyncByteStream):
+        """Wraps a response body stream to count bytes and report when it is closed."""
+
+        def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[int], None]):
+            self._stream = stream
+            self._on_close = on_close
+            self._received = 0
+            self._closed = False
+
+        def __iter__(self):
+            for chunk in self._stream:
+                self._received += len(chunk)
+                yield chunk
+
+        def close(self) -> None:
+            try:
+                self._stream.close()
+            finally:
+                if not self._closed:
+                    self._closed = True
+                    self._on_close(self._received)
+
+    return CountingStream
+
+
+class Tracer:
+    """
+    Collects one ``RequestRecord`` per HTTP request, including each redirect hop.
+
+    The duration runs from sending the request to the end of the response
+    body, so streamed downloads are timed in full. Safe to share between
+    threads.
+    """
+
+    def __init__(self):
+        self.records: list[RequestRecord] = []
+        self._lock = threading.Lock()
+
+    def _on_request(self, request: "httpx.Request") -> None:
+        request.extensions["ara_trace_start"] = time.perf_counter()
+
+    def _on_response(self, response: "httpx.Response") -> None:
+        request = response.request
+        start = request.extensions.get("ara_trace_start", time.perf_counter())
+        url = urlsplit(str(request.url))
+        try:
+            sent = len(request.content)
+        except Exception:  # streamed request bodies are not buffered
+            sent = 0
+
+        def finish(received: int) -> None:
+            record = RequestRecord(
+                method=request.method,
+                host=url.netloc,
+                endpoint=endpoint_template(url.path),
+                path=url.path,
+                status=response.status_code,
+                bytes_sent=sent,
+                bytes_received=received,
+                duration=time.perf_counter() - start,
+                rate_limit=_int_header(response, "X-RateLimit-Limit"),
+                rate_remaining=_int_header(response, "X-RateLimit-Remaining"),
+                rate_reset=_int_header(response, "X-RateLimit-Reset"),
+                rate_resource=response.headers.get("X-RateLimit-Resource"),
+                retries=response.extensions.get("ara_retries", 0),
+                waited=response.extensions.get("ara_waited", 0.0),
+            )
+            with self._lock:
+                self.records.append(record)
+
+        if response.is_closed:
+            # Already read by the scheduler (as it does for a 403 that might be a
+            # secondary rate limit), so the stream is never closed again
+            finish(response.num_bytes_downloaded)
+            return
+        response.stream = _counting_stream()(response.stream, finish)
+
+    def event_hooks(self) -> dict[str, list[Callable]]:
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    def summary(self) -> dict[str, Any]:
+        """Totals per endpoint plus the last rate-limit state seen for each resource."""
+        with self._lock:
+            records = list(self.records)
+        endpoints: dict[str, dict[str, Any]] = {}
+        rate_limits: dict[str, dict[str, Optional[int]]] = {}
+        for r in records:
+            key = f"{r.method} {r.endpoint}" if r.host == urlsplit(get_github_api_url()).netloc else f"{r.method} {r.host}{r.endpoint}"
+            entry = endpoints.setdefault(
+                key, {"count": 0, "duration": 0.0, "bytes_sent": 0, "bytes_received": 0, "retries": 0, "waited": 0.0, "statuses": {}}
+            )
+            entry["count"] += 1
+            entry["retries"] += r.retries
+            entry["waited"] += r.waited
+            entry["duration"] += r.duration
+            entry["bytes_sent"] += r.bytes_sent
+            entry["bytes_received"] += r.bytes_received
+            entry["statuses"][str(r.status)] = entry["statuses"].get(str(r.status), 0) + 1
+            if r.rate_remaining is not None:
+                rate_limits[r.rate_resource or "core"] = {
+                    "limit": r.rate_limit,
+                    "remaining": r.rate_remaining,
+                    "reset": r.rate_reset,
+                }
+        return {
+            "requests": len(records),
+            "duration": sum(r.duration for r in records),
+            "bytes_sent": sum(r.bytes_sent for r in records),
+            "bytes_received": sum(r.bytes_received for r in records),
+            "retries": sum(r.retries for r in records),
+            "waited": sum(r.waited for r in records),
+            "endpoints": endpoints,
+            "rate_limits": rate_limits,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            records = [r._asdict() for r in self.records]
+        return {"requests": records, "summary": self.summary()}
+
+    def format_summary(self) -> str:
+        """Human-readable summary, one line per endpoint, slowest first."""
+        summary = self.summary()
+        lines = [
+            f"HTTP trace: {summary['requests']} request(s), {summary['duration'] * 1000:.0f} ms, "
+            f"{_kb(summary['bytes_sent'])} sent, {_kb(summary['bytes_received'])} received"
+            + (f", {summary['retries']} retried" if summary["retries"] else "")
+            + (f", {summary['waited']:.1f} s waiting for rate limits" if summary["waited"] else "")
+        ]
+        endpoints = sorted(summary["endpoints"].items(), key=lambda item: item[1]["duration"], reverse=True)
+        for key, e in endpoints:
+            statuses = ",".join(f"{status}x{count}" if count > 1 else status for status, count in sorted(e["statuses"].items()))
+            lines.append(
+                f"  {e['count']:>4}  {e['duration'] * 1000:>8.0f} ms  {_kb(e['bytes_received']):>10}  [{statuses}]  {key}"
+            )
+        for resource, limit in sorted(summary["rate_limits"].items()):
+            reset = ""
+            if limit["reset"]:
+                reset = ", resets in " + _duration(limit["reset"] - time.time())
+            lines.append(f"  Rate limit ({resource}): {limit['remaining']}/{limit['limit']} remaining{reset}")
+        return "\n".join(lines)
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+
+def _duration(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable_tracing() -> Tracer:
+    """Start recording requests made by clients created from now on."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def event_hooks() -> dict[str, list[Callable]]:
+    """Hooks to pass to any httpx.Client so its requests are traced when tracing is on."""
+    return _tracer.event_hooks() if _tracer is not None else {}
+
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_PRIORITIES = {"interactive": INTERACTIVE, "background": BACKGROUND}
+
+# Token bucket for requests to the GitHub API host
+DEFAULT_RATE = 10.0  # requests per second
+DEFAULT_BURST = 20
+
+# Share of the hourly quota background requests leave for interactive ones
+BACKGROUND_RESERVE = 0.2
+# Below this share of the quota, requests are spread until the reset
+PACING_THRESHOLD = 0.25
+
+# Longest a single request waits out rate limits before giving up
+MAX_WAIT = {INTERACTIVE: 120.0, BACKGROUND: 3600.0}
+# Waits at least this long are logged as a warning
+NOTICE_WAIT = 5.0
+# Wait after a secondary limit without Retry-After, doubled on each repeat
+SECONDARY_WAIT = 60.0
+
+# Retries of 5xx responses and connection errors
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# Process-wide: at most RETRY_BUDGET_MIN plus this share of all requests are retries
+RETRY_BUDGET_MIN = 10
+RETRY_BUDGET_RATIO = 0.2
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got: {value!r}")
+
+
+class _TokenBucket:
+    """Token bucket where waiting interactive callers are served before background ones."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int) -> float:
+        """Take one token, blocking until one is free. Returns the time waited."""
+        if self.rate <= 0:
+            return 0.0
+        start = self._clock()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1 and (priority == INTERACTIVE or not self._waiting[INTERACTIVE]):
+                        self._tokens -= 1
+                        return self._clock() - start
+                    self._cond.wait(max(0.01, (1 - self._tokens) / self.rate))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+
+class _Quota:
+    """Last rate-limit state GitHub reported for one resource (core, search, graphql, ...)."""
+
+    __slots__ = ("limit", "remaining", "reset", "next_slot", "blocked_until", "secondary_hits")
+
+    def __init__(self, limit: int, remaining: int, reset: float):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset  # epoch seconds
+        self.next_slot = 0.0  # epoch seconds before which paced requests wait
+        self.blocked_until = 0.0  # epoch seconds, set by rate-limit responses
+        self.secondary_hits = 0
+
+
+def _resource(path: str) -> str:
+    if path.endswith("/graphql"):
+        return "graphql"
+    if path.startswith("/search/"):
+        return "search"
+    return "core"
+
+
+class Scheduler:
+    """
+    Paces, waits out rate limits and retries requests for every client in the process.
+
+    ``send`` is called by the transport of each ``get_client`` client, so
+    call sites need no changes beyond choosing a priority. ``clock`` (epoch
+    seconds, compared with GitHub's reset times) and ``sleep`` can be
+    replaced to run the scheduler on simulated time.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._bucket = _TokenBucket(rate, burst, clock)
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._quotas: dict[str, _Quota] = {}
+        self._requests = 0
+        self._retries = 0
+
+    def _paced_host(self, host: str) -> bool:
+        return host == urlsplit(get_github_api_url()).netloc
+
+    def _wait_for_quota(self, resource: str, priority: int, budget: float) -> float:
+        """Sleep as the known quota requires before sending. Returns the time slept."""
+        with self._lock:
+            quota = self._quotas.get(resource)
+            if quota is None:
+                return 0.0
+            now = self._clock()
+            delay = max(0.0, quota.blocked_until - now)
+            if quota.reset > now:
+                reserve = quota.limit * BACKGROUND_RESERVE if priority == BACKGROUND else 0
+                available = quota.remaining - reserve
+                if available <= 0:
+                    delay = max(delay, quota.reset - now + 1)
+                elif quota.remaining < quota.limit * PACING_THRESHOLD:
+                    # Spread what is left over the rest of the window
+                    interval = (quota.reset - now) / available
+                    slot = max(now, quota.next_slot)
+                    quota.next_slot = slot + interval
+                    delay = max(delay, slot - now)
+                    quota.remaining -= 1  # count it before the response confirms
+        if delay <= 0 or delay > budget:
+            # Beyond the budget, send anyway and let GitHub's answer decide
+            return 0.0
+        self._sleep(delay)
+        return delay
+
+    def _update(self, resource: str, response: "httpx.Response") -> None:
+        limit = _int_header(response, "X-RateLimit-Limit")
+        remaining = _int_header(response, "X-RateLimit-Remaining")
+        reset = _int_header(response, "X-RateLimit-Reset")
+        if limit is None or remaining is None:
+            return
+        resource = response.headers.get("X-RateLimit-Resource", resource)
+        with self._lock:
+            quota = self._quotas.get(resource)
+            if quota is None:
+                quota = self._quotas[resource] = _Quota(limit, remaining, reset or 0)
+            else:
+                quota.limit, quota.remaining = limit, remaining
+                quota.reset = reset or quota.reset
+
+    def _rate_limit_wait(self, resource: str, response: "httpx.Response") -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if it is not one."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = _int_header(response, "Retry-After")
+        if retry_after is not None:
+            wait = float(retry_after)
+        elif _int_header(response, "X-RateLimit-Remaining") == 0:
+            reset = _int_header(response, "X-RateLimit-Reset")
+            wait = max(1.0, reset - self._clock() + 1) if reset else SECONDARY_WAIT
+        else:
+            response.read()
+            if b"secondary rate limit" not in response.content.lower():
+                return None  # a permissions error, not a limit
+            with self._lock:
+                quota = self._quotas.setdefault(resource, _Quota(0, 1, 0))
+                wait = SECONDARY_WAIT * 2 ** quota.secondary_hits
+                quota.secondary_hits += 1
+        with self._lock:
+            # Hold back every other request for this resource too
+            quota = self._quotas.setdefault(resource, _Quota(0, 1, 0))
+            quota.blocked_until = max(quota.blocked_until, self._clock() + wait)
+        return wait
+
+    def _take_retry(self) -> bool:
+        with self._lock:
+            if self._retries >= RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO * self._requests:
+                return False
+            self._retries += 1
+            return True
+
+    def _backoff(self, attempt: int) -> float:
+        import random
+
+        # Full jitter keeps concurrent jobs from retrying in lockstep
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def send(self, transport: "httpx.BaseTransport", request: "httpx.Request", priority: int) -> "httpx.Response":
+        import httpx
+
+        resource = _resource(request.url.path)
+        paced = self._paced_host(request.url.netloc.decode("ascii"))
+        idempotent = request.method in IDEMPOTENT_METHODS
+        max_wait = _env_float("ARA_HTTP_MAX_WAIT", MAX_WAIT[priority])
+        waited = 0.0  # in total, reported to the tracer
+        limit_waited = 0.0  # on rate limits, bounded by max_wait
+        retries = 0
+        attempt = 0
+        just_limited = False
+        with self._lock:
+            self._requests += 1
+
+        while True:
+            if paced:
+                if not just_limited:
+                    delay = self._wait_for_quota(resource, priority, max_wait - limit_waited)
+                    limit_waited += delay
+                    waited += delay
+                waited += self._bucket.acquire(priority)
+            just_limited = False
+            try:
+                response = transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadError, httpx.RemoteProtocolError):
+                attempt += 1
+                if not idempotent or attempt >= MAX_ATTEMPTS or not self._take_retry():
+                    raise
+                retries += 1
+                self._sleep(self._backoff(attempt))
+                continue
+
+            self._update(resource, response)
+            wait = self._rate_limit_wait(resource, response)
+            if wait is not None:
+                if limit_waited + wait > max_wait:
+                    break
+                response.close()
+                if wait >= NOTICE_WAIT:
+                    logger.warning("GitHub rate limit reached; retrying in %.0fs", wait)
+                self._sleep(wait)
+                limit_waited += wait
+                waited += wait
+                retries += 1
+                just_limited = True
+                continue
+            if response.status_code in RETRY_STATUSES and idempotent:
+                attempt += 1
+                if attempt < MAX_ATTEMPTS and self._take_retry():
+                    response.close()
+                    retries += 1
+                    self._sleep(self._backoff(attempt))
+                    continue
+            if response.status_code < 400:
+                with self._lock:
+                    quota = self._quotas.get(resource)
+                    if quota is not None:
+                        quota.secondary_hits = 0
+            break
+
+        response.extensions["ara_retries"] = retries
+        response.extensions["ara_waited"] = waited
+        return response
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+_default_priority: Optional[int] = None
+
+
+def get_scheduler() -> Scheduler:
+    """The process-wide scheduler, configured by ARA_HTTP_RATE and ARA_HTTP_BURST."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            rate = _env_float("ARA_HTTP_RATE", DEFAULT_RATE)
+            burst = int(_env_float("ARA_HTTP_BURST", DEFAULT_BURST))
+            _scheduler = Scheduler(rate, max(1, burst))
+        return _scheduler
+
+
+def set_default_priority(priority: int) -> None:
+    """Set the priority of clients created without an explicit one, e.g. for a bulk command."""
+    global _default_priority
+    _default_priority = priority
+
+
+def default_priority() -> int:
+    if _default_priority is not None:
+        return _default_priority
+    value = os.getenv("ARA_HTTP_PRIORITY", "interactive").lower()
+    if value not in _PRIORITIES:
+        raise ValueError(f"ARA_HTTP_PRIORITY must be 'interactive' or 'background', got: {value!r}")
+    return _PRIORITIES[value]
+
+
+@lru_cache(maxsize=None)
+def _scheduled_transport():
+    """The scheduling transport class, built on first use like ``_counting_stream``."""
+    import httpx
+
+    class ScheduledTransport(httpx.BaseTransport):
+        def __init__(self, priority: int):
+            self._inner = httpx.HTTPTransport()
+            self._priority = priority
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            return get_scheduler().send(self._inner, request, self._priority)
+
+        def close(self) -> None:
+            self._inner.close()
+
+    return ScheduledTransport
+
+
+def get_client(timeout: float = 30.0, priority: Optional[int] = None) -> "httpx.Client":
+    """
+    Create an HTTP client configured for GitHub API.
+
+    Requests go through the process-wide scheduler at the given priority
+    (INTERACTIVE or BACKGROUND; default from ``set_default_priority`` or
+    ARA_HTTP_PRIORITY).
+    """
+    # Imported here so commands that never reach the network start faster
+    import httpx
+
     return httpx.Client(
         headers=headers(),
         follow_redirects=True,
         timeout=timeout,
+        event_hooks=event_hooks(),
+        transport=_scheduled_transport()(default_priority() if priority is None else priority),
     )
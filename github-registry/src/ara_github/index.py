@@ -1,88 +1,101 @@
-"""Registry index management (read-only from CLI)."""
+"""Registry index management."""
 
-import base64
-import json
+from datetime import datetime, timezone
 from typing import Optional
 
-from . import http
+from . import semver, storage
+from .records import Index, PackageRecord
 
 
 def fetch_index() -> list[dict]:
-    """Fetch the registry index from GitHub."""
-    url = f"{http.api_base()}/contents/registry/index.json"
-    
-    try:
-        with http.get_client() as client:
-            response = client.get(url)
-            if response.status_code == 404:
-                return []
-            response.raise_for_status()
-            
-            data = response.json()
-            content = base64.b64decode(data["content"]).decode("utf-8")
-            return json.loads(content)
-    except Exception:
-        return []
+    """Fetch the raw registry index from the configured storage backend."""
+    return storage.get_storage().read_index()
+
+
+def load_index() -> Index:
+    """Fetch the registry index as records keyed by (namespace, name)."""
+    return Index.from_list(fetch_index())
 
 
 def fetch_ownership() -> dict:
-    """Fetch the ownership data from GitHub."""
-    url = f"{http.api_base()}/contents/registry/ownership.json"
-    
+    """Fetch the ownership data from the configured storage backend."""
+    return storage.get_storage().read_ownership()
+
+
+def lookup(namespace: str, name: str) -> Optional[PackageRecord]:
+    """
+    Find one package entry.
+
+    Uses the binary index when the backend has a current one, so the cost does
+    not grow with the registry; otherwise scans index.json.
+    """
+    return lookup_many([(namespace, name)])[(namespace, name)]
+
+
+def lookup_many(packages: list[tuple[str, str]]) -> dict[tuple[str, str], Optional[PackageRecord]]:
+    """Find several package entries, opening (and revalidating) the index only once."""
+    store = storage.get_storage()
     try:
-        with http.get_client() as client:
-            response = client.get(url)
-            if response.status_code == 404:
-                return {"namespaces": {}, "packages": {}}
-            response.raise_for_status()
-            
-            data = response.json()
-            content = base64.b64decode(data["content"]).decode("utf-8")
-            return json.loads(content)
-    except Exception:
-        return {"namespaces": {}, "packages": {}}
+        binary = store.open_binary_index()
+    except (OSError, ValueError):
+        # A damaged or unwritable cached index.bin only costs the fast path
+        binary = None
+    if binary is not None:
+        found = {}
+        with binary:
+            for namespace, name in packages:
+                entry = binary.get(namespace, name)
+                found[(namespace, name)] = PackageRecord.from_dict(entry) if entry is not None else None
+        return found
+
+    idx = load_index()
+    return {(namespace, name): idx.get(namespace, name) for namespace, name in packages}
 
 
 def search(
-    index: list[dict],
+    index: Index,
     q: Optional[str] = None,
     tags: Optional[list[str]] = None,
     namespace: Optional[str] = None,
     pkg_type: Optional[str] = None,
-) -> list[dict]:
+) -> list[PackageRecord]:
     """Filter index by search criteria."""
-    results = index
+    results = list(index)
     
     if namespace:
-        results = [p for p in results if p.get("namespace") == namespace]
+        results = [p for p in results if p.namespace == namespace]
     
     if pkg_type:
-        results = [p for p in results if p.get("type") == pkg_type]
+        results = [p for p in results if p.type == pkg_type]
     
     if tags:
         results = [
             p for p in results
-            if any(tag in p.get("tags", []) for tag in tags)
+            if any(tag in (p.tags or ()) for tag in tags)
         ]
     
     if q:
         q_lower = q.lower()
         results = [
             p for p in results
-            if q_lower in p.get("name", "").lower()
-            or q_lower in p.get("description", "").lower()
+            if q_lower in p.name.lower()
+            or q_lower in (p.description or "").lower()
         ]
     
     return results
 
 
-def check_ownership(namespace: str, name: Optional[str], username: str) -> Optional[str]:
+def check_ownership(
+    namespace: str, name: Optional[str], username: str, ownership: Optional[dict] = None
+) -> Optional[str]:
     """
     Check if user owns the namespace or package.
     
-    Returns None if user has permission, or an error message if not.
+    Pass ownership to check against already-fetched data. Returns None if
+    user has permission, or an error message if not.
     """
-    ownership = fetch_ownership()
+    if ownership is None:
+        ownership = fetch_ownership()
     
     # Check namespace ownership
     ns_owner = ownership.get("namespaces", {}).get(namespace)
@@ -100,10 +113,55 @@ def check_ownership(namespace: str, name: Optional[str], username: str) -> Optio
 
 
 def get_current_user() -> str:
-    """Get the current user's GitHub username."""
-    url = f"{http.get_github_api_url()}/user"
-    
-    with http.get_client() as client:
-        response = client.get(url)
-        response.raise_for_status()
-        return response.json()["login"]
+    """Get the identity of the current user (their GitHub username for GitHub registries)."""
+    return storage.get_storage().current_user()
+
+
+def record_version(index: Index, namespace: str, name: str, version: str, manifest: dict) -> PackageRecord:
+    """Add a published version to the index in place, creating the entry if needed."""
+    now = datetime.now(timezone.utc).isoformat()
+
+    pkg = index.get(namespace, name)
+    if pkg is not None:
+        if pkg.versions is None:
+            pkg.versions = []
+        semver.insert_version(pkg.versions, version)
+        pkg.latest_version = semver.latest(pkg.versions)
+        pkg.updated_at = now
+        return pkg
+
+    pkg = PackageRecord(
+        namespace=namespace,
+        name=name,
+        description=manifest.get("description", ""),
+        type=manifest.get("type", "kiro-agent"),
+        latest_version=version,
+        versions=[version],
+        tags=manifest.get("tags", []),
+        total_downloads=0,
+        created_at=now,
+        updated_at=now,
+    )
+    index.add(pkg)
+    return pkg
+
+
+def remove_version(index: Index, namespace: str, name: str, version: str) -> None:
+    """Remove a version from the index in place, dropping the package when none remain."""
+    pkg = index.get(namespace, name)
+    if pkg is None:
+        return
+
+    if pkg.has_version(version):
+        pkg.versions.remove(version)
+
+    if not pkg.versions:
+        index.remove(namespace, name)
+    else:
+        pkg.latest_version = semver.latest(pkg.versions)
+
+
+def claim_ownership(ownership: dict, namespace: str, name: str, username: str) -> None:
+    """Record first-come ownership of the namespace and package in place."""
+    ownership.setdefault("namespaces", {}).setdefault(namespace, username)
+    ownership.setdefault("packages", {}).setdefault(f"{namespace}/{name}", username)
@@ -0,0 +1,188 @@
+"""Registry mirroring into a local directory."""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from . import dictionaries, external, storage
+
+# Repository files copied into the mirror. index.bin comes after index.json so
+# a fresh copy is never older than the index it was built from.
+MIRRORED_FILES = (
+    storage.INDEX_PATH,
+    storage.BINARY_INDEX_PATH,
+    storage.OWNERSHIP_PATH,
+    external.EXTERNALS_PATH,
+    dictionaries.DICTIONARIES_PATH,
+)
+
+# Sync bookkeeping kept alongside the mirror (ETags of the mirrored files)
+STATE_FILE = ".ara-mirror.json"
+
+
+@dataclass
+class SyncResult:
+    """Counters describing what a sync transferred."""
+
+    files_updated: int = 0
+    files_unchanged: int = 0
+    assets_downloaded: int = 0
+    assets_skipped: int = 0
+    releases_pruned: int = 0
+    bytes_downloaded: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _asset_is_current(asset: dict, path: Path) -> bool:
+    """Whether the mirrored copy of an asset matches the source by size and digest."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return False
+    if asset.get("size") is not None and size != asset["size"]:
+        return False
+
+    # GitHub reports "sha256:<hex>" digests on assets uploaded since mid-2025
+    digest = asset.get("digest")
+    if digest and digest.startswith("sha256:"):
+        return _sha256_file(path) == digest.removeprefix("sha256:")
+    return True
+
+
+def _load_state(dest: Path) -> dict:
+    try:
+        with open(dest / STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(dest: Path, state: dict) -> None:
+    tmp = dest / f"{STATE_FILE}.tmp"
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, dest / STATE_FILE)
+
+
+def sync(
+    dest: Path,
+    source: Optional[storage.RegistryStorage] = None,
+    workers: int = 8,
+    prune: bool = False,
+    progress: Optional[Callable[[str], None]] = None,
+) -> SyncResult:
+    """
+    Incrementally copy a registry into dest using the local storage layout.
+
+    Repository files are fetched with conditional requests, and release assets
+    already present with a matching size/digest are skipped. Downloads run on
+    a thread pool of the given size.
+    """
+    source = source or storage.get_storage()
+    mirror = storage.LocalStorage(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    result = SyncResult()
+    report = progress or (lambda message: None)
+
+    state = _load_state(dest)
+    etags = state.setdefault("etags", {})
+
+    for path in MIRRORED_FILES:
+        # Re-fetch unconditionally if the mirrored copy went missing
+        etag = etags.get(path) if (dest / path).exists() else None
+        changed, content, new_etag = source.read_file_if_changed(path, etag)
+        if not changed:
+            result.files_unchanged += 1
+            continue
+        if content is None:
+            etags.pop(path, None)
+            continue
+        mirror.write_file(path, content, f"Mirror {path}")
+        etags[path] = new_etag
+        result.files_updated += 1
+        result.bytes_downloaded += len(content)
+        report(f"Updated {path}")
+
+    # Upstream index.bin may lag index.json (or be missing); mirrors always carry a current one
+    if mirror.rebuild_binary_index(f"Rebuild {storage.BINARY_INDEX_PATH}"):
+        report(f"Rebuilt {storage.BINARY_INDEX_PATH}")
+
+    releases = source.list_releases("ara/")
+    # Dictionary releases are listed in dictionaries.json rather than discovered
+    dict_tags = [dictionaries.release_tag(int(i)) for i in dictionaries.load_config(mirror)["dictionaries"]]
+    for tag, release in source.get_releases(dict_tags).items():
+        if release is None:
+            result.errors.append(f"{tag}: release not found")
+        else:
+            releases.append({**release, "tag_name": tag})
+    wanted = []
+    for release in releases:
+        for asset in release.get("assets", []):
+            if asset["name"] not in storage.RELEASE_ASSETS and asset["name"] != storage.DICTIONARY_ASSET:
+                continue
+            target = dest / "releases" / release["tag_name"] / asset["name"]
+            if _asset_is_current(asset, target):
+                result.assets_skipped += 1
+            else:
+                wanted.append((release["tag_name"], asset, target))
+
+    def download(tag: str, asset: dict, target: Path) -> int:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.part")
+        try:
+            source.download_asset(asset, tmp)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return target.stat().st_size
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(download, *item): item for item in wanted}
+        for future in as_completed(futures):
+            tag, asset, _ = futures[future]
+            try:
+                result.bytes_downloaded += future.result()
+                result.assets_downloaded += 1
+                report(f"Downloaded {tag}/{asset['name']}")
+            except Exception as e:
+                result.errors.append(f"{tag}/{asset['name']}: {e}")
+
+    if prune:
+        live = {release["tag_name"] for release in releases}
+        for tag in mirror.list_release_tags("ara/"):
+            if tag not in live:
+                mirror.delete_release(tag)
+                result.releases_pruned += 1
+                report(f"Pruned {tag}")
+        # Releases whose ara.json never arrived are invisible to list_release_tags
+        releases_root = dest / "releases"
+        for partial in releases_root.glob("ara/*/*/v*") if releases_root.is_dir() else []:
+            tag = partial.relative_to(releases_root).as_posix()
+            if tag not in live:
+                shutil.rmtree(partial)
+                result.releases_pruned += 1
+                # Like delete_release, leave no empty package directories behind
+                for parent in (partial.parent, partial.parent.parent):
+                    if not any(parent.iterdir()):
+                        parent.rmdir()
+        for dict_dir in releases_root.glob(f"{storage.DICTIONARY_TAG_PREFIX}*") if releases_root.is_dir() else []:
+            tag = dict_dir.relative_to(releases_root).as_posix()
+            if tag not in live:
+                shutil.rmtree(dict_dir)
+                result.releases_pruned += 1
+                report(f"Pruned {tag}")
+
+    _save_state(dest, state)
+    return result
@@ -0,0 +1,287 @@
+"""Deterministic package archives.
+
+The same files always pack into the same tar, byte for byte, whatever the
+machine, checkout time or user: members are sorted by path and every header
+is normalized (mtime 0, uid and gid 0, no user or group name, mode 644, or
+755 for executables). ``dictionaries.compress`` fixes the compression
+parameters, so for a given zstd version identical content also yields an
+identical ``package.tar.zst`` and digest, which caches, mirrors and deltas
+can rely on.
+
+Each tar embeds a manifest of its files as its second member, right after
+``ara.json``::
+
+    {"files": {"ara.json": {"mode": "644", "sha256": "...", "size": 210},
+               "bin/run.sh": {"mode": "755", "sha256": "...", "size": 96},
+               "latest.md": {"symlink": "docs/v2.md"}}}
+
+Extraction checks every member against it. Archives built before the
+manifest existed are accepted without the check, but no archive may hold
+hard links, devices, or symlinks that lead outside the package.
+
+Packages without a ``files`` list are found by ``scan``, which honours
+gitignore-style ``.araignore`` files and never descends into an ignored
+directory. ``.gitignore`` files are only read when asked for (``ara publish
+--gitignore``), and then only in directories without an ``.araignore``.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+FILES_MANIFEST = ".ara-files.json"
+
+IGNORE_FILE = ".araignore"
+
+# Applied before any ignore file, so a package can re-include them with "!name"
+DEFAULT_IGNORES = (".git", "node_modules", "__pycache__", "target", ".DS_Store", IGNORE_FILE)
+
+# Below this many files, reading them one by one beats starting threads
+_PARALLEL_MIN_FILES = 16
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without leading or trailing slash) to a regex."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = end + 1
+            continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """
+    The patterns of one ignore file, relative to the directory holding it.
+
+    Supports the gitignore syntax: ``#`` comments, ``!`` negation, a
+    trailing ``/`` for directories only, a leading or inner ``/`` to anchor
+    a pattern to this directory, and ``*``, ``?``, ``[...]`` and ``**``.
+    """
+
+    def __init__(self, base: str, lines: list[str]):
+        self.base = base
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n\r")
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate or line.startswith(("\\!", "\\#")):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            regex = _translate(line.lstrip("/"))
+            self.rules.append((re.compile(regex if anchored else "(?:.*/)?" + regex), negate, dir_only))
+
+    @classmethod
+    def load(cls, directory: Path, base: str, gitignore: bool = False) -> Optional["IgnoreRules"]:
+        """The rules of a directory's .araignore (else, with gitignore, its .gitignore), if any."""
+        for name in (IGNORE_FILE, ".gitignore") if gitignore else (IGNORE_FILE,):
+            try:
+                text = (directory / name).read_text(encoding="utf-8", errors="replace")
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                continue
+            return cls(base, text.splitlines())
+        return None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no pattern matches."""
+        if not path.startswith(self.base):
+            return None
+        relative = path[len(self.base):]
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if (is_dir or not dir_only) and regex.fullmatch(relative):
+                result = not negate
+        return result
+
+
+def _ignored(rulesets: tuple[IgnoreRules, ...], path: str, is_dir: bool) -> bool:
+    # Deeper ignore files come later and take precedence, as in git
+    ignored = False
+    for rules in rulesets:
+        matched = rules.match(path, is_dir)
+        if matched is not None:
+            ignored = matched
+    return ignored
+
+
+def scan(root: Path, gitignore: bool = False) -> dict[str, Path]:
+    """
+    Find the files of a package directory, as {archive name: path}.
+
+    Walks with os.scandir and prunes ignored directories before entering
+    them, so an ignored node_modules or build tree costs one directory entry,
+    not a traversal. Symlinked directories are not followed; symlinks to
+    files are kept. With gitignore, directories without an .araignore use
+    their .gitignore.
+    """
+    files: dict[str, Path] = {}
+    stack = [("", root, (IgnoreRules("", list(DEFAULT_IGNORES)),))]
+    while stack:
+        prefix, directory, rulesets = stack.pop()
+        own = IgnoreRules.load(directory, prefix, gitignore)
+        if own is not None:
+            rulesets = rulesets + (own,)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                path = prefix + entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if _ignored(rulesets, path, is_dir):
+                    continue
+                if is_dir:
+                    stack.append((path + "/", Path(entry.path), rulesets))
+                elif entry.is_file():
+                    files[path] = Path(entry.path)
+    return files
+
+
+def _header(name: str) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def _mode(path: Path) -> int:
+    return 0o755 if path.stat().st_mode & 0o111 else 0o644
+
+
+def file_entry(path: Path) -> tuple[dict, Optional[bytes]]:
+    """The manifest entry of one file, and its content (None for a symlink)."""
+    if path.is_symlink():
+        return {"symlink": os.readlink(path)}, None
+    data = path.read_bytes()
+    entry = {"mode": format(_mode(path), "o"), "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+    return entry, data
+
+
+def build_tar(files: dict[str, Path]) -> bytes:
+    """
+    Pack files (archive name -> path on disk) into a deterministic tar.
+
+    ``ara.json`` comes first and the files manifest second, so readers can
+    identify and check a package from the start of the stream; the rest
+    follow in path order.
+    """
+    names = sorted(files)
+    paths = [files[name] for name in names]
+    if len(paths) >= _PARALLEL_MIN_FILES:
+        # File reads and hashlib release the GIL, so threads overlap the I/O and hashing
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            results = list(pool.map(file_entry, paths))
+    else:
+        results = [file_entry(path) for path in paths]
+    entries = {name: entry for name, (entry, _) in zip(names, results)}
+    contents = {name: data for name, (_, data) in zip(names, results)}
+    manifest = json.dumps({"files": entries}, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    order = sorted(entries, key=lambda name: (name != "ara.json", name))
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        for arcname in order[:1] + [FILES_MANIFEST] + order[1:]:
+            if arcname == FILES_MANIFEST:
+                info, data = _header(arcname), manifest
+                info.mode = 0o644
+            elif "symlink" in entries[arcname]:
+                info, data = _header(arcname), None
+                info.type = tarfile.SYMTYPE
+                info.linkname = entries[arcname]["symlink"]
+                info.mode = 0o777
+            else:
+                info, data = _header(arcname), contents[arcname]
+                info.mode = int(entries[arcname]["mode"], 8)
+            if data is not None:
+                info.size = len(data)
+            tar.addfile(info, io.BytesIO(data) if data is not None else None)
+    return buf.getvalue()
+
+
+def read_manifest(tar: tarfile.TarFile) -> Optional[dict[str, dict]]:
+    """The files manifest of an archive, or None if it predates manifests."""
+    try:
+        member = tar.getmember(FILES_MANIFEST)
+    except KeyError:
+        return None
+    return json.loads(tar.extractfile(member).read())["files"]
+
+
+def check_path(member: tarfile.TarInfo, dest_dir: Path, symlinks: set[str]) -> Optional[str]:
+    """
+    Why extracting a member could write outside dest_dir, or None if it cannot.
+
+    symlinks holds the names of the archive's symlink members. A member
+    below one of them is refused, since writing it would follow the link;
+    with that ruled out, a symlink's target resolves the same way on disk as
+    it does here.
+    """
+    path = PurePosixPath(member.name)
+    if path.is_absolute() or ".." in path.parts:
+        return f"{member.name} has an unsafe path"
+    if not (member.isfile() or member.isdir() or member.issym()):
+        # Hard links, devices and FIFOs never come from build_tar
+        return f"{member.name} is not a regular file, directory or symlink"
+    if any(str(parent) in symlinks for parent in path.parents):
+        return f"{member.name} is inside a symlinked directory"
+    if member.issym():
+        if PurePosixPath(member.linkname).is_absolute():
+            return f"{member.name} links to an absolute path"
+        root = os.path.realpath(dest_dir)
+        target = os.path.realpath(os.path.join(root, *path.parent.parts, member.linkname))
+        if os.path.commonpath([root, target]) != root:
+            return f"{member.name} links outside the package"
+    return None
+
+
+def check_member(tar: tarfile.TarFile, member: tarfile.TarInfo, files: dict[str, dict]) -> Optional[str]:
+    """Why a member does not match the manifest, or None if it does."""
+    entry = files.get(member.name)
+    if entry is None:
+        return f"{member.name} is not listed in the archive's manifest"
+    if "symlink" in entry:
+        if not member.issym() or member.linkname != entry["symlink"]:
+            return f"{member.name} does not match the archive's manifest"
+        return None
+    if not member.isfile():
+        return f"{member.name} is not a regular file"
+    data = tar.extractfile(member).read()
+    if len(data) != entry["size"] or hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        return f"{member.name} does not match its SHA-256 in the archive's manifest"
+    return None
@@ -0,0 +1,170 @@
+"""Typed, compact in-memory form of the registry index."""
+
+import sys
+from typing import Any, Iterable, Iterator, Optional
+
+from . import semver
+
+# index.json field order, kept on write so diffs stay minimal
+_FIELDS = (
+    "namespace",
+    "name",
+    "description",
+    "type",
+    "latest_version",
+    "versions",
+    "tags",
+    "total_downloads",
+    "created_at",
+    "updated_at",
+    "downloads_by_version",
+)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def is_valid_entry(entry: Any) -> bool:
+    """Whether an index.json entry can be keyed: a dict with a string namespace and name."""
+    return isinstance(entry, dict) and isinstance(entry.get("namespace"), str) and isinstance(entry.get("name"), str)
+
+
+class PackageRecord:
+    """
+    One package entry of the index.
+
+    Uses ``__slots__`` and interns the strings repeated across entries
+    (namespace, type, tags, versions), so a large index costs a fraction of
+    the memory of the equivalent dicts. Fields absent from the source entry
+    are None and are left out again by ``to_dict``; unknown fields are kept
+    in ``extra``.
+    """
+
+    __slots__ = _FIELDS + ("extra",)
+
+    def __init__(
+        self,
+        namespace: str,
+        name: str,
+        description: Optional[str] = None,
+        type: Optional[str] = None,
+        latest_version: Optional[str] = None,
+        versions: Optional[list[str]] = None,
+        tags: Optional[list[str]] = None,
+        total_downloads: Optional[int] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        downloads_by_version: Optional[dict[str, int]] = None,
+        extra: Optional[dict[str, Any]] = None,
+    ):
+        self.namespace = sys.intern(namespace)
+        self.name = name
+        self.description = description
+        self.type = _intern(type)
+        self.latest_version = _intern(latest_version)
+        self.versions = [sys.intern(v) for v in versions] if versions is not None else None
+        self.tags = [sys.intern(t) for t in tags] if tags is not None else None
+        self.total_downloads = total_downloads
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.downloads_by_version = downloads_by_version
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PackageRecord":
+        """Build a record from an index.json entry. Raises ValueError if it has no namespace or name."""
+        if not is_valid_entry(data):
+            raise ValueError(f"Malformed index entry: {data!r:.200}")
+        known = {k: data[k] for k in _FIELDS if k in data}
+        extra = {k: v for k, v in data.items() if k not in known}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for field in _FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.namespace, self.name
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.namespace}/{self.name}"
+
+    def has_version(self, version: str) -> bool:
+        return version in (self.versions or ())
+
+    def latest(self, prerelease: bool = False) -> Optional[str]:
+        """Highest stable version (see ``semver.latest``), recomputed from ``versions``."""
+        return semver.latest(self.versions or (), prerelease=prerelease)
+
+    def resolve(self, spec: str) -> Optional[str]:
+        """Resolve a version or range against the published versions."""
+        return semver.resolve(spec, self.versions or ())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackageRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"PackageRecord({self.full_name}@{self.latest_version})"
+
+
+class Index:
+    """
+    The registry index as records with an O(1) ``(namespace, name)`` lookup.
+
+    Iteration follows index.json order, and ``to_list`` produces the dicts
+    to write back. Entries without a string namespace and name cannot be
+    looked up, so ``from_list`` leaves them out of lookups and iteration;
+    they are kept as they were, at the end of ``to_list``, so a write does
+    not silently drop them.
+    """
+
+    __slots__ = ("_records", "_malformed")
+
+    def __init__(self, records: Iterable[PackageRecord] = ()):
+        self._records: dict[tuple[str, str], PackageRecord] = {}
+        self._malformed: list[Any] = []
+        for record in records:
+            self._records[record.key] = record
+
+    @classmethod
+    def from_list(cls, entries: Iterable[dict]) -> "Index":
+        index = cls()
+        for entry in entries:
+            if is_valid_entry(entry):
+                index.add(PackageRecord.from_dict(entry))
+            else:
+                index._malformed.append(entry)
+        return index
+
+    def to_list(self) -> list[dict]:
+        return [record.to_dict() for record in self._records.values()] + self._malformed
+
+    def get(self, namespace: str, name: str) -> Optional[PackageRecord]:
+        return self._records.get((namespace, name))
+
+    def add(self, record: PackageRecord) -> None:
+        """Add a record, replacing any existing entry for the same package in place."""
+        self._records[record.key] = record
+
+    def remove(self, namespace: str, name: str) -> Optional[PackageRecord]:
+        return self._records.pop((namespace, name), None)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._records
+
+    def __iter__(self) -> Iterator[PackageRecord]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,299 @@
+"""Semantic Versioning 2.0.0 precedence and version range resolution.
+
+Parsed versions and ranges are cached, so sorting or resolving against
+packages with hundreds of versions parses each string once per process.
+Index ``versions`` lists are kept newest first.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Union
+
+_VERSION_RE = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+
+# A version in a range may leave out trailing parts or use x/X/* wildcards
+_PARTIAL_RE = re.compile(
+    r"^v?(\d+|[xX*])(?:\.(\d+|[xX*])(?:\.(\d+|[xX*])"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?)?)?$"
+)
+
+_COMPARATOR_RE = re.compile(r"^(\^|~|>=|<=|>|<|=)?\s*(.*)$")
+
+_WILDCARDS = ("x", "X", "*")
+
+PrereleaseId = Union[int, str]
+
+
+class Version(NamedTuple):
+    """A parsed version. Compare versions with ``key``, not tuple order."""
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: tuple[PrereleaseId, ...] = ()
+    build: tuple[str, ...] = ()
+
+    @property
+    def is_prerelease(self) -> bool:
+        return bool(self.prerelease)
+
+    def __str__(self) -> str:
+        text = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            text += "-" + ".".join(str(i) for i in self.prerelease)
+        if self.build:
+            text += "+" + ".".join(self.build)
+        return text
+
+
+def _prerelease_ids(text: Optional[str]) -> tuple[PrereleaseId, ...]:
+    if not text:
+        return ()
+    return tuple(int(part) if part.isdigit() else part for part in text.split("."))
+
+
+@lru_cache(maxsize=4096)
+def parse(version: str) -> Version:
+    """Parse a version string. Raises ValueError if it is not valid semver."""
+    match = _VERSION_RE.match(version)
+    if not match:
+        raise ValueError(f"Invalid semantic version: {version!r}")
+    major, minor, patch, prerelease, build = match.groups()
+    return Version(int(major), int(minor), int(patch), _prerelease_ids(prerelease), tuple(build.split(".")) if build else ())
+
+
+def is_valid(version: str) -> bool:
+    try:
+        parse(version)
+    except ValueError:
+        return False
+    return True
+
+
+def _precedence(major: int, minor: int, patch: int, prerelease: tuple[PrereleaseId, ...]) -> tuple:
+    # A release outranks its prereleases; prerelease identifiers compare
+    # numerically when numeric, lexically otherwise, and numeric ones rank
+    # lower. A longer identifier list wins when all shared ones are equal.
+    if not prerelease:
+        return (major, minor, patch, 1)
+    ids = tuple((0, i, "") if isinstance(i, int) else (1, 0, i) for i in prerelease)
+    return (major, minor, patch, 0, ids)
+
+
+@lru_cache(maxsize=4096)
+def key(version: str) -> tuple:
+    """
+    Sort key implementing semver precedence (build metadata is ignored).
+
+    Strings that are not valid semver sort below every valid version.
+    """
+    try:
+        v = parse(version)
+    except ValueError:
+        return (-1, version)
+    return _precedence(v.major, v.minor, v.patch, v.prerelease)
+
+
+def compare(a: str, b: str) -> int:
+    """Return -1, 0 or 1 as a has lower, equal or higher precedence than b."""
+    ka, kb = key(a), key(b)
+    return (ka > kb) - (ka < kb)
+
+
+def sort_versions(versions: Iterable[str]) -> list[str]:
+    """Sort versions newest first, the order the index keeps them in."""
+    return sorted(versions, key=key, reverse=True)
+
+
+def insert_version(versions: list[str], version: str) -> None:
+    """Add a version to a newest-first list in place, keeping it sorted."""
+    if version not in versions:
+        versions.append(version)
+    versions.sort(key=key, reverse=True)
+
+
+def latest(versions: Iterable[str], prerelease: bool = False) -> Optional[str]:
+    """
+    Pick the version ``ara install`` should default to.
+
+    The highest stable version wins. Prereleases are only chosen when
+    prerelease is True or the package has no stable version at all.
+    """
+    candidates = list(versions)
+    stable = [v for v in candidates if not _is_prerelease(v)]
+    pool = candidates if prerelease or not stable else stable
+    return max(pool, key=key) if pool else None
+
+
+def _is_prerelease(version: str) -> bool:
+    try:
+        return parse(version).is_prerelease
+    except ValueError:
+        return False
+
+
+class _Comparator(NamedTuple):
+    op: str
+    key: tuple
+
+
+class Range:
+    """
+    A version range in npm syntax.
+
+    Supports exact versions, ``^``/``~`` ranges, comparison operators
+    (``>=1.2.0 <2``), x-ranges (``1.x``, ``1.2.*``, ``*``), hyphen ranges
+    (``1.2 - 1.4``) and ``||`` alternatives. As in npm, a prerelease only
+    satisfies a range that names a prerelease of the same major.minor.patch.
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self._alternatives: list[tuple[list[_Comparator], set[tuple[int, int, int]]]] = []
+        for alternative in spec.split("||"):
+            comparators: list[_Comparator] = []
+            prerelease_cores: set[tuple[int, int, int]] = set()
+            for part in _tokenize(alternative.strip()):
+                comparators.extend(_desugar(part, spec, prerelease_cores))
+            self._alternatives.append((comparators, prerelease_cores))
+
+    def __repr__(self) -> str:
+        return f"Range({self.spec!r})"
+
+    def contains(self, version: str, include_prerelease: bool = False) -> bool:
+        try:
+            v = parse(version)
+        except ValueError:
+            return False
+        k = key(version)
+        for comparators, prerelease_cores in self._alternatives:
+            if not all(_test(c, k) for c in comparators):
+                continue
+            if v.is_prerelease and not include_prerelease and (v.major, v.minor, v.patch) not in prerelease_cores:
+                continue
+            return True
+        return False
+
+    def resolve(self, versions: Iterable[str], include_prerelease: bool = False) -> Optional[str]:
+        """Highest version satisfying the range, or None."""
+        matching = [v for v in versions if self.contains(v, include_prerelease)]
+        return max(matching, key=key) if matching else None
+
+
+def _test(comparator: _Comparator, k: tuple) -> bool:
+    op, bound = comparator
+    if op == ">=":
+        return k >= bound
+    if op == ">":
+        return k > bound
+    if op == "<=":
+        return k <= bound
+    if op == "<":
+        return k < bound
+    return k == bound
+
+
+def _tokenize(alternative: str) -> list[str]:
+    """Split an alternative into comparators, expanding hyphen ranges."""
+    words = alternative.split()
+    if len(words) == 3 and words[1] == "-":
+        return [f">={words[0]}", f"<={words[2]}"]
+    tokens = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        # Allow a space between an operator and its version: ">= 1.2.0"
+        if word in ("^", "~", ">=", "<=", ">", "<", "=") and i + 1 < len(words):
+            word += words[i + 1]
+            i += 1
+        tokens.append(word)
+        i += 1
+    return tokens or ["*"]
+
+
+def _lowest(major: int, minor: int, patch: int) -> tuple:
+    """Key just below every version of major.minor.patch, i.e. major.minor.patch-0."""
+    return _precedence(major, minor, patch, (0,))
+
+
+def _desugar(token: str, spec: str, prerelease_cores: set[tuple[int, int, int]]) -> list[_Comparator]:
+    op, text = _COMPARATOR_RE.match(token).groups()
+    if text in ("", *_WILDCARDS):
+        return [] if op in (None, "=", ">=", "^", "~", "<=") else [_Comparator("<", _lowest(0, 0, 0))]
+
+    match = _PARTIAL_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid version range: {spec!r}")
+    parts = match.groups()[:3]
+    prerelease = _prerelease_ids(match.group(4))
+    # Parts after the first wildcard or omission are wildcards too
+    numbers: list[int] = []
+    for part in parts:
+        if part is None or part in _WILDCARDS:
+            break
+        numbers.append(int(part))
+
+    if len(numbers) == 3:
+        major, minor, patch = numbers
+        exact = _precedence(major, minor, patch, prerelease)
+        if prerelease:
+            prerelease_cores.add((major, minor, patch))
+        if op == "^":
+            if major:
+                upper = _lowest(major + 1, 0, 0)
+            elif minor:
+                upper = _lowest(0, minor + 1, 0)
+            else:
+                upper = _lowest(0, 0, patch + 1)
+            return [_Comparator(">=", exact), _Comparator("<", upper)]
+        if op == "~":
+            return [_Comparator(">=", exact), _Comparator("<", _lowest(major, minor + 1, 0))]
+        return [_Comparator(op or "=", exact)]
+
+    # Partial version: a range spanning every version with that prefix
+    if not numbers:
+        return []
+    major = numbers[0]
+    minor = numbers[1] if len(numbers) > 1 else 0
+    low = _lowest(major, minor, 0)
+    if len(numbers) == 1:
+        high = _lowest(major + 1, 0, 0)
+    elif op == "^" and major:
+        high = _lowest(major + 1, 0, 0)
+    else:
+        high = _lowest(major, minor + 1, 0)
+
+    if op in (None, "=", "^", "~"):
+        return [_Comparator(">=", low), _Comparator("<", high)]
+    if op == ">=":
+        return [_Comparator(">=", low)]
+    if op == ">":
+        return [_Comparator(">=", high)]
+    if op == "<":
+        return [_Comparator("<", low)]
+    return [_Comparator("<", high)]  # "<="
+
+
+@lru_cache(maxsize=512)
+def parse_range(spec: str) -> Range:
+    """Parse a version range. Raises ValueError if it is malformed."""
+    return Range(spec)
+
+
+def resolve(spec: str, versions: Iterable[str], include_prerelease: bool = False) -> Optional[str]:
+    """
+    Resolve a version or range against available versions.
+
+    An exact version resolves to itself if present. Returns None when
+    nothing matches.
+    """
+    versions = list(versions)
+    if spec in versions:
+        return spec
+    return parse_range(spec).resolve(versions, include_prerelease)
@@ -0,0 +1,692 @@
+"""Registry storage backends.
+
+Everything the CLI reads or writes lives in one of two places: JSON files in
+the registry repository (``registry/index.json``, ``registry/ownership.json``,
+``registry/externals.json``, plus the derived ``registry/index.bin``) and release assets (``package.tar.zst``,
+``ara.json``) attached to a release tagged ``ara/{namespace}/{name}/v{version}``.
+A backend abstracts both so the CLI can run against GitHub or a local directory.
+
+The local layout mirrors the repository and releases one-to-one, so a local
+registry can be served read-only by any static file server::
+
+    <root>/registry/index.json
+    <root>/registry/ownership.json
+    <root>/registry/index.bin
+    <root>/registry/dictionaries.json
+    <root>/releases/ara/<namespace>/<name>/v<version>/package.tar.zst
+    <root>/releases/ara/<namespace>/<name>/v<version>/package.patch.zst  (optional)
+    <root>/releases/ara/<namespace>/<name>/v<version>/ara.json
+    <root>/releases/ara-dict/<id>/dictionary.zdict
+"""
+
+import abc
+import base64
+import getpass
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from . import binindex, fastjson, http
+
+if TYPE_CHECKING:
+    import httpx
+
+INDEX_PATH = "registry/index.json"
+OWNERSHIP_PATH = "registry/ownership.json"
+BINARY_INDEX_PATH = "registry/index.bin"
+
+# Optional delta against the previous version's archive (see deltas.py)
+DELTA_ASSET = "package.patch.zst"
+
+# Asset names a release may carry, for backends that cannot list them
+RELEASE_ASSETS = ("package.tar.zst", "ara.json", DELTA_ASSET)
+
+# Shared compression dictionaries (see dictionaries.py) are released as
+# ara-dict/<id>, outside the ara/ prefix package releases use
+DICTIONARY_TAG_PREFIX = "ara-dict/"
+DICTIONARY_ASSET = "dictionary.zdict"
+
+# Releases looked up per GraphQL query, one alias each
+GRAPHQL_BATCH = 50
+
+_RELEASE_FIELDS = """
+fragment release on Release {
+  databaseId
+  tagName
+  name
+  releaseAssets(first: 20) {
+    nodes { name size downloadCount downloadUrl }
+  }
+}
+"""
+
+
+class WriteConflict(Exception):
+    """A conditional write found that the file changed after it was read."""
+
+
+def _empty_ownership() -> dict:
+    return {"namespaces": {}, "packages": {}}
+
+
+def _binary_source(path: Path) -> Optional[str]:
+    """Read the source id from a binary index file header, or None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return binindex.BinaryIndex(f.read(binindex.HEADER.size)).source
+    except (OSError, ValueError):
+        return None
+
+
+class RegistryStorage(abc.ABC):
+    """Abstract registry storage backend."""
+
+    #: Whether writes are impossible (e.g. a mirror served over plain HTTP).
+    read_only = False
+
+    #: Whether the CLI may write to this backend itself. GitHub registries are
+    #: written by Actions workflows instead, since publishers lack repo access.
+    direct_writes = False
+
+    @abc.abstractmethod
+    def read_file(self, path: str) -> Optional[bytes]:
+        """Read a repository file, or None if it does not exist."""
+
+    @abc.abstractmethod
+    def write_file(self, path: str, content: bytes, message: str, expected: Optional[str] = None) -> None:
+        """
+        Create or replace a repository file.
+
+        With ``expected`` (the git blob SHA-1 of the content the caller read,
+        see ``binindex.source_id``), raise WriteConflict instead of writing
+        if the file has changed since.
+        """
+
+    @abc.abstractmethod
+    def get_release(self, tag: str) -> dict:
+        """Get a release by tag in GitHub's shape. Raises FileNotFoundError if missing."""
+
+    def get_releases(self, tags: list[str]) -> dict[str, Optional[dict]]:
+        """Get several releases by tag. Tags without a release map to None."""
+        releases: dict[str, Optional[dict]] = {}
+        for tag in tags:
+            try:
+                releases[tag] = self.get_release(tag)
+            except FileNotFoundError:
+                releases[tag] = None
+        return releases
+
+    @abc.abstractmethod
+    def read_asset(self, asset: dict) -> bytes:
+        """Read a release asset fully into memory."""
+
+    @abc.abstractmethod
+    def download_asset(self, asset: dict, dest: Path) -> None:
+        """Stream a release asset to a local file."""
+
+    @abc.abstractmethod
+    def create_release(self, tag: str, title: str, body: str, assets: dict[str, bytes]) -> dict:
+        """Create a release with the given assets."""
+
+    @abc.abstractmethod
+    def delete_release(self, tag: str) -> None:
+        """Delete a release and its tag. Raises FileNotFoundError if missing."""
+
+    @abc.abstractmethod
+    def list_releases(self, prefix: str = "") -> list[dict]:
+        """List releases (with their assets) whose tag starts with prefix."""
+
+    def list_release_tags(self, prefix: str = "") -> list[str]:
+        """List release tags starting with prefix."""
+        return [r["tag_name"] for r in self.list_releases(prefix)]
+
+    def read_file_if_changed(self, path: str, etag: Optional[str]) -> tuple[bool, Optional[bytes], Optional[str]]:
+        """
+        Conditionally read a repository file.
+
+        Returns (changed, content, etag). When the file still matches etag,
+        changed is False and no content is transferred.
+        """
+        content = self.read_file(path)
+        new_etag = hashlib.sha256(content).hexdigest() if content is not None else None
+        if etag is not None and new_etag == etag:
+            return False, None, etag
+        return True, content, new_etag
+
+    @abc.abstractmethod
+    def current_user(self) -> str:
+        """Get the identity write operations are attributed to."""
+
+    def read_json(self, path: str, default: Any) -> Any:
+        """
+        Read a JSON repository file, or return default if it does not exist.
+
+        Read failures and invalid JSON are raised, not mapped to default:
+        callers write the result back, and an empty default would replace
+        the real file.
+        """
+        content = self.read_file(path)
+        if content is None:
+            return default
+        return fastjson.loads(content)
+
+    def write_json(self, path: str, data: Any, message: str) -> None:
+        """Write a JSON repository file."""
+        self.write_file(path, fastjson.dumps(data, indent=True), message)
+
+    def read_index(self) -> list[dict]:
+        return self.read_json(INDEX_PATH, [])
+
+    def read_index_for_update(self) -> tuple[list[dict], Optional[str]]:
+        """Read index.json along with the ``expected`` value that makes ``write_index`` conditional."""
+        content = self.read_file(INDEX_PATH)
+        if content is None:
+            return [], None
+        return fastjson.loads(content), binindex.source_id(content)
+
+    def write_index(self, index: list[dict], message: str, expected: Optional[str] = None) -> None:
+        """Write index.json and regenerate the binary index from the same bytes."""
+        content = fastjson.dumps(index, indent=True)
+        self.write_file(INDEX_PATH, content, message, expected)
+        self.write_file(BINARY_INDEX_PATH, binindex.build(index, binindex.source_id(content)), message)
+
+    def rebuild_binary_index(self, message: str = "Rebuild binary index") -> bool:
+        """
+        Regenerate index.bin if it does not match index.json.
+
+        Needed after index.json is written by something other than
+        ``write_index`` (e.g. the publish workflows). Returns whether it was rewritten.
+        """
+        content = self.read_file(INDEX_PATH)
+        if content is None:
+            return False
+        source = binindex.source_id(content)
+        current = self.read_file(BINARY_INDEX_PATH)
+        if current is not None:
+            try:
+                if binindex.BinaryIndex(current).source == source:
+                    return False
+            except ValueError:
+                pass
+        self.write_file(BINARY_INDEX_PATH, binindex.build(fastjson.loads(content), source), message)
+        return True
+
+    def cache_key(self) -> Optional[str]:
+        """Identify this registry for the local binary index cache, or None to disable caching."""
+        return None
+
+    def index_source_id(self) -> Optional[str]:
+        """
+        Get the source id (git blob SHA-1) of the current index.json without reading it.
+
+        None means the backend cannot tell cheaply, and a fetched binary index
+        is trusted as is.
+        """
+        return None
+
+    def open_binary_index(self) -> Optional[binindex.BinaryIndex]:
+        """
+        Open a current binary index for point lookups, or None to fall back to index.json.
+
+        The file is kept in a local cache and refreshed with a conditional
+        request, so an unchanged registry costs at most one round trip.
+        """
+        key = self.cache_key()
+        if key is None:
+            return None
+        cached = binindex.cache_dir() / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.bin"
+        etag_file = cached.with_suffix(".etag")
+        source = self.index_source_id()
+
+        etag = None
+        if cached.exists():
+            if source is not None and _binary_source(cached) == source:
+                return binindex.BinaryIndex.open(cached)
+            etag = etag_file.read_text() if etag_file.exists() else None
+
+        changed, content, new_etag = self.read_file_if_changed(BINARY_INDEX_PATH, etag)
+        if changed:
+            if content is None:
+                cached.unlink(missing_ok=True)
+                etag_file.unlink(missing_ok=True)
+                return None
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f".{cached.name}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, cached)
+            etag_file.write_text(new_etag or "")
+
+        binary = binindex.BinaryIndex.open(cached)
+        if source is not None and binary.source != source:
+            # index.json was updated without regenerating index.bin
+            binary.close()
+            return None
+        return binary
+
+    def read_ownership(self) -> dict:
+        return self.read_json(OWNERSHIP_PATH, _empty_ownership())
+
+    def write_ownership(self, ownership: dict, message: str) -> None:
+        self.write_json(OWNERSHIP_PATH, ownership, message)
+
+
+def _graphql(client: "httpx.Client", query: str, variables: dict) -> dict:
+    """Run a GraphQL query and return its data, raising on any reported error."""
+    response = client.post(http.graphql_url(), json={"query": query, "variables": variables})
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("errors"):
+        messages = "; ".join(error.get("message", "unknown error") for error in payload["errors"])
+        raise RuntimeError(f"GitHub GraphQL query failed: {messages}")
+    return payload["data"]
+
+
+def _release_from_graphql(node: dict) -> dict:
+    """Convert a GraphQL release into the REST shape the rest of the CLI reads."""
+    return {
+        "id": node["databaseId"],
+        "tag_name": node["tagName"],
+        "name": node["name"],
+        "assets": [
+            {
+                "name": asset["name"],
+                "size": asset["size"],
+                "download_count": asset["downloadCount"],
+                # Public download URLs serve the raw bytes to read_asset/download_asset
+                "url": asset["downloadUrl"],
+                "browser_download_url": asset["downloadUrl"],
+            }
+            for asset in node["releaseAssets"]["nodes"]
+        ],
+    }
+
+
+class GitHubStorage(RegistryStorage):
+    """Storage backed by the GitHub contents and releases REST APIs."""
+
+    def read_file(self, path: str) -> Optional[bytes]:
+        _, content, _ = self.read_file_if_changed(path, None)
+        return content
+
+    def _file_sha(self, path: str) -> Optional[str]:
+        url = f"{http.api_base()}/contents/{path}"
+        with http.get_client() as client:
+            response = client.get(url)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()["sha"]
+
+    def write_file(self, path: str, content: bytes, message: str, expected: Optional[str] = None) -> None:
+        data = {
+            "message": message,
+            "content": base64.b64encode(content).decode("ascii"),
+        }
+        # GitHub rejects the update with 409 unless sha is the file's current blob
+        sha = expected if expected is not None else self._file_sha(path)
+        if sha:
+            data["sha"] = sha
+
+        url = f"{http.api_base()}/contents/{path}"
+        with http.get_client() as client:
+            response = client.put(url, json=data)
+            if response.status_code == 409:
+                raise WriteConflict(f"{path} changed since it was read")
+            response.raise_for_status()
+
+    def get_release(self, tag: str) -> dict:
+        url = f"{http.api_base()}/releases/tags/{tag}"
+        with http.get_client() as client:
+            response = client.get(url)
+            if response.status_code == 404:
+                raise FileNotFoundError(f"Release not found: {tag}")
+            response.raise_for_status()
+            return response.json()
+
+    def get_releases(self, tags: list[str]) -> dict[str, Optional[dict]]:
+        # One REST call is as cheap as one query, and keeps API asset URLs
+        if len(tags) <= 1:
+            return super().get_releases(tags)
+
+        owner, repo = http.get_github_repo().split("/", 1)
+        releases: dict[str, Optional[dict]] = {}
+        with http.get_client() as client:
+            for start in range(0, len(tags), GRAPHQL_BATCH):
+                batch = tags[start:start + GRAPHQL_BATCH]
+                params = "".join(f", $t{i}: String!" for i in range(len(batch)))
+                aliases = "".join(f"    r{i}: release(tagName: $t{i}) {{ ...release }}\n" for i in range(len(batch)))
+                query = (
+                    f"query($owner: String!, $repo: String!{params}) {{\n"
+                    f"  repository(owner: $owner, name: $repo) {{\n    isPrivate\n{aliases}  }}\n}}\n"
+                    + _RELEASE_FIELDS
+                )
+                variables = {"owner": owner, "repo": repo, **{f"t{i}": tag for i, tag in enumerate(batch)}}
+                repository = _graphql(client, query, variables)["repository"]
+                if repository is None:
+                    raise FileNotFoundError(f"Repository not found: {owner}/{repo}")
+                if repository["isPrivate"]:
+                    # downloadUrl only works with a browser session on private
+                    # repositories, so assets must come from the REST API
+                    return super().get_releases(tags)
+                for i, tag in enumerate(batch):
+                    node = repository[f"r{i}"]
+                    releases[tag] = _release_from_graphql(node) if node else None
+        return releases
+
+    def read_asset(self, asset: dict) -> bytes:
+        with http.get_client() as client:
+            response = client.get(asset["url"], headers={"Accept": "application/octet-stream"})
+            response.raise_for_status()
+            return response.content
+
+    def download_asset(self, asset: dict, dest: Path) -> None:
+        with http.get_client(timeout=120.0) as client:
+            with client.stream("GET", asset["url"], headers={"Accept": "application/octet-stream"}) as response:
+                response.raise_for_status()
+                with open(dest, "wb") as f:
+                    for chunk in response.iter_bytes(chunk_size=8192):
+                        f.write(chunk)
+
+    def create_release(self, tag: str, title: str, body: str, assets: dict[str, bytes]) -> dict:
+        url = f"{http.api_base()}/releases"
+        with http.get_client(timeout=120.0) as client:
+            response = client.post(url, json={"tag_name": tag, "name": title, "body": body})
+            response.raise_for_status()
+            release = response.json()
+
+            upload_url = release["upload_url"].split("{")[0]
+            for asset_name, content in assets.items():
+                response = client.post(
+                    upload_url,
+                    params={"name": asset_name},
+                    headers={"Content-Type": "application/octet-stream"},
+                    content=content,
+                )
+                response.raise_for_status()
+        return release
+
+    def delete_release(self, tag: str) -> None:
+        release = self.get_release(tag)
+        with http.get_client() as client:
+            response = client.delete(f"{http.api_base()}/releases/{release['id']}")
+            response.raise_for_status()
+
+            response = client.delete(f"{http.api_base()}/git/refs/tags/{tag}")
+            # Ignore 404 if tag doesn't exist
+            if response.status_code != 404:
+                response.raise_for_status()
+
+    def list_releases(self, prefix: str = "") -> list[dict]:
+        matched = []
+        url = f"{http.api_base()}/releases"
+        with http.get_client() as client:
+            page = 1
+            while True:
+                response = client.get(url, params={"per_page": 100, "page": page})
+                response.raise_for_status()
+                releases = response.json()
+                matched.extend(r for r in releases if r["tag_name"].startswith(prefix))
+                if len(releases) < 100:
+                    break
+                page += 1
+        return matched
+
+    def read_file_if_changed(self, path: str, etag: Optional[str]) -> tuple[bool, Optional[bytes], Optional[str]]:
+        # 304 responses don't count against the REST API rate limit. The raw
+        # media type also covers files over the 1 MB limit of the JSON form.
+        url = f"{http.api_base()}/contents/{path}"
+        headers = {"Accept": "application/vnd.github.raw"}
+        if etag:
+            headers["If-None-Match"] = etag
+        with http.get_client(timeout=120.0) as client:
+            response = client.get(url, headers=headers)
+            if response.status_code == 304:
+                return False, None, etag
+            if response.status_code == 404:
+                return True, None, None
+            response.raise_for_status()
+            return True, response.content, response.headers.get("ETag")
+
+    def cache_key(self) -> Optional[str]:
+        return f"{http.get_github_api_url()}/{http.get_github_repo()}"
+
+    def index_source_id(self) -> Optional[str]:
+        # A directory listing carries each file's blob SHA but not its content
+        directory = INDEX_PATH.rsplit("/", 1)[0]
+        with http.get_client() as client:
+            response = client.get(f"{http.api_base()}/contents/{directory}")
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            for entry in response.json():
+                if entry.get("path") == INDEX_PATH:
+                    return entry.get("sha")
+        return None
+
+    def current_user(self) -> str:
+        url = f"{http.get_github_api_url()}/user"
+        with http.get_client() as client:
+            response = client.get(url)
+            response.raise_for_status()
+            return response.json()["login"]
+
+
+class LocalStorage(RegistryStorage):
+    """Storage backed by a plain directory, for offline use, tests and mirrors."""
+
+    direct_writes = True
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, relative: str) -> Path:
+        path = (self.root / relative).resolve()
+        path.relative_to(self.root.resolve())  # ValueError on traversal
+        return path
+
+    def _release_dir(self, tag: str) -> Path:
+        return self._path(f"releases/{tag}")
+
+    def read_file(self, path: str) -> Optional[bytes]:
+        try:
+            return self._path(path).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write_file(self, path: str, content: bytes, message: str, expected: Optional[str] = None) -> None:
+        target = self._path(path)
+        if expected is not None:
+            current = self.read_file(path)
+            if current is None or binindex.source_id(current) != expected:
+                raise WriteConflict(f"{path} changed since it was read")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, target)
+
+    def get_release(self, tag: str) -> dict:
+        release_dir = self._release_dir(tag)
+        if not release_dir.is_dir():
+            raise FileNotFoundError(f"Release not found: {tag}")
+
+        assets = []
+        for item in sorted(release_dir.iterdir()):
+            # Dotfiles are in-flight downloads from a mirror sync
+            if item.is_file() and not item.name.startswith("."):
+                assets.append({
+                    "name": item.name,
+                    "size": item.stat().st_size,
+                    "url": str(item),
+                    "browser_download_url": item.as_uri(),
+                })
+        return {"tag_name": tag, "assets": assets}
+
+    def read_asset(self, asset: dict) -> bytes:
+        return Path(asset["url"]).read_bytes()
+
+    def download_asset(self, asset: dict, dest: Path) -> None:
+        shutil.copyfile(asset["url"], dest)
+
+    def create_release(self, tag: str, title: str, body: str, assets: dict[str, bytes]) -> dict:
+        release_dir = self._release_dir(tag)
+        if release_dir.exists():
+            raise FileExistsError(f"Release already exists: {tag}")
+        release_dir.mkdir(parents=True)
+        for asset_name, content in assets.items():
+            (release_dir / asset_name).write_bytes(content)
+        return self.get_release(tag)
+
+    def delete_release(self, tag: str) -> None:
+        release_dir = self._release_dir(tag)
+        if not release_dir.is_dir():
+            raise FileNotFoundError(f"Release not found: {tag}")
+        shutil.rmtree(release_dir)
+
+        # Prune now-empty ara/<namespace>/<name> directories
+        releases_root = (self.root / "releases").resolve()
+        parent = release_dir.parent
+        while parent != releases_root and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    def list_releases(self, prefix: str = "") -> list[dict]:
+        releases_root = self.root / "releases"
+        if not releases_root.is_dir():
+            return []
+        tags = []
+        for asset in releases_root.rglob("ara.json"):
+            tag = asset.parent.relative_to(releases_root).as_posix()
+            if tag.startswith(prefix):
+                tags.append(tag)
+        return [self.get_release(tag) for tag in sorted(tags)]
+
+    def open_binary_index(self) -> Optional[binindex.BinaryIndex]:
+        # write_index writes index.bin after index.json, so an older index.bin is stale
+        try:
+            if self._path(BINARY_INDEX_PATH).stat().st_mtime_ns < self._path(INDEX_PATH).stat().st_mtime_ns:
+                return None
+        except FileNotFoundError:
+            return None
+        return binindex.BinaryIndex.open(self._path(BINARY_INDEX_PATH))
+
+    def current_user(self) -> str:
+        return os.getenv("ARA_USERNAME") or getpass.getuser()
+
+
+class HttpMirrorStorage(RegistryStorage):
+    """
+    Read-only storage for a local-layout registry served over plain HTTP.
+
+    Static file servers cannot list directories, so releases are discovered
+    from the index and assets are probed by their well-known names.
+    """
+
+    read_only = True
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def _url(self, relative: str) -> str:
+        return f"{self.base_url}/{relative}"
+
+    def read_file(self, path: str) -> Optional[bytes]:
+        with http.get_client() as client:
+            response = client.get(self._url(path))
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.content
+
+    def read_file_if_changed(self, path: str, etag: Optional[str]) -> tuple[bool, Optional[bytes], Optional[str]]:
+        with http.get_client() as client:
+            response = client.get(self._url(path), headers={"If-None-Match": etag} if etag else None)
+            if response.status_code == 304:
+                return False, None, etag
+            if response.status_code == 404:
+                return True, None, None
+            response.raise_for_status()
+            return True, response.content, response.headers.get("ETag")
+
+    def cache_key(self) -> Optional[str]:
+        # Mirrors serve index.bin only while it matches their index.json
+        # (`ara mirror sync` and the registry API both check), so it is trusted
+        return self.base_url
+
+    def get_release(self, tag: str) -> dict:
+        assets = []
+        names = (DICTIONARY_ASSET,) if tag.startswith(DICTIONARY_TAG_PREFIX) else RELEASE_ASSETS
+        with http.get_client() as client:
+            for asset_name in names:
+                url = self._url(f"releases/{tag}/{asset_name}")
+                response = client.head(url)
+                if response.status_code == 404:
+                    continue
+                response.raise_for_status()
+                assets.append({
+                    "name": asset_name,
+                    "size": int(response.headers.get("Content-Length", 0)),
+                    "etag": response.headers.get("ETag"),
+                    "url": url,
+                    "browser_download_url": url,
+                })
+        if not assets:
+            raise FileNotFoundError(f"Release not found: {tag}")
+        return {"tag_name": tag, "assets": assets}
+
+    def read_asset(self, asset: dict) -> bytes:
+        with http.get_client() as client:
+            response = client.get(asset["url"])
+            response.raise_for_status()
+            return response.content
+
+    def download_asset(self, asset: dict, dest: Path) -> None:
+        with http.get_client(timeout=120.0) as client:
+            with client.stream("GET", asset["url"]) as response:
+                response.raise_for_status()
+                with open(dest, "wb") as f:
+                    for chunk in response.iter_bytes(chunk_size=8192):
+                        f.write(chunk)
+
+    def list_releases(self, prefix: str = "") -> list[dict]:
+        releases = []
+        for pkg in self.read_index():
+            for version in pkg.get("versions", []):
+                tag = f"ara/{pkg['namespace']}/{pkg['name']}/v{version}"
+                if tag.startswith(prefix):
+                    releases.append(self.get_release(tag))
+        return releases
+
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError(f"Registry mirror at {self.base_url} is read-only")
+
+    write_file = create_release = delete_release = current_user = _read_only
+
+
+def get_storage() -> RegistryStorage:
+    """
+    Get the storage backend selected by the environment.
+
+    ARA_REGISTRY_BACKEND chooses ``github`` (default), ``local`` or ``http``.
+    Setting ARA_REGISTRY_PATH alone implies ``local`` and ARA_REGISTRY_URL
+    alone implies ``http`` (a read-only mirror).
+    """
+    backend = os.getenv("ARA_REGISTRY_BACKEND")
+    local_root = os.getenv("ARA_REGISTRY_PATH")
+    mirror_url = os.getenv("ARA_REGISTRY_URL")
+
+    if backend is None:
+        backend = "local" if local_root else "http" if mirror_url else "github"
+
+    if backend == "github":
+        return GitHubStorage()
+    if backend == "local":
+        if not local_root:
+            raise ValueError("ARA_REGISTRY_PATH environment variable is required for the local backend")
+        return LocalStorage(Path(local_root).expanduser())
+    if backend == "http":
+        if not mirror_url:
+            raise ValueError("ARA_REGISTRY_URL environment variable is required for the http backend")
+        return HttpMirrorStorage(mirror_url)
+    raise ValueError(f"Unknown ARA_REGISTRY_BACKEND: {backend} (expected 'github', 'local' or 'http')")
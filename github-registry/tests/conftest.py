@@ -0,0 +1,29 @@
+"""Shared fixtures: a local registry directory with isolated caches."""
+
+from pathlib import Path
+
+import pytest
+
+from ara_github import storage
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep every local cache (index.bin, dictionaries, archives, external abilities) inside tmp_path."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("ARA_INDEX_CACHE", str(cache / "index"))
+    monkeypatch.setenv("ARA_DICT_CACHE", str(cache / "dictionaries"))
+    monkeypatch.setenv("ARA_ARCHIVE_CACHE", str(cache / "archives"))
+    monkeypatch.setenv("ARA_EXTERNALS_CACHE", str(cache / "externals"))
+    return cache
+
+
+@pytest.fixture
+def registry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> storage.LocalStorage:
+    """An empty local registry, selected as the backend the CLI and client use."""
+    root = tmp_path / "registry"
+    root.mkdir()
+    monkeypatch.setenv("ARA_REGISTRY_BACKEND", "local")
+    monkeypatch.setenv("ARA_REGISTRY_PATH", str(root))
+    monkeypatch.setenv("ARA_USERNAME", "tester")
+    return storage.LocalStorage(root)
@@ -0,0 +1,77 @@
+"""The memory-mapped binary index (ara_github/binindex.py)."""
+
+import os
+
+import pytest
+
+from ara_github import binindex, fastjson, storage
+
+INDEX = [
+    {"namespace": "zeta", "name": "tool", "latest_version": "1.0.0", "versions": ["1.0.0"]},
+    {"namespace": "acme", "name": "agent", "description": "Ünïcode", "latest_version": "2.1.0", "versions": ["2.1.0", "2.0.0"]},
+    {"namespace": "acme", "name": "agent-kit", "latest_version": "0.1.0", "versions": ["0.1.0"]},
+]
+
+
+def test_source_id_is_git_blob_sha():
+    # git hash-object of "hello\n"
+    assert binindex.source_id(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_build_and_read(tmp_path):
+    content = fastjson.dumps(INDEX, indent=True)
+    path = tmp_path / "index.bin"
+    path.write_bytes(binindex.build(INDEX, binindex.source_id(content)))
+
+    with binindex.BinaryIndex.open(path) as index:
+        assert len(index) == 3
+        assert index.source == binindex.source_id(content)
+        assert list(index.names()) == ["acme/agent", "acme/agent-kit", "zeta/tool"]
+        for entry in INDEX:
+            assert index.get(entry["namespace"], entry["name"]) == entry
+        assert index.get("acme", "missing") is None
+        assert ("zeta", "tool") in index
+        assert ("zeta", "tools") not in index
+
+
+def test_empty_index():
+    index = binindex.BinaryIndex(binindex.build([], "00" * 20))
+    assert len(index) == 0
+    assert index.get("acme", "agent") is None
+
+
+@pytest.mark.parametrize("data", [b"", b"ARAIDX", b"NOTANIDX" + bytes(40)])
+def test_rejects_invalid_data(data: bytes):
+    with pytest.raises(ValueError):
+        binindex.BinaryIndex(data)
+
+
+def test_rejects_truncated_file(tmp_path):
+    path = tmp_path / "index.bin"
+    path.write_bytes(binindex.build(INDEX, "00" * 20)[:binindex.HEADER.size + 4])
+    with pytest.raises(ValueError):
+        binindex.BinaryIndex.open(path)
+
+
+def test_local_storage_writes_matching_binary_index(tmp_path):
+    store = storage.LocalStorage(tmp_path)
+    store.write_index(INDEX, "test")
+    with store.open_binary_index() as index:
+        assert index.source == binindex.source_id(store.read_file(storage.INDEX_PATH))
+        assert index.get("acme", "agent")["versions"] == ["2.1.0", "2.0.0"]
+
+
+def test_local_storage_ignores_stale_binary_index(tmp_path):
+    store = storage.LocalStorage(tmp_path)
+    store.write_index(INDEX, "test")
+    # index.json rewritten by something other than write_index, e.g. a workflow
+    index_json = tmp_path / storage.INDEX_PATH
+    index_json.write_bytes(fastjson.dumps(INDEX[:1], indent=True))
+    older = index_json.stat().st_mtime_ns - 1_000_000_000
+    os.utime(tmp_path / storage.BINARY_INDEX_PATH, ns=(older, older))
+    assert store.open_binary_index() is None
+
+    assert store.rebuild_binary_index() is True
+    assert store.rebuild_binary_index() is False
+    with store.open_binary_index() as index:
+        assert list(index.names()) == ["zeta/tool"]
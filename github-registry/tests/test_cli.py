@@ -0,0 +1,38 @@
+"""Registry read errors in the read-only commands (ara_github/cli.py)."""
+
+import pytest
+from click.testing import CliRunner
+
+from ara_github import cli, http, storage
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """A GitHub registry whose API cannot be reached, with retries that do not sleep."""
+    monkeypatch.setenv("ARA_REGISTRY_BACKEND", "github")
+    monkeypatch.setenv("GITHUB_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("GITHUB_REPO", "acme/registry")
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    monkeypatch.setattr(http, "_scheduler", http.Scheduler(sleep=lambda seconds: None))
+
+
+@pytest.mark.parametrize("args", [["search", "agent"], ["info", "acme/agent"], ["install", "acme/agent"]])
+def test_corrupt_index(registry, args):
+    registry.write_file(storage.INDEX_PATH, b"[{not json", "corrupt")
+    result = CliRunner().invoke(cli.main, args)
+    assert result.exit_code == 1
+    assert result.output.startswith("Error: Cannot read the registry index: ")
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+
+@pytest.mark.parametrize("args", [["search", "agent"], ["info", "acme/agent"]])
+def test_offline(offline, args):
+    result = CliRunner().invoke(cli.main, args)
+    assert result.exit_code == 1
+    assert result.output.startswith("Error: Cannot read the registry index: ")
+
+
+def test_missing_index_is_empty(registry):
+    result = CliRunner().invoke(cli.main, ["search", "agent"])
+    assert result.exit_code == 0
+    assert result.output == "No packages found.\n"
@@ -0,0 +1,142 @@
+"""Deltas between package versions (ara_github/deltas.py) and patch installs."""
+
+import json
+
+import pytest
+import zstandard as zstd
+
+from ara_github import archives, client, deltas, dictionaries, packing, storage
+
+VERSIONS = ("1.0.0", "1.1.0")
+
+
+class CachedLocalStorage(storage.LocalStorage):
+    """A local registry that, like a remote one, uses the local archive store."""
+
+    def cache_key(self):
+        return f"test:{self.root}"
+
+
+def _tar(tmp_path, version: str, prompt: str = "") -> bytes:
+    root = tmp_path / f"src-{version}{prompt}"
+    (root / "docs").mkdir(parents=True)
+    (root / "ara.json").write_text(json.dumps({"name": "acme/agent", "version": version}))
+    for i in range(50):
+        (root / "docs" / f"page{i}.md").write_text(f"# Page {i}\n\n" + "Unchanged reference text. " * 40)
+    (root / "prompt.md").write_text(f"You are agent version {version}.\n{prompt}")
+    return packing.build_tar(packing.scan(root))
+
+
+@pytest.fixture
+def tars(tmp_path) -> dict[str, bytes]:
+    return {version: _tar(tmp_path, version) for version in VERSIONS}
+
+
+def test_create_and_apply(tars):
+    delta = deltas.create(tars["1.0.0"], tars["1.1.0"], "1.0.0")
+    assert len(delta) < len(dictionaries.compress(tars["1.1.0"])[0]) / 4
+    header, _ = deltas.read_header(delta)
+    assert header["base"] == "1.0.0"
+    assert deltas.apply(delta, tars["1.0.0"]) == tars["1.1.0"]
+
+
+def test_apply_rejects_other_base(tars):
+    delta = deltas.create(tars["1.0.0"], tars["1.1.0"], "1.0.0")
+    with pytest.raises(ValueError, match="does not match"):
+        deltas.apply(delta, tars["1.1.0"])
+
+
+@pytest.mark.parametrize("data", [b"", b"\x28\xb5\x2f\xfd" + bytes(8), b"\x50\x2a\x4d\x18\x04\x00\x00\x00nope"])
+def test_read_header_rejects_malformed(data: bytes):
+    with pytest.raises(ValueError):
+        deltas.read_header(data)
+
+
+def test_previous_version():
+    published = ["2.0.0", "1.10.0", "1.9.0", "2.0.0-rc.1", "not-a-version"]
+    assert deltas.previous_version("2.0.0", published) == "2.0.0-rc.1"
+    assert deltas.previous_version("1.10.0", published) == "1.9.0"
+    assert deltas.previous_version("1.0.0", published) is None
+
+
+def _publish(registry, tmp_path, tars, delta: bool = True) -> dict[str, dict]:
+    results = {}
+    for version in VERSIONS:
+        archive = tmp_path / f"{version}.tar.zst"
+        archive.write_bytes(dictionaries.compress(tars[version])[0])
+        results[version] = client.publish("acme", "agent", version, {"version": version}, archive, "tester", delta)
+    return results
+
+
+def test_publish_with_delta(registry, tmp_path, tars):
+    results = _publish(registry, tmp_path, tars)
+    assert "delta_base" not in results["1.0.0"]
+    assert results["1.1.0"]["delta_base"] == "1.0.0"
+
+    release = registry.get_release("ara/acme/agent/v1.1.0")
+    asset = next(a for a in release["assets"] if a["name"] == storage.DELTA_ASSET)
+    assert deltas.apply(registry.read_asset(asset), tars["1.0.0"]) == tars["1.1.0"]
+
+
+def test_install_patches_from_stored_version(registry, tmp_path, tars, monkeypatch):
+    _publish(registry, tmp_path, tars)
+    cached = CachedLocalStorage(registry.root)
+    monkeypatch.setattr(storage, "get_storage", lambda: cached)
+    releases = client.find_releases([("acme", "agent", v) for v in VERSIONS])
+    dest = tmp_path / "download.tar.zst"
+
+    def fetch(version: str) -> str:
+        return client.fetch_archive("acme", "agent", version, releases[("acme", "agent", version)], dest)
+
+    assert fetch("1.0.0") == "full"
+    assert fetch("1.1.0") == "delta"
+    assert zstd.ZstdDecompressor().decompress(dest.read_bytes()) == tars["1.1.0"]
+    assert fetch("1.1.0") == "stored"
+    assert archives.versions(cached, "acme", "agent") == ["1.1.0", "1.0.0"]
+
+
+def test_install_falls_back_to_full_archive(registry, tmp_path, tars, monkeypatch):
+    _publish(registry, tmp_path, tars)
+    cached = CachedLocalStorage(registry.root)
+    monkeypatch.setattr(storage, "get_storage", lambda: cached)
+    releases = client.find_releases([("acme", "agent", v) for v in VERSIONS])
+    # A damaged copy of the base version in the store
+    archives.save(cached, "acme", "agent", "1.0.0", dictionaries.compress(b"something else")[0])
+
+    dest = tmp_path / "download.tar.zst"
+    assert client.fetch_archive("acme", "agent", "1.1.0", releases[("acme", "agent", "1.1.0")], dest) == "full"
+    assert zstd.ZstdDecompressor().decompress(dest.read_bytes()) == tars["1.1.0"]
+
+
+def test_republished_version_is_downloaded_again(registry, tmp_path, tars, monkeypatch):
+    _publish(registry, tmp_path, tars, delta=False)
+    cached = CachedLocalStorage(registry.root)
+    monkeypatch.setattr(storage, "get_storage", lambda: cached)
+    dest = tmp_path / "download.tar.zst"
+    release = client.find_releases([("acme", "agent", "1.1.0")])[("acme", "agent", "1.1.0")]
+    assert client.fetch_archive("acme", "agent", "1.1.0", release, dest) == "full"
+    assert client.fetch_archive("acme", "agent", "1.1.0", release, dest) == "stored"
+
+    # Unpublished, then published again with other content
+    client.unpublish("acme", "agent", "1.1.0", "tester")
+    republished = _tar(tmp_path, "1.1.0", "Now with more instructions.\n")
+    archive = tmp_path / "republished.tar.zst"
+    archive.write_bytes(dictionaries.compress(republished)[0])
+    client.publish("acme", "agent", "1.1.0", {"version": "1.1.0"}, archive, "tester", False)
+
+    release = client.find_releases([("acme", "agent", "1.1.0")])[("acme", "agent", "1.1.0")]
+    assert client.fetch_archive("acme", "agent", "1.1.0", release, dest) == "full"
+    assert zstd.ZstdDecompressor().decompress(dest.read_bytes()) == republished
+    assert client.fetch_archive("acme", "agent", "1.1.0", release, dest) == "stored"
+
+
+def test_store_checks_the_release(registry, tmp_path):
+    cached = CachedLocalStorage(registry.root)
+    release = {"id": 7, "assets": [{"name": "package.tar.zst", "size": 5}]}
+    archives.save(cached, "acme", "agent", "1.0.0", b"bytes", release)
+    assert archives.load(cached, "acme", "agent", "1.0.0", release) == b"bytes"
+    # A delta's base is checked by its digest instead, so it loads without a release
+    assert archives.load(cached, "acme", "agent", "1.0.0") == b"bytes"
+
+    assert archives.load(cached, "acme", "agent", "1.0.0", {**release, "id": 8}) is None
+    assert archives.versions(cached, "acme", "agent") == []
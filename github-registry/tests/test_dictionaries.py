@@ -0,0 +1,97 @@
+"""Shared zstd dictionaries (ara_github/dictionaries.py)."""
+
+import json
+import random
+
+import pytest
+import zstandard as zstd
+
+from ara_github import dictionaries, packing, storage
+
+
+def _package_tar(tmp_path, i: int) -> bytes:
+    rng = random.Random(i)
+    root = tmp_path / f"pkg{i}"
+    root.mkdir()
+    (root / "ara.json").write_text(json.dumps({
+        "name": f"acme/agent-{i}",
+        "version": f"1.{i}.0",
+        "description": f"Agent number {i} for {rng.choice(['docs', 'code review', 'testing'])}",
+        "type": "kiro-agent",
+        "tags": ["demo", rng.choice(["python", "rust", "go"])],
+    }, indent=2))
+    (root / "prompt.md").write_text(
+        "# Instructions\n\nYou are a helpful agent. Follow the repository's conventions, "
+        "run the tests before finishing and explain every change you make.\n\n"
+        + "".join(f"- Step {n}: {rng.choice(['read', 'edit', 'review', 'run'])} the files.\n" for n in range(8))
+    )
+    return packing.build_tar(packing.scan(root))
+
+
+@pytest.fixture
+def corpus(tmp_path) -> list[bytes]:
+    return [_package_tar(tmp_path, i) for i in range(40)]
+
+
+@pytest.fixture
+def dictionary(corpus) -> zstd.ZstdCompressionDict:
+    return dictionaries.train(corpus, 4096)
+
+
+def test_train_derives_id_from_corpus(corpus, dictionary):
+    assert dictionary.dict_id() == dictionaries.derive_id(corpus)
+    assert dictionaries._MIN_ID <= dictionary.dict_id() <= dictionaries._MAX_ID
+    assert dictionaries.derive_id(corpus[1:]) != dictionary.dict_id()
+
+
+def test_train_rejects_tiny_corpus():
+    with pytest.raises(ValueError):
+        dictionaries.train([b"x"], 64 * 1024)
+
+
+def test_compress_round_trip_with_dictionary(registry, corpus, dictionary):
+    dictionaries.publish(registry, dictionary, len(corpus))
+    data = corpus[0]
+    plain, plain_id = dictionaries.compress(data)
+    primed, dict_id = dictionaries.compress(data, dictionary)
+
+    assert plain_id is None
+    assert dict_id == dictionary.dict_id()
+    assert len(primed) < len(plain)
+    assert dictionaries.frame_dictionary_id(primed) == dict_id
+    assert dictionaries.decompressor(primed, registry).decompress(primed) == data
+    assert dictionaries.decompressor(plain, registry).decompress(plain) == data
+    # Fixed parameters: the same input always compresses to the same bytes
+    assert dictionaries.compress(data, dictionary) == (primed, dict_id)
+
+
+def test_publish_lists_and_activates(registry, corpus, dictionary):
+    entry = dictionaries.publish(registry, dictionary, len(corpus), make_current=False)
+    config = dictionaries.load_config(registry)
+    assert config["current"] is None
+    assert config["dictionaries"][str(dictionary.dict_id())] == entry
+    assert dictionaries.current(registry) is None
+
+    release = registry.get_release(dictionaries.release_tag(dictionary.dict_id()))
+    assert [a["name"] for a in release["assets"]] == [storage.DICTIONARY_ASSET]
+
+    other = dictionaries.train(list(reversed(corpus))[1:], 4096)
+    dictionaries.publish(registry, other, len(corpus) - 1)
+    assert dictionaries.current(registry).dict_id() == other.dict_id()
+    assert len(dictionaries.load_config(registry)["dictionaries"]) == 2
+
+
+def test_missing_dictionary(registry, corpus, dictionary):
+    compressed, _ = dictionaries.compress(corpus[0], dictionary)
+    with pytest.raises(FileNotFoundError):
+        dictionaries.decompressor(compressed, registry)
+
+
+def test_mislabelled_dictionary(registry, corpus, dictionary):
+    # A release whose asset is a different dictionary than its tag names
+    other = dictionaries.train(corpus[1:], 4096)
+    registry.create_release(
+        dictionaries.release_tag(dictionary.dict_id()), "", "", {storage.DICTIONARY_ASSET: other.as_bytes()}
+    )
+    with pytest.raises(ValueError):
+        dictionaries.get(dictionary.dict_id(), registry)
@@ -0,0 +1,142 @@
+"""Download counts harvested from release assets (ara_github/downloads.py)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from ara_github import downloads, storage
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fakegithub import FakeGitHub, INDEX_PATH  # noqa: E402
+
+
+class CountingStorage(storage.LocalStorage):
+    """A local registry whose assets report download counts, as GitHub's do."""
+
+    def __init__(self, root: Path, counts: dict[str, int]):
+        super().__init__(root)
+        self.counts = counts  # "<tag>/<asset>" -> count
+        self.writes = 0
+
+    def get_release(self, tag: str) -> dict:
+        release = super().get_release(tag)
+        for asset in release["assets"]:
+            key = f"{tag}/{asset['name']}"
+            if key in self.counts:
+                asset["download_count"] = self.counts[key]
+        return release
+
+    def write_file(self, path: str, content: bytes, message: str, expected=None) -> None:
+        self.writes += 1
+        super().write_file(path, content, message, expected)
+
+
+def _package(namespace: str, name: str, versions: list[str], **fields) -> dict:
+    return {"namespace": namespace, "name": name, "versions": versions, "latest_version": versions[0], **fields}
+
+
+@pytest.fixture
+def store(registry) -> CountingStorage:
+    store = CountingStorage(registry.root, {
+        "ara/acme/agent/v1.0.0/package.tar.zst": 10,
+        "ara/acme/agent/v1.0.0/ara.json": 99,  # manifest reads are not installs
+        "ara/acme/agent/v1.1.0/package.tar.zst": 3,
+        "ara/acme/agent/v1.1.0/package.patch.zst": 4,
+        "ara/acme/agent/v0.9.0/package.tar.zst": 7,  # released, then unpublished
+        "ara/beta/tool/v2.0.0/package.tar.zst": 5,
+    })
+    for tag in ("ara/acme/agent/v1.0.0", "ara/acme/agent/v1.1.0", "ara/acme/agent/v0.9.0", "ara/beta/tool/v2.0.0"):
+        store.create_release(tag, tag, "", {"package.tar.zst": b"archive", "ara.json": b"{}"})
+    store.create_release("ara/acme/agent/v1.1.0-extra", "", "", {})
+    store._path("releases/ara/acme/agent/v1.1.0/package.patch.zst").write_bytes(b"delta")
+    store.write_index([
+        _package("acme", "agent", ["1.1.0", "1.0.0"]),
+        _package("beta", "tool", ["2.0.0"], total_downloads=5, downloads_by_version={"2.0.0": 5}),
+        _package("gamma", "new", ["1.0.0"]),
+    ], "seed")
+    store.writes = 0
+    return store
+
+
+def test_harvest(store):
+    assert downloads.harvest(store) == {
+        ("acme", "agent"): {"1.0.0": 10, "1.1.0": 7, "0.9.0": 7},
+        ("beta", "tool"): {"2.0.0": 5},
+    }
+
+
+def test_harvest_skips_backends_without_counts(registry):
+    registry.create_release("ara/acme/agent/v1.0.0", "", "", {"package.tar.zst": b"archive", "ara.json": b"{}"})
+    assert downloads.harvest(registry) == {}
+
+
+def test_sync_merges_published_versions(store):
+    assert downloads.sync(store) == 1
+    acme, beta, gamma = store.read_index()
+    assert acme["downloads_by_version"] == {"1.1.0": 7, "1.0.0": 10}
+    assert acme["total_downloads"] == 17
+    assert beta == _package("beta", "tool", ["2.0.0"], total_downloads=5, downloads_by_version={"2.0.0": 5})
+    assert "total_downloads" not in gamma
+    assert store.writes == 2  # index.json and index.bin, once
+
+    # Nothing changed since: no write at all
+    assert downloads.sync(store) == 0
+    assert store.writes == 2
+
+
+def test_dry_run(store):
+    before = store.read_file(storage.INDEX_PATH)
+    assert downloads.sync(store, dry_run=True) == 1
+    assert store.read_file(storage.INDEX_PATH) == before
+    assert store.writes == 0
+
+
+def test_merge_leaves_malformed_entries(store):
+    index = store.read_index()
+    malformed = [{"name": "no-namespace", "versions": ["1.0.0"]}, "junk", {"namespace": "acme", "name": None}]
+    store.write_index(malformed[:1] + index + malformed[1:], "malformed")
+    assert downloads.sync(store) == 1
+    written = store.read_index()
+    assert written[:1] == malformed[:1] and written[-2:] == malformed[1:]
+    assert written[1]["total_downloads"] == 17
+
+
+def test_sync_rereads_after_a_concurrent_publish(store, monkeypatch):
+    read = store.read_index_for_update
+    calls = []
+
+    def racing_read():
+        result = read()
+        if not calls:
+            # A publish lands between the cron's read and its write
+            index, _ = read()
+            store.write_index(index + [_package("delta", "late", ["1.0.0"])], "publish")
+        calls.append(result)
+        return result
+
+    monkeypatch.setattr(store, "read_index_for_update", racing_read)
+    assert downloads.sync(store) == 1
+    assert len(calls) == 2
+    names = [p["name"] for p in store.read_index()]
+    assert names == ["agent", "tool", "new", "late"]
+    assert store.read_index()[0]["total_downloads"] == 17
+
+
+def test_github_write_is_conditional(monkeypatch):
+    with FakeGitHub(packages=2) as fake:
+        monkeypatch.setenv("GITHUB_API_URL", fake.api_url)
+        monkeypatch.setenv("GITHUB_REPO", "bench/registry")
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        github = storage.GitHubStorage()
+        index, expected = github.read_index_for_update()
+
+        fake.files[INDEX_PATH] += b"\n"  # someone else's commit
+        with pytest.raises(storage.WriteConflict):
+            github.write_index(index, "stale", expected)
+        assert fake.files[INDEX_PATH].endswith(b"\n")
+
+        index, expected = github.read_index_for_update()
+        github.write_index(index[:1], "fresh", expected)
+        assert len(github.read_index()) == 1
@@ -0,0 +1,164 @@
+"""External registry backends (ara_github/external.py)."""
+
+import hashlib
+import io
+import json
+import subprocess
+import tarfile
+
+import httpx
+import pytest
+
+from ara_github import external
+
+
+def _tarball(files: dict[str, bytes]) -> bytes:
+    out = io.BytesIO()
+    with tarfile.open(fileobj=out, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return out.getvalue()
+
+
+@pytest.fixture
+def externals(tmp_path, monkeypatch):
+    """Write an externals.json allowlist and point the CLI at it."""
+    path = tmp_path / "externals.json"
+    monkeypatch.setenv("ARA_EXTERNALS_CONFIG", str(path))
+
+    def configure(config: dict) -> None:
+        path.write_text(json.dumps(config))
+
+    return configure
+
+
+@pytest.fixture
+def served(monkeypatch) -> dict:
+    """Answer the backends' HTTP requests from a dict of URL to body; fetched URLs are recorded under "log"."""
+    files = {"log": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        files["log"].append(url)
+        return httpx.Response(200, content=files[url]) if url in files else httpx.Response(404)
+
+    client = httpx.Client
+    monkeypatch.setattr(httpx, "Client", lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs))
+    return files
+
+
+def _install(package_root, registry: str, name: str, path=None) -> None:
+    dep = {"registry": registry, "name": name}
+    if path:
+        dep["path"] = path
+    external.resolve_and_install_external_dependency(dep, package_root)
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    root = tmp_path / "mirror"
+    (root / "pdf" / ".git").mkdir(parents=True)
+    (root / "pdf" / "SKILL.md").write_text("# PDF\n")
+    (root / "pdf" / ".git" / "HEAD").write_text("ref")
+    return root
+
+
+def test_local_mirror(tmp_path, externals, mirror):
+    externals({"acme/skills": {"type": "local_mirror", "path": str(mirror)}})
+    _install(tmp_path / "pkg", "acme/skills", "pdf")
+    dest = tmp_path / "pkg" / "external" / "acme_skills" / "pdf"
+    assert (dest / "SKILL.md").read_text() == "# PDF\n"
+    assert not (dest / ".git").exists()
+
+    with pytest.raises(RuntimeError, match="escapes"):
+        _install(tmp_path / "pkg", "acme/skills", "../elsewhere")
+    with pytest.raises(RuntimeError, match="escapes"):
+        _install(tmp_path / "pkg", "acme/skills", "pdf", path="../outside")
+
+
+def test_mirror_override_redirects_every_registry(tmp_path, externals, monkeypatch, served):
+    externals({"anthropic/skills": {"type": "anthropic_skills_github", "repo": "anthropics/skills"}})
+    (tmp_path / "mirrors" / "anthropic" / "skills" / "pdf").mkdir(parents=True)
+    (tmp_path / "mirrors" / "anthropic" / "skills" / "pdf" / "SKILL.md").write_text("mirrored")
+    monkeypatch.setenv("ARA_EXTERNALS_MIRROR", str(tmp_path / "mirrors"))
+
+    _install(tmp_path / "pkg", "anthropic/skills", "pdf", path="skills/pdf")
+    assert (tmp_path / "pkg" / "skills" / "pdf" / "SKILL.md").read_text() == "mirrored"
+    assert served["log"] == []
+
+
+def test_unknown_registries(tmp_path, externals):
+    externals({"acme/skills": {"type": "ftp"}})
+    _install(tmp_path / "pkg", "other/skills", "pdf")  # not allowlisted: skipped
+    assert not (tmp_path / "pkg").exists()
+    with pytest.raises(RuntimeError, match="Unsupported external registry type 'ftp'"):
+        _install(tmp_path / "pkg", "acme/skills", "pdf")
+
+
+def test_http_tarball_is_verified_and_cached(tmp_path, externals, served):
+    data = _tarball({"pdf/SKILL.md": b"# PDF\n", "docx/SKILL.md": b"# DOCX\n"})
+    served["https://example.com/skills.tar.gz"] = data
+    config = {"type": "http_tarball", "url": "https://example.com/skills.tar.gz", "sha256": f"sha256:{hashlib.sha256(data).hexdigest()}"}
+    externals({"acme/skills": config})
+
+    _install(tmp_path / "a", "acme/skills", "pdf", path="pdf")
+    _install(tmp_path / "b", "acme/skills", "pdf", path="pdf")
+    assert (tmp_path / "b" / "pdf" / "SKILL.md").read_bytes() == b"# PDF\n"
+    assert not (tmp_path / "b" / "pdf" / "docx").exists()
+    assert len(served["log"]) == 1  # pinned by checksum: the second install is served from the cache
+
+    externals({"acme/skills": {**config, "sha256": "0" * 64}})
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        _install(tmp_path / "c", "acme/skills", "pdf")
+
+
+def test_http_tarball_per_ability(tmp_path, externals, served):
+    served["https://example.com/pdf.tar.gz"] = _tarball({"SKILL.md": b"# PDF\n"})
+    served["https://example.com/evil.tar.gz"] = _tarball({"../evil.md": b"x"})
+    externals({"acme/skills": {"type": "http_tarball", "url": "https://example.com/{name}.tar.gz"}})
+
+    _install(tmp_path / "pkg", "acme/skills", "pdf", path="pdf")
+    _install(tmp_path / "pkg", "acme/skills", "pdf", path="pdf")
+    assert (tmp_path / "pkg" / "pdf" / "SKILL.md").read_bytes() == b"# PDF\n"
+    assert len(served["log"]) == 2  # unpinned: fetched every time
+
+    with pytest.raises(RuntimeError, match="Unsafe path"):
+        _install(tmp_path / "pkg", "acme/skills", "evil")
+    with pytest.raises(RuntimeError, match="status 404"):
+        _install(tmp_path / "pkg", "acme/skills", "missing")
+
+
+def _git(cwd, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_git_pinned_to_a_commit(tmp_path, externals):
+    repo = tmp_path / "repo"
+    (repo / "pdf").mkdir(parents=True)
+    (repo / "pdf" / "SKILL.md").write_text("v1")
+    _git(repo, "init", "--quiet")
+    _git(repo, "add", ".")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "--quiet", "-m", "v1")
+    commit = _git(repo, "rev-parse", "HEAD")
+    (repo / "pdf" / "SKILL.md").write_text("v2")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "--quiet", "-am", "v2")
+
+    externals({"acme/skills": {"type": "git", "url": repo.as_uri(), "ref": commit}})
+    _install(tmp_path / "pkg", "acme/skills", "pdf", path="pdf")
+    assert (tmp_path / "pkg" / "pdf" / "SKILL.md").read_text() == "v1"
+    assert external.get_backend("git").is_pinned(external.get_external_registry("acme/skills"))
+
+    with pytest.raises(RuntimeError, match="not found"):
+        _install(tmp_path / "pkg", "acme/skills", "docx")
+
+
+def test_backend_without_fetch_is_rejected():
+    with pytest.raises(TypeError, match="fetch"):
+
+        @external.register_backend("incomplete")
+        class Incomplete(external.ExternalBackend):
+            pass
+
+    assert external.get_backend("incomplete") is None
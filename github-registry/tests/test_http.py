@@ -0,0 +1,215 @@
+"""The request scheduler and request tracing (see ara_github/http.py)."""
+
+import httpx
+import pytest
+
+from ara_github import http
+
+
+class _Body(httpx.SyncByteStream):
+    """A response body that, like one from the network, is read only when consumed."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def __iter__(self):
+        yield self._data
+
+
+def _traced_client(tracer: http.Tracer, handler) -> httpx.Client:
+    scheduler = http.Scheduler(rate=1000.0, burst=1000)
+    inner = httpx.MockTransport(handler)
+
+    class Transport(httpx.BaseTransport):
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            return scheduler.send(inner, request, http.INTERACTIVE)
+
+    return httpx.Client(transport=Transport(), event_hooks=tracer.event_hooks())
+
+
+def test_trace_records_body_size():
+    tracer = http.Tracer()
+    with _traced_client(tracer, lambda request: httpx.Response(200, stream=_Body(b"x" * 100))) as client:
+        client.get("https://example.test/repos/acme/registry/contents/registry/index.json")
+    [record] = tracer.records
+    assert record.status == 200
+    assert record.bytes_received == 100
+    assert record.endpoint == "/repos/{owner}/{repo}/contents/{path}"
+
+
+def test_trace_records_forbidden_response():
+    # The scheduler reads a 403 body to tell a permissions error from a
+    # secondary rate limit, before the tracer sees the response
+    tracer = http.Tracer()
+    with _traced_client(tracer, lambda request: httpx.Response(403, stream=_Body(b"Resource not accessible"))) as client:
+        response = client.get("https://example.test/repos/acme/registry/issues/1")
+    assert response.status_code == 403
+    [record] = tracer.records
+    assert record.status == 403
+    assert record.bytes_received == len(b"Resource not accessible")
+    assert record.retries == 0
+
+
+API = "https://api.github.test"
+
+
+class Clock:
+    """Simulated time: sleeping advances the clock instead of blocking."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    monkeypatch.setenv("GITHUB_API_URL", API)
+    monkeypatch.delenv("ARA_HTTP_MAX_WAIT", raising=False)
+    return Clock()
+
+
+def _send(scheduler: http.Scheduler, responses, path: str = "/repos/acme/registry/releases",
+          method: str = "GET", priority: int = http.INTERACTIVE, host: str = API) -> tuple[httpx.Response, int]:
+    """Send one request through the scheduler; responses are popped from the list per attempt."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    response = scheduler.send(httpx.MockTransport(handler), httpx.Request(method, host + path), priority)
+    return response, calls
+
+
+def _quota(clock: Clock, remaining: int, limit: int = 100, reset_in: float = 100) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(clock.now + reset_in)),
+    }
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = http._TokenBucket(rate=2.0, burst=3, clock=clock)
+    for _ in range(3):
+        assert bucket.acquire(http.INTERACTIVE) == 0
+    assert bucket._tokens == 0
+    clock.now += 1.0
+    bucket._refill()
+    assert bucket._tokens == 2.0
+    clock.now += 60.0
+    bucket._refill()
+    assert bucket._tokens == 3.0  # never beyond the burst
+
+
+def test_waits_for_retry_after(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    response, calls = _send(scheduler, [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+    assert response.status_code == 200 and calls == 2
+    assert clock.sleeps == [7.0]
+    assert response.extensions["ara_retries"] == 1
+
+
+def test_waits_for_quota_reset(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    limited = httpx.Response(403, headers=_quota(clock, remaining=0, reset_in=30))
+    response, calls = _send(scheduler, [limited, httpx.Response(200)])
+    assert response.status_code == 200 and calls == 2
+    assert clock.sleeps == [31.0]
+
+
+def test_secondary_limit_backs_off(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    secondary = httpx.Response(403, content=b"You have exceeded a secondary rate limit")
+    response, _ = _send(scheduler, [secondary, secondary, httpx.Response(200)], priority=http.BACKGROUND)
+    assert response.status_code == 200
+    assert clock.sleeps == [http.SECONDARY_WAIT, http.SECONDARY_WAIT * 2]
+
+    # Interactive requests give up rather than wait that long
+    response, calls = _send(scheduler, [secondary, secondary, httpx.Response(200)])
+    assert response.status_code == 403 and calls == 2
+
+
+def test_gives_up_beyond_max_wait(clock, monkeypatch):
+    monkeypatch.setenv("ARA_HTTP_MAX_WAIT", "60")
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    response, calls = _send(scheduler, [httpx.Response(429, headers={"Retry-After": "3600"})])
+    assert response.status_code == 429 and calls == 1
+    assert clock.sleeps == []
+
+
+def test_retries_server_errors(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    response, calls = _send(scheduler, [httpx.Response(502), httpx.Response(503), httpx.Response(200)])
+    assert response.status_code == 200 and calls == 3
+    assert len(clock.sleeps) == 2
+    assert all(0 <= s <= http.BACKOFF_CAP for s in clock.sleeps)
+
+    response, calls = _send(scheduler, [httpx.Response(500)])
+    assert response.status_code == 500 and calls == http.MAX_ATTEMPTS
+
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404, 422])
+def test_does_not_retry_client_errors(clock, status):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    response, calls = _send(scheduler, [httpx.Response(status, content=b"Not allowed"), httpx.Response(200)])
+    assert response.status_code == status and calls == 1
+    assert clock.sleeps == []
+
+
+def test_does_not_retry_non_idempotent_requests(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    response, calls = _send(scheduler, [httpx.Response(502), httpx.Response(200)], method="POST")
+    assert response.status_code == 502 and calls == 1
+
+
+def test_retry_budget(clock):
+    # At most RETRY_BUDGET_MIN plus RETRY_BUDGET_RATIO of all requests are retries
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    retries = []
+    for _ in range(5):
+        response, calls = _send(scheduler, [httpx.Response(503)])
+        retries.append(calls - 1)
+    assert retries == [3, 3, 3, 2, 0]
+    assert response.extensions["ara_retries"] == 0
+
+
+def test_paces_the_rest_of_the_quota(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    # 10 requests left for the next 100 seconds: one every 10 seconds
+    low = httpx.Response(200, headers=_quota(clock, remaining=10))
+    for _ in range(3):
+        _send(scheduler, [low])
+    assert clock.sleeps == [10.0]
+
+    # Other hosts are neither paced nor tracked
+    _send(scheduler, [low], host="https://uploads.github.test")
+    assert clock.sleeps == [10.0]
+
+
+def test_background_requests_leave_a_reserve(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    _send(scheduler, [httpx.Response(200, headers=_quota(clock, remaining=15, reset_in=50))])
+
+    # Below the 20% reserve: background requests wait for the reset, interactive ones go ahead
+    _send(scheduler, [httpx.Response(200)], priority=http.INTERACTIVE)
+    assert clock.sleeps == []
+    _send(scheduler, [httpx.Response(200)], priority=http.BACKGROUND)
+    assert clock.sleeps == [51.0]
+
+
+def test_quotas_are_per_resource(clock):
+    scheduler = http.Scheduler(sleep=clock.sleep, clock=clock)
+    _send(scheduler, [httpx.Response(200, headers=_quota(clock, remaining=0, reset_in=30))], path="/search/code")
+    _send(scheduler, [httpx.Response(200)])
+    assert clock.sleeps == []
+    _send(scheduler, [httpx.Response(200)], path="/search/code")
+    assert clock.sleeps == [31.0]
@@ -0,0 +1,107 @@
+"""Gitignore-style .araignore rules and the package scan (ara_github/packing.py)."""
+
+import json
+
+import pytest
+
+from ara_github import cli, packing
+
+
+@pytest.mark.parametrize("pattern, path, is_dir, expected", [
+    ("*.log", "debug.log", False, True),
+    ("*.log", "deep/dir/debug.log", False, True),
+    ("*.log", "debug.log.txt", False, None),
+    ("/build", "build", True, True),
+    ("/build", "src/build", True, None),
+    ("build/", "build", False, None),
+    ("build/", "src/build", True, True),
+    ("docs/*.md", "docs/a.md", False, True),
+    ("docs/*.md", "docs/sub/a.md", False, None),
+    ("docs/**/*.md", "docs/sub/deeper/a.md", False, True),
+    ("**/cache", "a/b/cache", True, True),
+    ("file?.txt", "file1.txt", False, True),
+    ("file[0-9].txt", "filex.txt", False, None),
+    ("file[!0-9].txt", "filex.txt", False, True),
+    ("\\#notes", "#notes", False, True),
+    ("# comment", "# comment", False, None),
+])
+def test_pattern(pattern: str, path: str, is_dir: bool, expected):
+    assert packing.IgnoreRules("", [pattern]).match(path, is_dir) is expected
+
+
+def test_last_match_wins_and_negation():
+    rules = packing.IgnoreRules("", ["*.md", "!README.md", "docs/README.md"])
+    assert rules.match("notes.md", False) is True
+    assert rules.match("README.md", False) is False
+    assert rules.match("docs/README.md", False) is True
+
+
+def test_rules_apply_below_their_directory():
+    rules = packing.IgnoreRules("sub/", ["/generated"])
+    assert rules.match("sub/generated", True) is True
+    assert rules.match("generated", True) is None
+    assert rules.match("sub/x/generated", True) is None
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "package"
+    for path in [
+        "ara.json", "prompt.md", "notes.log", "keep.log",
+        "node_modules/dep/index.js", "target/out.bin", ".git/HEAD", "__pycache__/x.pyc",
+        "build/out.txt", "sub/a.md", "sub/scratch.tmp", "sub/inner/b.tmp", "vendor/lib.js",
+    ]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(path)
+    (root / "ara.json").write_text(json.dumps({"name": "acme/agent", "version": "1.0.0"}))
+    (root / ".araignore").write_text("*.log\n!keep.log\n!target\n")
+    (root / "sub" / ".araignore").write_text("*.tmp\n!inner/*.tmp\n")
+    (root / ".gitignore").write_text("build/\nvendor/\n")
+    return root
+
+
+def test_scan(tree):
+    assert sorted(packing.scan(tree)) == [
+        ".gitignore", "ara.json", "build/out.txt", "keep.log", "prompt.md",
+        "sub/a.md", "sub/inner/b.tmp", "target/out.bin", "vendor/lib.js",
+    ]
+
+
+def test_scan_with_gitignore(tree):
+    files = packing.scan(tree, gitignore=True)
+    # The root has an .araignore, so its .gitignore is still not read
+    assert "build/out.txt" in files and "vendor/lib.js" in files
+
+    (tree / ".araignore").unlink()
+    files = packing.scan(tree, gitignore=True)
+    assert "build/out.txt" not in files and "vendor/lib.js" not in files
+    assert "notes.log" in files
+
+
+def test_scan_prunes_ignored_directories(tree, monkeypatch):
+    entered = []
+    real_load = packing.IgnoreRules.load.__func__
+
+    def load(cls, directory, base, gitignore=False):
+        entered.append(base)
+        return real_load(cls, directory, base, gitignore)
+
+    monkeypatch.setattr(packing.IgnoreRules, "load", classmethod(load))
+    packing.scan(tree)
+    assert "node_modules/" not in entered and ".git/" not in entered
+    assert "target/" in entered
+
+
+def test_scan_skips_symlinked_directories(tree):
+    (tree / "linked").symlink_to(tree / "sub", target_is_directory=True)
+    (tree / "alias.md").symlink_to("prompt.md")
+    files = packing.scan(tree)
+    assert not any(name.startswith("linked") for name in files)
+    assert "alias.md" in files
+
+
+def test_package_files_never_ship_a_files_manifest(tree):
+    (tree / packing.FILES_MANIFEST).write_text("{}")
+    files = cli._package_files(tree, {})
+    assert packing.FILES_MANIFEST not in files
+    assert "ara.json" in files
@@ -0,0 +1,135 @@
+"""Incremental registry mirroring (ara_github/mirror.py)."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from ara_github import mirror, storage
+
+TAGS = ("ara/acme/agent/v1.0.0", "ara/acme/agent/v1.1.0", "ara/beta/tool/v2.0.0")
+
+
+class Source(storage.LocalStorage):
+    """A registry to mirror that, like GitHub, reports asset digests, and records the downloads it serves."""
+
+    def __init__(self, root: Path):
+        super().__init__(root)
+        self.downloads: list[str] = []
+        self.fail: set[str] = set()
+
+    def get_release(self, tag: str) -> dict:
+        release = super().get_release(tag)
+        for asset in release["assets"]:
+            asset["digest"] = f"sha256:{hashlib.sha256(Path(asset['url']).read_bytes()).hexdigest()}"
+        return release
+
+    def download_asset(self, asset: dict, dest: Path) -> None:
+        self.downloads.append(asset["url"])
+        if asset["url"] in self.fail:
+            dest.write_bytes(b"partial")
+            raise OSError("connection reset")
+        super().download_asset(asset, dest)
+
+
+@pytest.fixture
+def source(tmp_path) -> Source:
+    source = Source(tmp_path / "source")
+    for tag in TAGS:
+        source.create_release(tag, tag, "", {"package.tar.zst": f"archive of {tag}".encode(), "ara.json": b"{}"})
+    source.write_index([
+        {"namespace": "acme", "name": "agent", "versions": ["1.1.0", "1.0.0"], "latest_version": "1.1.0"},
+        {"namespace": "beta", "name": "tool", "versions": ["2.0.0"], "latest_version": "2.0.0"},
+    ], "seed")
+    source.write_ownership({"namespaces": {"acme": "alice"}, "packages": {}}, "seed")
+    return source
+
+
+@pytest.fixture
+def dest(tmp_path) -> Path:
+    return tmp_path / "mirror"
+
+
+def _asset(root: Path, tag: str, name: str = "package.tar.zst") -> Path:
+    return root / "releases" / tag / name
+
+
+def test_initial_sync(source, dest):
+    result = mirror.sync(dest, source, workers=2)
+    assert result.errors == []
+    assert result.files_updated == 3  # index.json, index.bin, ownership.json
+    assert result.assets_downloaded == 2 * len(TAGS)
+
+    copy = storage.LocalStorage(dest)
+    assert copy.read_index() == source.read_index()
+    assert copy.list_release_tags("ara/") == sorted(TAGS)
+    assert _asset(dest, TAGS[0]).read_bytes() == f"archive of {TAGS[0]}".encode()
+    with copy.open_binary_index() as binary:
+        assert binary.get("beta", "tool")["latest_version"] == "2.0.0"
+
+
+def test_resync_transfers_only_changes(source, dest):
+    mirror.sync(dest, source)
+    source.downloads.clear()
+
+    result = mirror.sync(dest, source)
+    assert (result.files_updated, result.files_unchanged) == (0, 3)
+    assert (result.assets_downloaded, result.assets_skipped) == (0, 2 * len(TAGS))
+    assert source.downloads == []
+
+    source.write_ownership({"namespaces": {"acme": "bob"}, "packages": {}}, "transfer")
+    source.create_release("ara/beta/tool/v2.1.0", "", "", {"package.tar.zst": b"new", "ara.json": b"{}"})
+    result = mirror.sync(dest, source)
+    assert (result.files_updated, result.files_unchanged) == (1, 2)
+    assert result.assets_downloaded == 2
+    assert storage.LocalStorage(dest).read_ownership()["namespaces"] == {"acme": "bob"}
+
+
+def test_damaged_copies_are_downloaded_again(source, dest):
+    mirror.sync(dest, source)
+    source.downloads.clear()
+
+    same_size = _asset(dest, TAGS[0])
+    same_size.write_bytes(b"x" * same_size.stat().st_size)  # caught by the digest
+    _asset(dest, TAGS[1]).write_bytes(b"truncated")  # caught by the size
+    _asset(dest, TAGS[2], "ara.json").unlink()
+    (dest / storage.OWNERSHIP_PATH).unlink()  # its ETag is still recorded
+
+    result = mirror.sync(dest, source)
+    assert result.assets_downloaded == 3
+    assert result.files_updated == 1
+    assert _asset(dest, TAGS[0]).read_bytes() == f"archive of {TAGS[0]}".encode()
+    assert (dest / storage.OWNERSHIP_PATH).exists()
+
+
+def test_failed_downloads_leave_no_partial_files(source, dest):
+    failing = str(_asset(source.root, TAGS[1]))
+    source.fail.add(failing)
+
+    result = mirror.sync(dest, source)
+    assert len(result.errors) == 1 and "connection reset" in result.errors[0]
+    assert result.assets_downloaded == 2 * len(TAGS) - 1
+    assert not _asset(dest, TAGS[1]).exists()
+    assert not list(dest.rglob("*.part"))
+
+    source.fail.clear()
+    result = mirror.sync(dest, source)
+    assert result.errors == [] and result.assets_downloaded == 1
+
+
+def test_prune(source, dest):
+    mirror.sync(dest, source)
+    source.delete_release(TAGS[2])
+    # A release whose ara.json never arrived, e.g. from an interrupted sync
+    _asset(dest, "ara/gone/pkg/v1.0.0").parent.mkdir(parents=True)
+    _asset(dest, "ara/gone/pkg/v1.0.0").write_bytes(b"orphan")
+
+    result = mirror.sync(dest, source)
+    assert result.releases_pruned == 0
+    assert _asset(dest, TAGS[2]).exists()
+
+    result = mirror.sync(dest, source, prune=True)
+    assert result.releases_pruned == 2
+    assert storage.LocalStorage(dest).list_release_tags("ara/") == sorted(TAGS[:2])
+    assert not (dest / "releases" / "ara" / "gone").exists()
+    assert not (dest / "releases" / "ara" / "beta").exists()
@@ -0,0 +1,168 @@
+"""Deterministic archives (ara_github/packing.py) and their checked extraction."""
+
+import io
+import json
+import os
+import tarfile
+
+import pytest
+import zstandard as zstd
+
+from ara_github import cli, packing
+
+
+@pytest.fixture
+def package(tmp_path):
+    root = tmp_path / "package"
+    (root / "bin").mkdir(parents=True)
+    (root / "docs").mkdir()
+    (root / "ara.json").write_text(json.dumps({"name": "acme/agent", "version": "1.0.0"}))
+    (root / "bin" / "run.sh").write_text("#!/bin/sh\necho hi\n")
+    (root / "bin" / "run.sh").chmod(0o755)
+    for i in range(20):
+        (root / "docs" / f"v{i}.md").write_text(f"Version {i}\n")
+    (root / "latest.md").symlink_to("docs/v19.md")
+    return root
+
+
+def test_archive_is_reproducible(package):
+    first = packing.build_tar(packing.scan(package))
+    os.utime(package / "docs" / "v3.md", (1, 1))
+    (package / "docs" / "v4.md").chmod(0o600)
+    assert packing.build_tar(packing.scan(package)) == first
+
+
+def test_archive_layout(package):
+    with tarfile.open(fileobj=io.BytesIO(packing.build_tar(packing.scan(package)))) as tar:
+        members = tar.getmembers()
+        names = [m.name for m in members]
+        assert names[:2] == ["ara.json", packing.FILES_MANIFEST]
+        assert names[2:] == sorted(names[2:])
+        assert all(m.mtime == 0 and m.uid == 0 and m.gid == 0 and m.uname == "" for m in members)
+
+        run = tar.getmember("bin/run.sh")
+        assert run.mode == 0o755
+        assert tar.getmember("docs/v4.md").mode == 0o644
+        link = tar.getmember("latest.md")
+        assert link.issym() and link.linkname == "docs/v19.md"
+
+        files = packing.read_manifest(tar)
+        assert set(files) == set(names) - {packing.FILES_MANIFEST}
+        assert files["bin/run.sh"]["mode"] == "755"
+        assert files["latest.md"] == {"symlink": "docs/v19.md"}
+        for member in members[2:]:
+            assert packing.check_member(tar, member, files) is None
+
+
+def _write_archive(path, tar_data: bytes):
+    path.write_bytes(zstd.ZstdCompressor().compress(tar_data))
+    return path
+
+
+def _rebuild(tar_data: bytes, edit) -> bytes:
+    """Copy an archive member by member; edit(info, data) returns a replacement list of them."""
+    out = io.BytesIO()
+    with tarfile.open(fileobj=io.BytesIO(tar_data)) as src, tarfile.open(fileobj=out, mode="w", format=tarfile.PAX_FORMAT) as dst:
+        for info in src.getmembers():
+            data = src.extractfile(info).read() if info.isfile() else None
+            for new_info, new_data in edit(info, data):
+                if new_data is not None:
+                    new_info.size = len(new_data)
+                dst.addfile(new_info, io.BytesIO(new_data) if new_data is not None else None)
+    return out.getvalue()
+
+
+def _only_manifest() -> bytes:
+    """An archive holding just ara.json, as published before files manifests existed."""
+    info = tarfile.TarInfo("ara.json")
+    out = io.BytesIO()
+    data = b'{"name": "acme/agent", "version": "1.0.0"}'
+    info.size = len(data)
+    with tarfile.open(fileobj=out, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        tar.addfile(info, io.BytesIO(data))
+    return out.getvalue()
+
+
+def _extra(name: str, kind: bytes, linkname: str = ""):
+    info = tarfile.TarInfo(name)
+    info.type = kind
+    info.linkname = linkname
+    return info, None
+
+
+def test_extract(package, tmp_path):
+    archive = _write_archive(tmp_path / "a.tar.zst", packing.build_tar(packing.scan(package)))
+    dest = tmp_path / "out"
+    cli._safe_extract(archive, dest)
+    assert (dest / "bin" / "run.sh").stat().st_mode & 0o777 == 0o755
+    assert os.readlink(dest / "latest.md") == "docs/v19.md"
+    assert (dest / "latest.md").read_text() == "Version 19\n"
+    assert not (dest / packing.FILES_MANIFEST).exists()
+
+
+def _edit_content(info, data):
+    if info.name == "docs/v3.md":
+        data = b"tampered\n"
+    return [(info, data)]
+
+
+def _drop_member(info, data):
+    return [] if info.name == "docs/v3.md" else [(info, data)]
+
+
+def _add_unlisted(info, data):
+    extra = tarfile.TarInfo("docs/extra.md")
+    return [(info, data)] + ([(extra, b"extra")] if info.name == "ara.json" else [])
+
+
+def _retarget_symlink(info, data):
+    if info.name == "latest.md":
+        info.linkname = "docs/v1.md"
+    return [(info, data)]
+
+
+@pytest.mark.parametrize("edit, error", [
+    (_edit_content, "does not match its SHA-256"),
+    (_drop_member, "missing docs/v3.md"),
+    (_add_unlisted, "not listed"),
+    (_retarget_symlink, "does not match the archive's manifest"),
+])
+def test_extract_rejects_manifest_mismatch(package, tmp_path, capsys, edit, error):
+    archive = _write_archive(tmp_path / "a.tar.zst", _rebuild(packing.build_tar(packing.scan(package)), edit))
+    with pytest.raises(SystemExit):
+        cli._safe_extract(archive, tmp_path / "out")
+    assert error in capsys.readouterr().err
+    assert not any((tmp_path / "out").rglob("*.md"))
+
+
+@pytest.mark.parametrize("extra, error", [
+    (_extra("passwd", tarfile.SYMTYPE, "/etc/passwd"), "absolute path"),
+    (_extra("docs/up", tarfile.SYMTYPE, "../../outside"), "links outside"),
+    (_extra("docs", tarfile.SYMTYPE, ".."), "links outside"),
+    (_extra("hard", tarfile.LNKTYPE, "ara.json"), "not a regular file"),
+    (_extra("tty", tarfile.CHRTYPE), "not a regular file"),
+    (_extra("fifo", tarfile.FIFOTYPE), "not a regular file"),
+    ((tarfile.TarInfo("../escape.md"), b"x"), "unsafe path"),
+    ((tarfile.TarInfo("/abs.md"), b"x"), "unsafe path"),
+])
+def test_extract_rejects_unsafe_members(tmp_path, capsys, extra, error):
+    # Archives without a manifest get these checks too
+    def add(info, data):
+        return [(info, data), extra]
+
+    archive = _write_archive(tmp_path / "a.tar.zst", _rebuild(_only_manifest(), add))
+    with pytest.raises(SystemExit):
+        cli._safe_extract(archive, tmp_path / "out")
+    assert error in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+
+
+def test_extract_rejects_writes_through_symlinks(tmp_path, capsys):
+    # Each link stays inside the package, but writing below one would follow it
+    def add(info, data):
+        return [(info, data), _extra("sub", tarfile.SYMTYPE, "."), (tarfile.TarInfo("sub/file.md"), b"x")]
+
+    archive = _write_archive(tmp_path / "a.tar.zst", _rebuild(_only_manifest(), add))
+    with pytest.raises(SystemExit):
+        cli._safe_extract(archive, tmp_path / "out")
+    assert "sub/file.md is inside a symlinked directory" in capsys.readouterr().err
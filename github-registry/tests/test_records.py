@@ -0,0 +1,62 @@
+"""In-memory index records (ara_github/records.py)."""
+
+import pytest
+
+from ara_github.records import Index, PackageRecord
+
+ENTRY = {
+    "namespace": "acme",
+    "name": "agent",
+    "description": "An agent",
+    "latest_version": "1.2.0",
+    "versions": ["1.2.0", "1.10.0-rc.1", "1.1.0"],
+    "tags": ["demo"],
+    "homepage": "https://example.com",
+}
+
+
+def test_round_trip_keeps_unknown_fields():
+    record = PackageRecord.from_dict(ENTRY)
+    assert record.extra == {"homepage": "https://example.com"}
+    assert record.type is None
+    assert record.to_dict() == ENTRY
+
+
+def test_latest_and_resolve():
+    record = PackageRecord.from_dict(ENTRY)
+    assert record.latest() == "1.2.0"
+    assert record.latest(prerelease=True) == "1.10.0-rc.1"
+    assert record.resolve("~1.1") == "1.1.0"
+    assert record.has_version("1.1.0")
+
+
+def test_index_lookup_and_order():
+    index = Index.from_list([ENTRY, {"namespace": "acme", "name": "tool"}])
+    assert [r.full_name for r in index] == ["acme/agent", "acme/tool"]
+    assert index.get("acme", "tool").versions is None
+    assert ("acme", "agent") in index
+
+    index.add(PackageRecord("acme", "agent", latest_version="2.0.0", versions=["2.0.0"]))
+    assert [r.full_name for r in index] == ["acme/agent", "acme/tool"]
+    assert index.get("acme", "agent").latest_version == "2.0.0"
+    assert index.remove("acme", "tool").name == "tool"
+    assert len(index) == 1
+
+
+@pytest.mark.parametrize("entry", [
+    {"name": "no-namespace"},
+    {"namespace": "acme"},
+    {"namespace": None, "name": "agent"},
+    {"namespace": "acme", "name": 7},
+    "acme/agent",
+    None,
+])
+def test_malformed_entries_are_skipped_but_kept(entry):
+    index = Index.from_list([ENTRY, entry])
+    assert [r.full_name for r in index] == ["acme/agent"]
+    assert index.to_list() == [ENTRY, entry]
+
+
+def test_from_dict_rejects_malformed_entry():
+    with pytest.raises(ValueError):
+        PackageRecord.from_dict({"name": "agent"})
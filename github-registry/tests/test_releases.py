@@ -0,0 +1,72 @@
+"""Batched GraphQL release lookups and their REST fallback, against the fake GitHub API."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fakegithub import OWNER, REPO, FakeGitHub, package_name  # noqa: E402
+
+from ara_github import client, storage  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    with FakeGitHub(packages=60, versions=2) as fake:
+        monkeypatch.setenv("GITHUB_API_URL", fake.api_url)
+        monkeypatch.setenv("GITHUB_REPO", f"{OWNER}/{REPO}")
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        monkeypatch.setenv("ARA_REGISTRY_BACKEND", "github")
+        yield fake
+
+
+def _tags(count: int) -> list[str]:
+    tags = []
+    for i in range(count):
+        namespace, name = package_name(i)
+        tags += [f"ara/{namespace}/{name}/v1.0.0", f"ara/{namespace}/{name}/v1.1.0"]
+    return tags
+
+
+def test_batches_lookups_in_graphql(fake):
+    tags = _tags(60) + ["ara/ns0/missing/v1.0.0"]
+    releases = storage.GitHubStorage().get_releases(tags)
+
+    assert fake.stats.requests == {"POST /graphql": 3}  # 121 tags, 50 per query
+    assert releases["ara/ns0/missing/v1.0.0"] is None
+    release = releases["ara/ns1/pkg-1/v1.1.0"]
+    assert release["tag_name"] == "ara/ns1/pkg-1/v1.1.0"
+    archive = next(a for a in release["assets"] if a["name"] == "package.tar.zst")
+    assert archive["size"] == len(fake.archive)
+    assert storage.GitHubStorage().read_asset(archive) == fake.archive
+
+
+def test_single_lookup_uses_rest(fake):
+    [release] = storage.GitHubStorage().get_releases(["ara/ns0/pkg-0/v1.0.0"]).values()
+    assert release["tag_name"] == "ara/ns0/pkg-0/v1.0.0"
+    assert fake.stats.requests == {"GET /repos/{owner}/{repo}/releases/tags/{tag}": 1}
+
+
+def test_private_repository_falls_back_to_rest(fake):
+    # GraphQL download URLs need a browser session on private repositories
+    fake.private = True
+    tags = _tags(3)
+    releases = storage.GitHubStorage().get_releases(tags)
+
+    assert fake.stats.requests == {"POST /graphql": 1, "GET /repos/{owner}/{repo}/releases/tags/{tag}": len(tags)}
+    archive = next(a for a in releases[tags[0]]["assets"] if a["name"] == "package.tar.zst")
+    assert "/releases/assets/" in archive["url"]
+    assert storage.GitHubStorage().read_asset(archive) == fake.archive
+
+
+def test_find_releases_names_every_missing_version(fake):
+    packages = [("ns0", "pkg-0", "1.0.0"), ("ns0", "pkg-0", "9.0.0"), ("ns1", "pkg-1", "9.0.0")]
+    with pytest.raises(FileNotFoundError) as error:
+        client.find_releases(packages)
+    assert "ara/ns0/pkg-0/v9.0.0" in str(error.value)
+    assert "ara/ns1/pkg-1/v9.0.0" in str(error.value)
+
+    found = client.find_releases(packages[:1])
+    assert found[packages[0]]["tag_name"] == "ara/ns0/pkg-0/v1.0.0"
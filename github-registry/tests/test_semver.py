@@ -0,0 +1,97 @@
+"""Semantic Versioning precedence and npm-style ranges (ara_github/semver.py)."""
+
+import pytest
+
+from ara_github import semver
+
+# In ascending precedence, from the example in section 11 of the SemVer spec
+SPEC_ORDER = [
+    "1.0.0-alpha",
+    "1.0.0-alpha.1",
+    "1.0.0-alpha.beta",
+    "1.0.0-beta",
+    "1.0.0-beta.2",
+    "1.0.0-beta.11",
+    "1.0.0-rc.1",
+    "1.0.0",
+    "1.0.1",
+    "1.2.0",
+    "1.10.0",
+    "2.0.0",
+]
+
+VERSIONS = ["0.9.0", "1.2.0", "1.2.5", "1.3.0-beta.1", "1.3.0", "1.4.2", "2.0.0-rc.1", "2.0.0", "2.1.0"]
+
+
+def test_sort_follows_spec_precedence():
+    assert semver.sort_versions(reversed(SPEC_ORDER)) == SPEC_ORDER[::-1]
+    assert semver.sort_versions(sorted(SPEC_ORDER)) == SPEC_ORDER[::-1]
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("1.10.0", "1.9.0", 1),
+    ("1.0.0", "1.0.0-rc.1", 1),
+    ("1.0.0-2", "1.0.0-10", -1),
+    ("1.0.0-alpha", "1.0.0-1", 1),
+    ("1.0.0+build.1", "1.0.0+build.2", 0),
+])
+def test_compare(a: str, b: str, expected: int):
+    assert semver.compare(a, b) == expected
+
+
+@pytest.mark.parametrize("version, valid", [
+    ("1.2.3", True),
+    ("1.2.3-rc.1+build.5", True),
+    ("01.2.3", False),
+    ("1.2", False),
+    ("1.2.3-01", False),
+    ("v1.2.3", False),
+])
+def test_is_valid(version: str, valid: bool):
+    assert semver.is_valid(version) is valid
+
+
+def test_insert_version_keeps_newest_first():
+    versions = ["1.10.0", "1.2.0"]
+    semver.insert_version(versions, "1.9.0")
+    semver.insert_version(versions, "1.9.0")
+    assert versions == ["1.10.0", "1.9.0", "1.2.0"]
+
+
+def test_latest_prefers_stable():
+    assert semver.latest(["1.0.0", "2.0.0-rc.1"]) == "1.0.0"
+    assert semver.latest(["1.0.0", "2.0.0-rc.1"], prerelease=True) == "2.0.0-rc.1"
+    assert semver.latest(["2.0.0-rc.1", "2.0.0-beta.3"]) == "2.0.0-rc.1"
+    assert semver.latest([]) is None
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("1.2.5", "1.2.5"),
+    ("^1.2", "1.4.2"),
+    ("^1.2.6", "1.4.2"),
+    ("~1.2.0", "1.2.5"),
+    ("1.x", "1.4.2"),
+    ("1.2.*", "1.2.5"),
+    ("*", "2.1.0"),
+    (">=1.3.0 <2", "1.4.2"),
+    (">= 1.3.0 < 2", "1.4.2"),
+    ("1.2 - 1.3", "1.3.0"),
+    ("<1", "0.9.0"),
+    ("^0.9.0", "0.9.0"),
+    ("^3 || ~1.2", "1.2.5"),
+    ("^3", None),
+])
+def test_resolve(spec: str, expected: str):
+    assert semver.resolve(spec, VERSIONS) == expected
+
+
+def test_prereleases_only_match_ranges_that_name_them():
+    assert semver.resolve(">=1.3.0-beta.0 <1.3.0", VERSIONS) == "1.3.0-beta.1"
+    assert semver.resolve(">=1.2.9 <1.3.0", VERSIONS) is None
+    assert semver.resolve(">=1.2.9 <1.3.0", VERSIONS, include_prerelease=True) == "1.3.0-beta.1"
+    assert semver.resolve("^2.0.0-rc.1", VERSIONS) == "2.1.0"
+
+
+def test_invalid_range():
+    with pytest.raises(ValueError):
+        semver.parse_range("^banana")
@@ -0,0 +1,28 @@
+"""The ``ara`` startup budget (benchmarks/startup.py reports the details)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import startup  # noqa: E402
+
+# Fewer runs than the benchmark's default; the median still smooths out noise
+RUNS = 5
+
+
+@pytest.fixture(scope="module")
+def imported_at_startup() -> set[str]:
+    return startup.baseline()
+
+
+@pytest.mark.parametrize("scenario", startup.scenarios(), ids=lambda s: s.name)
+def test_startup_within_budget(scenario: startup.Scenario, imported_at_startup: set[str]):
+    result = startup.measure(scenario, RUNS, imported_at_startup)
+    assert not result.forbidden, f"ara {' '.join(scenario.args)} imports {', '.join(result.forbidden)}"
+    slowest = ", ".join(f"{name} {micros / 1000:.1f} ms" for name, micros in result.slowest)
+    assert result.import_ms <= startup.BUDGET_MS, (
+        f"imports took {result.import_ms:.1f} ms (budget {startup.BUDGET_MS:.0f} ms); slowest: {slowest}"
+    )
@@ -0,0 +1,94 @@
+"""Storage backends (ara_github/storage.py) and the direct write paths that use them."""
+
+import json
+
+import pytest
+
+from ara_github import client, index, storage
+
+
+def test_read_json_defaults_only_when_missing(registry):
+    assert registry.read_index() == []
+    assert registry.read_ownership() == {"namespaces": {}, "packages": {}}
+
+    (registry.root / "registry").mkdir()
+    (registry.root / storage.INDEX_PATH).write_text("[{broken")
+    with pytest.raises(ValueError):
+        registry.read_index()
+    with pytest.raises(ValueError):
+        index.fetch_index()
+
+
+def test_direct_publish_keeps_unreadable_index(registry, tmp_path):
+    (registry.root / "registry").mkdir()
+    index_json = registry.root / storage.INDEX_PATH
+    index_json.write_text("[{broken")
+    archive = tmp_path / "package.tar.zst"
+    archive.write_bytes(b"archive")
+
+    with pytest.raises(ValueError):
+        client.publish("acme", "agent", "1.0.0", {"description": "An agent"}, archive, "tester")
+    assert index_json.read_text() == "[{broken"
+    assert registry.list_release_tags() == []
+
+
+def test_direct_publish_unpublish_and_delete(registry, tmp_path):
+    archive = tmp_path / "package.tar.zst"
+    archive.write_bytes(b"archive")
+    for version in ("1.0.0", "1.1.0"):
+        client.publish("acme", "agent", version, {"description": "An agent"}, archive, "tester")
+
+    assert registry.list_release_tags("ara/acme/") == ["ara/acme/agent/v1.0.0", "ara/acme/agent/v1.1.0"]
+    release = registry.get_release("ara/acme/agent/v1.1.0")
+    assert {a["name"] for a in release["assets"]} == {"ara.json", "package.tar.zst"}
+    manifest = next(a for a in release["assets"] if a["name"] == "ara.json")
+    assert json.loads(registry.read_asset(manifest)) == {"description": "An agent"}
+    pkg = index.lookup("acme", "agent")
+    assert pkg.versions == ["1.1.0", "1.0.0"]
+    assert pkg.latest_version == "1.1.0"
+    assert registry.read_ownership()["packages"] == {"acme/agent": "tester"}
+
+    client.unpublish("acme", "agent", "1.1.0", "tester")
+    assert index.lookup("acme", "agent").latest_version == "1.0.0"
+    with pytest.raises(FileNotFoundError):
+        registry.get_release("ara/acme/agent/v1.1.0")
+
+    client.delete_all("acme", "agent", "tester")
+    assert index.lookup("acme", "agent") is None
+    assert registry.read_ownership()["packages"] == {}
+    assert not (registry.root / "releases" / "ara" / "acme").exists()
+
+
+def test_local_paths_cannot_escape_root(registry):
+    with pytest.raises(ValueError):
+        registry.read_file("../outside.json")
+
+
+def test_get_storage_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("ARA_REGISTRY_BACKEND", raising=False)
+    monkeypatch.delenv("ARA_REGISTRY_URL", raising=False)
+    monkeypatch.setenv("ARA_REGISTRY_PATH", str(tmp_path))
+    assert isinstance(storage.get_storage(), storage.LocalStorage)
+
+    monkeypatch.delenv("ARA_REGISTRY_PATH")
+    monkeypatch.setenv("ARA_REGISTRY_URL", "http://mirror.test/")
+    mirror = storage.get_storage()
+    assert isinstance(mirror, storage.HttpMirrorStorage)
+    assert mirror.read_only
+    assert mirror.base_url == "http://mirror.test"
+
+    monkeypatch.setenv("ARA_REGISTRY_BACKEND", "s3")
+    with pytest.raises(ValueError):
+        storage.get_storage()
+
+
+def test_incomplete_storage_cannot_be_instantiated():
+    class ReadOnlyFiles(storage.RegistryStorage):
+        def read_file(self, path):
+            return None
+
+    with pytest.raises(TypeError, match="get_release"):
+        ReadOnlyFiles()
+
+    # The mirror's read-only stubs count as implementations
+    storage.HttpMirrorStorage("https://mirror.example.com")
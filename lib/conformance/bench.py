@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Run every ara.json validator over the shared corpus and compare them.
+
+Each manifest under ``corpus/valid`` must be accepted and each one under
+``corpus/invalid`` rejected. For every validator available in the current
+environment this reports how many verdicts agree with the corpus, which
+cases disagree, and throughput in manifests per second.
+
+Validators:
+
+    ara-ref          ara_ref.validate_bytes (compiled TypeAdapter, validate_json)
+    ara-ref-model    ARAManifest(**json.loads(...)), as ara_ref.read_manifest does
+    ara-github       ara_github.cli._load_manifest, the model ``ara publish`` uses
+    jsonschema       ara.schema.json with a draft-07 validator and format checks
+    rust             the ara-ref Rust binary, one process per manifest
+
+Validators whose package is not installed are skipped with a note. The
+``ara-github`` validator reads each file itself, so its timing includes
+that read; the Rust timing includes process startup and is only useful for
+agreement. ``read_identity`` is timed too, but it checks only name and
+version, so its verdicts are not counted towards agreement.
+
+Usage::
+
+    python lib/conformance/bench.py
+    python lib/conformance/bench.py --iterations 200 --format json -o bench.json
+    python lib/conformance/bench.py --rust-bin lib/rust/target/release/ara-ref --check
+
+With ``--check`` the exit status is 1 if any full validator disagrees with
+the corpus, so CI can catch drift between implementations.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+HERE = Path(__file__).resolve().parent
+CORPUS = HERE / "corpus"
+SCHEMA = HERE.parent.parent / "ara.schema.json"
+RUST_BIN = HERE.parent / "rust" / "target" / "release" / "ara-ref"
+
+
+@dataclass
+class Case:
+    name: str
+    path: Path
+    content: bytes
+    expected: bool
+
+
+@dataclass
+class Validator:
+    name: str
+    check: Callable[[Case], bool]
+    # Partial validators only check some fields; their verdicts are informational
+    partial: bool = False
+    # Subprocess validators are run once over the corpus, not repeated
+    repeat: bool = True
+
+
+@dataclass
+class Report:
+    validator: str
+    partial: bool
+    manifests: int = 0
+    seconds: float = 0.0
+    disagreements: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def agreed(self) -> int:
+        return self.manifests - len(self.disagreements)
+
+    @property
+    def per_second(self) -> float:
+        return self.manifests / self.seconds if self.seconds else 0.0
+
+
+def load_corpus(root: Path = CORPUS) -> list[Case]:
+    cases = []
+    for expected, folder in ((True, "valid"), (False, "invalid")):
+        for path in sorted((root / folder).glob("*.json")):
+            cases.append(Case(f"{folder}/{path.stem}", path, path.read_bytes(), expected))
+    return cases
+
+
+def _ara_ref() -> list[Validator]:
+    try:
+        from ara_ref import ARAManifest, read_identity, validate_bytes
+    except ImportError:
+        return []
+
+    def model(case: Case) -> bool:
+        try:
+            ARAManifest(**json.loads(case.content))
+        except (ValueError, TypeError):
+            # JSONDecodeError and ValidationError are ValueErrors; a non-object
+            # document fails the ** unpacking with TypeError
+            return False
+        return True
+
+    def identity(case: Case) -> bool:
+        try:
+            read_identity(json.loads(case.content))
+        except ValueError:
+            return False
+        return True
+
+    return [
+        Validator("ara-ref", lambda case: not validate_bytes(case.content)),
+        Validator("ara-ref-model", model),
+        Validator("read-identity", identity, partial=True),
+    ]
+
+
+def _ara_github() -> list[Validator]:
+    try:
+        from ara_github.cli import _load_manifest
+    except ImportError:
+        return []
+
+    def check(case: Case) -> bool:
+        try:
+            _load_manifest(case.path)
+        except ValueError:
+            return False
+        return True
+
+    return [Validator("ara-github", check)]
+
+
+def _jsonschema() -> list[Validator]:
+    try:
+        import jsonschema
+    except ImportError:
+        return []
+
+    validator = jsonschema.Draft7Validator(
+        json.loads(SCHEMA.read_bytes()),
+        format_checker=jsonschema.Draft7Validator.FORMAT_CHECKER,
+    )
+
+    def check(case: Case) -> bool:
+        try:
+            return validator.is_valid(json.loads(case.content))
+        except ValueError:
+            return False
+
+    return [Validator("jsonschema", check)]
+
+
+def _rust(binary: Optional[Path]) -> list[Validator]:
+    if binary is None or not binary.is_file():
+        return []
+
+    def check(case: Case) -> bool:
+        result = subprocess.run([str(binary), "validate", str(case.path)], capture_output=True)
+        return result.returncode == 0
+
+    return [Validator("rust", check, repeat=False)]
+
+
+def available(rust_bin: Optional[Path]) -> tuple[list[Validator], list[str]]:
+    """Validators installed in this environment, plus notes on the ones skipped."""
+    validators: list[Validator] = []
+    skipped: list[str] = []
+    for name, found, hint in (
+        ("ara-ref", _ara_ref(), "pip install -e lib/python"),
+        ("ara-github", _ara_github(), "pip install -e github-registry"),
+        ("jsonschema", _jsonschema(), "pip install jsonschema"),
+        ("rust", _rust(rust_bin), "cargo build --release in lib/rust, or pass --rust-bin"),
+    ):
+        if found:
+            validators.extend(found)
+        else:
+            skipped.append(f"{name}: not available ({hint})")
+    return validators, skipped
+
+
+def run(validator: Validator, cases: list[Case], iterations: int) -> Report:
+    report = Report(validator.name, validator.partial)
+    verdicts = {}
+    for case in cases:  # warm up caches and compiled validators, and record verdicts
+        try:
+            verdicts[case.name] = validator.check(case)
+        except Exception as e:  # a crash is a disagreement, not a harness failure
+            verdicts[case.name] = None
+            report.errors.append(f"{case.name}: {type(e).__name__}: {e}")
+
+    rounds = iterations if validator.repeat else 1
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for case in cases:
+            try:
+                validator.check(case)
+            except Exception:
+                pass
+    # Report the time for one pass over the corpus
+    report.seconds = (time.perf_counter() - start) / rounds
+    report.manifests = len(cases)
+    report.disagreements = [case.name for case in cases if verdicts[case.name] is not case.expected]
+    return report
+
+
+def to_text(reports: list[Report], skipped: list[str], cases: list[Case]) -> str:
+    valid = sum(1 for case in cases if case.expected)
+    lines = [f"Corpus: {len(cases)} manifests ({valid} valid, {len(cases) - valid} invalid)", ""]
+    lines.append(f"{'validator':<15} {'agreement':>11} {'manifests/s':>13}")
+    for r in reports:
+        agreement = f"{r.agreed}/{r.manifests}" + ("*" if r.partial else "")
+        lines.append(f"{r.validator:<15} {agreement:>11} {r.per_second:>13,.0f}")
+    if any(r.partial for r in reports):
+        lines.append("* partial validator, checks name and version only; not counted by --check")
+    for r in reports:
+        if not r.partial and (r.disagreements or r.errors):
+            lines.append("")
+            lines.append(f"{r.validator} disagrees with the corpus on:")
+            lines.extend(f"  {name}" for name in r.disagreements)
+            lines.extend(f"  error: {error}" for error in r.errors)
+    if skipped:
+        lines.append("")
+        lines.extend(f"Skipped {note}" for note in skipped)
+    return "\n".join(lines)
+
+
+def to_json(reports: list[Report], skipped: list[str], cases: list[Case]) -> str:
+    return json.dumps(
+        {
+            "corpus": {
+                "total": len(cases),
+                "valid": sum(1 for case in cases if case.expected),
+                "invalid": sum(1 for case in cases if not case.expected),
+            },
+            "validators": [
+                {
+                    "name": r.validator,
+                    "partial": r.partial,
+                    "agreed": r.agreed,
+                    "manifests": r.manifests,
+                    "manifests_per_second": round(r.per_second, 1),
+                    "disagreements": r.disagreements,
+                    "errors": r.errors,
+                }
+                for r in reports
+            ],
+            "skipped": skipped,
+        },
+        indent=2,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=CORPUS, help="corpus directory with valid/ and invalid/")
+    parser.add_argument("--iterations", type=int, default=50, help="timed passes over the corpus (default: 50)")
+    parser.add_argument("--rust-bin", type=Path, default=RUST_BIN, help="path to the ara-ref Rust binary")
+    parser.add_argument("--only", action="append", metavar="NAME", help="run only this validator (repeatable)")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("-o", "--output", type=Path, help="write the report to a file")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a full validator disagrees with the corpus")
+    args = parser.parse_args(argv)
+
+    cases = load_corpus(args.corpus)
+    if not cases:
+        parser.error(f"no manifests found under {args.corpus}")
+    validators, skipped = available(args.rust_bin)
+    if args.only:
+        validators = [v for v in validators if v.name in args.only]
+
+    reports = [run(v, cases, max(1, args.iterations)) for v in validators]
+    render = to_json if args.format == "json" else to_text
+    output = render(reports, skipped, cases)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.check and any(r.disagreements or r.errors for r in reports if not r.partial):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ from .models import (
     PackageSource,
     SourceType,
 )
-from .core import validate, read_manifest
+from .core import validate, validate_bytes, read_manifest, read_identity
 
 __all__ = [
     "ARAManifest",
@@ -12,5 +12,7 @@ __all__ = [
     "PackageSource",
     "SourceType",
     "validate",
+    "validate_bytes",
     "read_manifest",
+    "read_identity",
 ]
@@ -0,0 +1,120 @@
+"""Validate many ara.json files in one run, optionally across worker processes."""
+
+import glob
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .core import manifest_adapter, validate
+
+MANIFEST_NAME = "ara.json"
+
+# Directories never searched for manifests
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__", "target"}
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+
+@dataclass
+class FileResult:
+    path: str
+    errors: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+def _walk(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        if MANIFEST_NAME in filenames:
+            yield Path(dirpath) / MANIFEST_NAME
+
+
+def collect(targets: Iterable[str]) -> list[Path]:
+    """
+    Expand files, directories and glob patterns into manifest paths.
+
+    Directories are searched recursively for ara.json files; patterns are
+    expanded with ``**`` support. Each path appears once, in input order.
+    """
+    paths: dict[Path, None] = {}
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            matches = list(_walk(path))
+        elif path.exists():
+            matches = [path]
+        else:
+            matches = [Path(p) for p in sorted(glob.glob(target, recursive=True))]
+            matches = [m for p in matches for m in (_walk(p) if p.is_dir() else [p])]
+            if not matches:
+                raise FileNotFoundError(f"No files match: {target}")
+        for match in matches:
+            paths.setdefault(match, None)
+    return list(paths)
+
+
+def _validate_one(path: Path) -> FileResult:
+    manifest_adapter()  # compile outside the timed region
+    start = time.perf_counter()
+    errors = validate(path)
+    return FileResult(str(path), errors, time.perf_counter() - start)
+
+
+def validate_many(paths: list[Path], jobs: Optional[int] = None) -> list[FileResult]:
+    """
+    Validate manifests, returning one result per path in the same order.
+
+    Work is spread over ``jobs`` processes (default: one per CPU) in chunks,
+    so each worker compiles the manifest validator once and reuses it.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < PARALLEL_THRESHOLD:
+        return [_validate_one(path) for path in paths]
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_validate_one, paths, chunksize=chunksize))
+
+
+def to_json(results: list[FileResult], elapsed: float) -> str:
+    invalid = sum(1 for r in results if not r.valid)
+    return json.dumps(
+        {
+            "total": len(results),
+            "valid": len(results) - invalid,
+            "invalid": invalid,
+            "duration": round(elapsed, 6),
+            "files": [{**asdict(r), "valid": r.valid, "duration": round(r.duration, 6)} for r in results],
+        },
+        indent=2,
+    )
+
+
+def to_junit(results: list[FileResult], elapsed: float) -> str:
+    """Render results as a JUnit XML report, one test case per manifest."""
+    failures = sum(1 for r in results if not r.valid)
+    suite = ET.Element(
+        "testsuite",
+        name="ara-ref validate",
+        tests=str(len(results)),
+        failures=str(failures),
+        errors="0",
+        time=f"{elapsed:.6f}",
+    )
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname="ara.json", name=result.path, time=f"{result.duration:.6f}")
+        if result.errors:
+            failure = ET.SubElement(case, "failure", message=result.errors[0])
+            failure.text = "\n".join(result.errors)
+    ET.indent(suite)
+    return ET.tostring(suite, encoding="unicode", xml_declaration=True)
@@ -1,7 +1,9 @@
-import json
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 import click
+from . import batch
 from .core import validate, read_manifest
 
 
@@ -12,15 +14,54 @@ def main():
 
 
 @main.command()
-@click.argument("path", type=click.Path(exists=True, path_type=Path))
-def validate_cmd(path: Path):
-    """Validate a ara.json file."""
-    errors = validate(path)
-    if errors:
-        for err in errors:
-            click.echo(f"Error: {err}", err=True)
+@click.argument("paths", nargs=-1, required=True)
+@click.option("-j", "--jobs", type=click.IntRange(min=1), help="Worker processes (default: one per CPU)")
+@click.option(
+    "--format", "output_format", type=click.Choice(["text", "json", "junit"]), default="text", show_default=True,
+    help="Report format",
+)
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the report to a file")
+def validate_cmd(paths: tuple[str, ...], jobs: Optional[int], output_format: str, output: Optional[Path]):
+    """Validate ara.json files, directories (searched recursively) or glob patterns."""
+    try:
+        files = batch.collect(paths)
+    except FileNotFoundError as e:
+        raise click.ClickException(str(e))
+
+    # A single manifest keeps the original terse output
+    if len(files) == 1 and output_format == "text" and output is None and Path(paths[0]).is_file():
+        errors = validate(files[0])
+        if errors:
+            for err in errors:
+                click.echo(f"Error: {err}", err=True)
+            sys.exit(1)
+        click.echo("Valid ara.json")
+        return
+
+    start = time.perf_counter()
+    results = batch.validate_many(files, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    invalid = [r for r in results if not r.valid]
+
+    if output_format == "json":
+        report = batch.to_json(results, elapsed)
+    elif output_format == "junit":
+        report = batch.to_junit(results, elapsed)
+    else:
+        for r in invalid:
+            for err in r.errors:
+                click.echo(f"Error: {r.path}: {err}", err=True)
+        report = (
+            f"Validated {len(results)} manifest(s) in {elapsed:.2f}s: "
+            f"{len(results) - len(invalid)} valid, {len(invalid)} invalid"
+        )
+
+    if output:
+        output.write_text(report + "\n")
+    else:
+        click.echo(report)
+    if invalid:
         sys.exit(1)
-    click.echo("Valid ara.json")
 
 
 @main.command("read")
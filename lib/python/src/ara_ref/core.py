@@ -1,20 +1,54 @@
 import json
+from functools import lru_cache
 from pathlib import Path
-from pydantic import ValidationError
-from .models import ARAManifest
+from pydantic import TypeAdapter, ValidationError
+from .models import ARAManifest, NAME_PATTERN, SEMVER_PATTERN
+
+
+@lru_cache(maxsize=None)
+def manifest_adapter() -> TypeAdapter:
+    """Compiled validator for ARAManifest, built once per process."""
+    return TypeAdapter(ARAManifest)
 
 
 def validate(path: Path) -> list[str]:
     """Validate a ara.json file. Returns list of error messages."""
     try:
-        read_manifest(path)
-        return []
+        content = Path(path).read_bytes()
     except FileNotFoundError:
         return [f"File not found: {path}"]
-    except json.JSONDecodeError as e:
-        return [f"Invalid JSON: {e}"]
+    return validate_bytes(content)
+
+
+def validate_bytes(content: bytes) -> list[str]:
+    """Validate ara.json content. Returns list of error messages."""
+    try:
+        manifest_adapter().validate_json(content)
+        return []
     except ValidationError as e:
-        return [err["msg"] for err in e.errors()]
+        errors = e.errors()
+        if errors and errors[0]["type"] == "json_invalid":
+            return [f"Invalid JSON: {errors[0]['ctx']['error']}"]
+        return [err["msg"] for err in errors]
+
+
+def read_identity(data: dict) -> tuple[str, str]:
+    """
+    Validate only a manifest's name and version, returning (name, version).
+
+    Applies the same rules as ARAManifest for those two fields without
+    building the model, for callers such as duplicate checks that need
+    nothing else. Raises ValueError if either field is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Manifest must be a JSON object")
+    name = data.get("name")
+    if not isinstance(name, str) or not 3 <= len(name) <= 200 or not NAME_PATTERN.match(name):
+        raise ValueError(f"name must be in namespace/package-name format, got: {name!r}")
+    version = data.get("version")
+    if not isinstance(version, str) or not SEMVER_PATTERN.match(version):
+        raise ValueError(f"version must be a valid semantic version (e.g., '1.0.0'), got: {version!r}")
+    return name, version
 
 
 def read_manifest(path: Path) -> ARAManifest:
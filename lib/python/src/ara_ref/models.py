@@ -11,6 +11,9 @@ SEMVER_PATTERN = re.compile(
     r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
 )
 
+# Package name pattern from the JSON schema
+NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+$")
+
 # Tag pattern from the JSON schema
 TAG_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 
@@ -59,7 +62,7 @@ class PackageSource(BaseModel):
 
 
 class ARAManifest(BaseModel):
-    name: str = Field(..., pattern=r"^[a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+$", min_length=3, max_length=200)
+    name: str = Field(..., pattern=NAME_PATTERN.pattern, min_length=3, max_length=200)
     version: str
     description: str = Field(..., min_length=1, max_length=500)
     author: EmailStr
@@ -0,0 +1,30 @@
+"""Shared helpers: writing ara.json manifests into a temporary tree."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+VALID = {
+    "name": "acme/agent",
+    "version": "1.0.0",
+    "description": "An agent",
+    "author": "dev@example.com",
+    "tags": ["demo"],
+}
+
+
+@pytest.fixture
+def write_manifest(tmp_path: Path):
+    """Write a manifest (a dict, or raw text) to tmp_path/<directory>/ara.json and return its path."""
+
+    def write(directory: str, manifest=None, **fields) -> Path:
+        path = tmp_path / directory / "ara.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(manifest, str):
+            path.write_text(manifest)
+        else:
+            path.write_text(json.dumps({**VALID, **(manifest or {}), **fields}))
+        return path
+
+    return write
@@ -0,0 +1,109 @@
+"""Validating many manifests in one run (ara_ref/batch.py and `ara-ref validate`)."""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+from click.testing import CliRunner
+
+from ara_ref import batch
+from ara_ref.cli import main
+
+
+@pytest.fixture
+def tree(tmp_path, write_manifest):
+    """Three valid and two invalid packages, plus manifests in directories that are never searched."""
+    write_manifest("packages/a")
+    write_manifest("packages/b", version="2.0.0-rc.1")
+    write_manifest("packages/nested/c")
+    write_manifest("packages/bad-version", version="1.0")
+    write_manifest("packages/bad-json", "{not json")
+    write_manifest("packages/node_modules/dep", version="x")
+    write_manifest("packages/.git/x", version="x")
+    return tmp_path / "packages"
+
+
+def test_collect(tree, tmp_path):
+    found = [p.relative_to(tree).parent.as_posix() for p in batch.collect([str(tree)])]
+    assert found == ["a", "b", "bad-json", "bad-version", "nested/c"]
+
+    # Files, patterns and directories combine, each path once, in input order
+    paths = batch.collect([str(tree / "nested" / "c" / "ara.json"), str(tree / "b*"), str(tree)])
+    assert [p.relative_to(tree).parent.as_posix() for p in paths[:4]] == ["nested/c", "b", "bad-json", "bad-version"]
+    assert len(paths) == 5
+
+    with pytest.raises(FileNotFoundError):
+        batch.collect([str(tmp_path / "missing-*")])
+
+
+def test_validate_many_keeps_input_order_across_workers(tmp_path, write_manifest):
+    paths = [
+        write_manifest(f"pkg{i:03d}", version="1.0.0" if i % 7 else "not-semver")
+        for i in range(batch.PARALLEL_THRESHOLD + 16)
+    ]
+    serial = batch.validate_many(paths, jobs=1)
+    parallel = batch.validate_many(paths, jobs=3)
+
+    assert [r.path for r in parallel] == [str(p) for p in paths]
+    assert [(r.path, r.errors) for r in parallel] == [(r.path, r.errors) for r in serial]
+    invalid = [r.path for r in parallel if not r.valid]
+    assert invalid == [str(p) for i, p in enumerate(paths) if i % 7 == 0]
+
+
+def test_text_report(tree):
+    result = CliRunner().invoke(main, ["validate", str(tree)])
+    assert result.exit_code == 1
+    assert "5 manifest(s)" in result.output and "3 valid, 2 invalid" in result.output
+    assert f"Error: {tree / 'bad-json' / 'ara.json'}: Invalid JSON" in result.output
+
+
+def test_single_file(write_manifest):
+    result = CliRunner().invoke(main, ["validate", str(write_manifest("one"))])
+    assert result.exit_code == 0
+    assert result.output == "Valid ara.json\n"
+
+    result = CliRunner().invoke(main, ["validate", str(write_manifest("two", version="1"))])
+    assert result.exit_code == 1
+    assert "version must be a valid semantic version" in result.output
+
+
+def test_json_report(tree):
+    result = CliRunner().invoke(main, ["validate", "--format", "json", "-j", "2", str(tree)])
+    assert result.exit_code == 1
+    report = json.loads(result.output)
+    assert (report["total"], report["valid"], report["invalid"]) == (5, 3, 2)
+    files = {f["path"]: f for f in report["files"]}
+    valid = files[str(tree / "a" / "ara.json")]
+    assert valid["valid"] is True and valid["errors"] == []
+    assert files[str(tree / "bad-version" / "ara.json")]["valid"] is False
+
+
+def test_junit_report(tree, tmp_path):
+    output = tmp_path / "report.xml"
+    result = CliRunner().invoke(main, ["validate", "--format", "junit", "-o", str(output), str(tree)])
+    assert result.exit_code == 1
+    assert result.output == ""
+
+    suite = ET.parse(output).getroot()
+    assert suite.tag == "testsuite"
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("5", "2", "0")
+    cases = {case.get("name"): case for case in suite.iter("testcase")}
+    assert len(cases) == 5
+    failure = cases[str(tree / "bad-version" / "ara.json")].find("failure")
+    assert "semantic version" in failure.get("message")
+    assert failure.text
+    assert cases[str(tree / "a" / "ara.json")].find("failure") is None
+
+
+def test_all_valid_exits_zero(write_manifest, tmp_path):
+    write_manifest("one")
+    write_manifest("two")
+    result = CliRunner().invoke(main, ["validate", "--format", "junit", str(tmp_path)])
+    assert result.exit_code == 0
+    assert ET.fromstring(result.output.encode()).get("failures") == "0"
+
+
+def test_no_matches(tmp_path):
+    result = CliRunner().invoke(main, ["validate", str(tmp_path / "nothing-*.json")])
+    assert result.exit_code == 1
+    assert "No files match" in result.output
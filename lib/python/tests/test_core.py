@@ -0,0 +1,90 @@
+"""Manifest validation and identity extraction (ara_ref/core.py)."""
+
+import json
+
+import pytest
+
+from ara_ref import read_identity, read_manifest, validate, validate_bytes
+from ara_ref.core import manifest_adapter
+
+from conftest import VALID
+
+
+def _errors(**fields) -> list[str]:
+    return validate_bytes(json.dumps({**VALID, **fields}).encode())
+
+
+def test_valid_manifest():
+    assert validate_bytes(json.dumps(VALID).encode()) == []
+    assert manifest_adapter() is manifest_adapter()
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"name": "no-namespace"}, "String should match pattern"),
+    ({"name": "acme/bad name"}, "String should match pattern"),
+    ({"name": "a/"}, "String should have at least 3 characters"),
+    ({"version": "1.0"}, "version must be a valid semantic version (e.g., '1.0.0'), got: 1.0"),
+    ({"version": "01.0.0"}, "version must be a valid semantic version"),
+    ({"author": "not-an-email"}, "value is not a valid email address"),
+    ({"tags": []}, "List should have at least 1 item"),
+    ({"tags": ["has space"]}, "Invalid tag format: 'has space'"),
+    ({"homepage": "example.com"}, "Input should be a valid URL"),
+    ({"repository": 42}, "URL input should be a string or URL"),
+    ({"sources": [{"type": "npm", "package": "x"}]}, "sources field is only allowed for mcp-server type"),
+    ({"type": "mcp-server", "sources": [{"type": "git"}]}, "'repository' is required for git source type"),
+])
+def test_error_messages(fields: dict, message: str):
+    errors = _errors(**fields)
+    assert any(message in error for error in errors), errors
+
+
+def test_accepts_urls_and_sources():
+    assert _errors(homepage="https://example.com/agent", repository="https://github.com/acme/agent") == []
+    assert _errors(type="mcp-server", sources=[{"type": "pypi", "package": "acme-mcp"}]) == []
+
+
+def test_invalid_json():
+    [error] = validate_bytes(b'{"name": ')
+    assert error.startswith("Invalid JSON: ")
+
+
+def test_validate_file(write_manifest, tmp_path):
+    assert validate(write_manifest("ok")) == []
+    assert validate(tmp_path / "missing" / "ara.json") == [f"File not found: {tmp_path / 'missing' / 'ara.json'}"]
+    assert read_manifest(write_manifest("read", homepage="https://example.com")).name == "acme/agent"
+
+
+@pytest.mark.parametrize("name, version", [
+    ("acme/agent", "1.0.0"),
+    ("a_b/c-d", "2.0.0-rc.1+build.5"),
+])
+def test_read_identity(name: str, version: str):
+    # Only name and version are looked at; the rest need not be valid
+    assert read_identity({"name": name, "version": version, "tags": "not a list"}) == (name, version)
+
+
+@pytest.mark.parametrize("data, message", [
+    ([], "Manifest must be a JSON object"),
+    ({"version": "1.0.0"}, "name must be in namespace/package-name format, got: None"),
+    ({"name": "agent", "version": "1.0.0"}, "name must be in namespace/package-name format, got: 'agent'"),
+    ({"name": "acme/" + "x" * 200, "version": "1.0.0"}, "name must be in namespace/package-name format"),
+    ({"name": "acme/agent"}, "version must be a valid semantic version (e.g., '1.0.0'), got: None"),
+    ({"name": "acme/agent", "version": 1}, "got: 1"),
+    ({"name": "acme/agent", "version": "v1.0.0"}, "got: 'v1.0.0'"),
+])
+def test_read_identity_rejects(data, message: str):
+    with pytest.raises(ValueError) as error:
+        read_identity(data)
+    assert message in str(error.value)
+
+
+@pytest.mark.parametrize("name", ["acme/agent", "ac/x", "acme/a.b", "acme/agent/extra", "/agent", "x" * 100 + "/" + "y" * 100])
+@pytest.mark.parametrize("version", ["1.0.0", "1.0.0-alpha.01", "1.0", "1.0.0+meta"])
+def test_read_identity_agrees_with_the_model(name: str, version: str):
+    model_valid = not _errors(name=name, version=version)
+    try:
+        read_identity({**VALID, "name": name, "version": version})
+        identity_valid = True
+    except ValueError:
+        identity_valid = False
+    assert identity_valid == model_valid